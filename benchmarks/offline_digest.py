@@ -0,0 +1,344 @@
+"""
+Offline digest benchmark.
+
+Runs batches of 1, 5 and 50 tickers through the same path as the daily digest: EquitySummarizationUseCase with
+the configured report cache and context providers, FallbackAgnoAgentService, AgnoFinancialTeam with its
+Finance_Agent tools and tool cache, sec_tools over the pooled SEC client, and SlackPublisher. Every external
+service is replayed by ``benchmarks.replay``, so no network access or API keys are needed.
+
+Reports wall time, model and tool calls, token usage and peak memory per batch and per ticker. Each batch uses
+tickers no earlier batch has seen, so it starts with cold caches; ``--warm`` runs it again to measure them.
+
+    uv run python -m benchmarks.offline_digest                        # thread pool, batches of 1, 5 and 50
+    uv run python -m benchmarks.offline_digest --mode async --warm    # async use case, then a cached rerun
+    uv run python -m benchmarks.offline_digest --output before.json   # keep the results of a run ...
+    uv run python -m benchmarks.offline_digest --compare before.json  # ... and compare a later run with them
+
+Recorded latencies are multiplied by ``--latency-scale``; 0 measures the code's own overhead. Everything else
+is configured by the digest's environment variables (TICKER_MAX_CONCURRENCY, TICKER_PREFETCH,
+ASSET_TYPE_ROUTING, REPORT_CACHE_TTL_SECONDS, SEC_MAX_REQUESTS_PER_SECOND, SLACK_CHANNEL_MESSAGES_PER_SECOND,
+...). Caches are created in a fresh temporary directory unless ``--cache-dir`` is given.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import re
+import statistics
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from slack_sdk import WebClient
+
+from benchmarks.replay import (
+    FIXTURES_DIR,
+    BenchTicker,
+    RecordedYahooFinance,
+    ReplayModel,
+    SecCassette,
+    SlackStubServer,
+    TickerUsage,
+    bench_tickers,
+    load_fixture,
+    recording,
+)
+from invesetment_agent.application.dtos.stock_summarization_dtos import (
+    MultiTickerSummarizationRequest,
+    SingleTickerSummarizationRequest,
+    SingleTickerSummarizationResponse,
+)
+from invesetment_agent.application.external_service.sec_tools import get_sec_client
+from invesetment_agent.application.port.ai_agent_service import AgentService
+from invesetment_agent.application.port.ticker_context_provider import TickerContextProvider
+from invesetment_agent.application.usecases.ticker_summarization_usecase import EquitySummarizationUseCase
+from invesetment_agent.infrastructure.adapter.agno_agent import FallbackAgnoAgentService
+from invesetment_agent.infrastructure.adapter.agno_financial_team import (
+    AgnoFinancialAgent,
+    AgnoFinancialTeam,
+    AgnoNewsSentimentAgent,
+    AgnoStylerAgent,
+)
+from invesetment_agent.infrastructure.adapter.agno_financial_team.tool_cache import get_tool_cache
+from invesetment_agent.infrastructure.cli.app import SLACK_CHANNEL_MESSAGES_PER_SECOND, format_result
+from invesetment_agent.infrastructure.config.container import Application
+from invesetment_agent.infrastructure.slack.publisher import SlackPublisher
+
+BATCH_SIZES = [1, 5, 50]
+CHANNEL = "#digest-benchmark"
+COMPARED_METRICS = ("wall_seconds", "tool_calls_per_ticker", "tokens_per_ticker", "peak_memory_mb")
+
+
+class UsageMeter:
+    """Usage of every ticker of the running batch, found by the ticker named in the query."""
+
+    def __init__(self) -> None:
+        self.usage: dict[str, TickerUsage] = {}
+
+    def start_batch(self, tickers: list[BenchTicker]) -> None:
+        self.usage = {ticker.symbol: TickerUsage(ticker=ticker) for ticker in tickers}
+
+    def for_ticker(self, symbol: str) -> TickerUsage:
+        return self.usage[symbol.strip().upper()]
+
+    def for_query(self, query: str) -> TickerUsage:
+        for symbol, usage in self.usage.items():
+            if re.search(rf"\b{symbol}\b", query):
+                return usage
+        raise ValueError(f"Query names none of the batch's tickers: {query[:80]!r}")
+
+
+class MeteredAgentService(AgentService):
+    """Replays the model for the ticker of each query and times the agents."""
+
+    def __init__(self, agent_service: AgentService, meter: UsageMeter):
+        self.agent_service = agent_service
+        self.meter = meter
+
+    def get_answer(self, query: str) -> str:
+        usage = self.meter.for_query(query)
+        started = time.perf_counter()
+        try:
+            with recording(usage):
+                return self.agent_service.get_answer(query)
+        finally:
+            usage.agent_seconds += time.perf_counter() - started
+
+    async def aget_answer(self, query: str) -> str:
+        usage = self.meter.for_query(query)
+        started = time.perf_counter()
+        try:
+            with recording(usage):
+                return await self.agent_service.aget_answer(query)
+        finally:
+            usage.agent_seconds += time.perf_counter() - started
+
+
+class MeteredContextProvider(TickerContextProvider):
+    def __init__(self, provider: TickerContextProvider, meter: UsageMeter):
+        self.provider = provider
+        self.meter = meter
+
+    def build_context(self, ticker: str) -> str:
+        started = time.perf_counter()
+        try:
+            return self.provider.build_context(ticker)
+        finally:
+            self.meter.for_ticker(ticker).context_seconds += time.perf_counter() - started
+
+
+@dataclass
+class Bench:
+    use_case: EquitySummarizationUseCase
+    meter: UsageMeter
+    sec: SecCassette
+    yahoo: RecordedYahooFinance
+    slack: SlackStubServer
+    publisher: SlackPublisher
+
+
+def build_team(latency_scale: float) -> AgnoFinancialTeam:
+    """The team of ``Application.create_google_agent_service`` with every model replaying its recorded turns."""
+    turns = load_fixture("model_turns.json")
+
+    def model(agent_name: str) -> ReplayModel:
+        return ReplayModel(id=f"replay-{agent_name}", turns=turns.get(agent_name, []), latency_scale=latency_scale)
+
+    return AgnoFinancialTeam(
+        model=model("Investment_Team_Leader"),
+        agno_agent_services=[
+            AgnoFinancialAgent(model=model("Finance_Agent")),
+            AgnoStylerAgent(model=model("Slack_Styler")),
+            AgnoNewsSentimentAgent(model=model("News_Sentiment_Agent")),
+        ],
+    )
+
+
+def build_bench(tickers: list[BenchTicker], latency_scale: float, max_concurrency: int) -> Bench:
+    http = load_fixture("http.json")
+    form4_xml = (FIXTURES_DIR / "sec_form4.xml").read_text(encoding="utf-8")
+    sec = SecCassette(tickers, http["sec"], form4_xml, latency_scale)
+    sec.install(get_sec_client())
+    slack = SlackStubServer(http["slack"], latency_scale)
+    meter = UsageMeter()
+    use_case = EquitySummarizationUseCase(
+        MeteredAgentService(FallbackAgnoAgentService(agent_services=[build_team(latency_scale)]), meter),
+        max_concurrency=max_concurrency,
+        report_cache=Application.create_report_cache(),
+        context_providers=[
+            MeteredContextProvider(provider, meter) for provider in Application.create_context_providers()
+        ],
+    )
+    return Bench(
+        use_case=use_case,
+        meter=meter,
+        sec=sec,
+        yahoo=RecordedYahooFinance(tickers, http["yfinance"], latency_scale),
+        slack=slack,
+        publisher=SlackPublisher(
+            WebClient(token="xoxb-benchmark", base_url=slack.base_url), SLACK_CHANNEL_MESSAGES_PER_SECOND
+        ),
+    )
+
+
+def run_batch(bench: Bench, tickers: list[BenchTicker], mode: str, quiet: bool) -> dict[str, Any]:
+    """Analyze ``tickers``, post every report and return the batch's metrics."""
+    bench.meter.start_batch(tickers)
+    request = MultiTickerSummarizationRequest(
+        single_requests=[SingleTickerSummarizationRequest(ticker=ticker.symbol) for ticker in tickers]
+    )
+    stats = get_tool_cache().stats
+    cache_before = (stats.hits + stats.run_hits, stats.misses)
+    sec_before, yahoo_before, slack_before = bench.sec.requests, bench.yahoo.requests, sum(bench.slack.calls.values())
+    memory_before = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+    if tracemalloc.is_tracing():
+        tracemalloc.reset_peak()
+
+    with contextlib.ExitStack() as stack:
+        if quiet:
+            stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, "w"))))
+        stack.enter_context(bench.yahoo.installed())
+        started = time.perf_counter()
+        responses: list[SingleTickerSummarizationResponse]
+        if mode == "async":
+            responses = asyncio.run(bench.use_case.aexecute_per_ticker(request))
+        else:
+            responses = bench.use_case.execute_per_ticker(request)
+        analyzed = time.perf_counter()
+        for response in responses:
+            bench.publisher.post(CHANNEL, format_result(response.ticker, response.result))
+        bench.publisher.flush(timeout=600)
+        finished = time.perf_counter()
+
+    peak_memory = tracemalloc.get_traced_memory()[1] - memory_before if tracemalloc.is_tracing() else 0
+    usage = list(bench.meter.usage.values())
+    agent_seconds = [ticker.agent_seconds for ticker in usage if ticker.model_calls]
+    cache_hits, cache_misses = stats.hits + stats.run_hits - cache_before[0], stats.misses - cache_before[1]
+    count = len(tickers)
+    return {
+        "tickers": count,
+        "failures": sum(1 for response in responses if not response.result.is_success),
+        "wall_seconds": round(finished - started, 3),
+        "analysis_seconds": round(analyzed - started, 3),
+        "publish_seconds": round(finished - analyzed, 3),
+        "agent_seconds_p50": round(statistics.median(agent_seconds), 3) if agent_seconds else 0.0,
+        "agent_seconds_max": round(max(agent_seconds), 3) if agent_seconds else 0.0,
+        "model_calls": sum(ticker.model_calls for ticker in usage),
+        "tool_calls": sum(ticker.tool_calls for ticker in usage),
+        "tool_calls_per_ticker": round(sum(ticker.tool_calls for ticker in usage) / count, 2),
+        "tokens": sum(ticker.total_tokens for ticker in usage),
+        "tokens_per_ticker": round(sum(ticker.total_tokens for ticker in usage) / count),
+        "peak_memory_mb": round(peak_memory / 2**20, 2),
+        "peak_memory_mb_per_ticker": round(peak_memory / 2**20 / count, 3),
+        "tool_cache_hit_rate": round(cache_hits / (cache_hits + cache_misses), 2) if cache_hits + cache_misses else 0.0,
+        "sec_requests": bench.sec.requests - sec_before,
+        "yfinance_requests": bench.yahoo.requests - yahoo_before,
+        "slack_calls": sum(bench.slack.calls.values()) - slack_before,
+        "per_ticker": {
+            ticker.ticker.symbol: {
+                "context_seconds": round(ticker.context_seconds, 3),
+                "agent_seconds": round(ticker.agent_seconds, 3),
+                "model_calls": ticker.model_calls,
+                "tool_calls": ticker.tool_calls,
+                "input_tokens": ticker.input_tokens,
+                "output_tokens": ticker.output_tokens,
+            }
+            for ticker in usage
+        },
+    }
+
+
+def report(results: dict[str, dict[str, Any]], per_ticker: bool) -> None:
+    print(
+        f"{'batch':10} {'wall s':>8} {'analyze s':>9} {'publish s':>9} {'agent p50':>9} {'tools/t':>7} "
+        f"{'tokens/t':>8} {'peak MB':>8} {'MB/t':>6} {'SEC':>5} {'yf':>5} {'Slack':>5} {'cache':>5} {'failed':>6}"
+    )
+    for label, batch in results.items():
+        print(
+            f"{label:10} {batch['wall_seconds']:8.2f} {batch['analysis_seconds']:9.2f} "
+            f"{batch['publish_seconds']:9.2f} {batch['agent_seconds_p50']:9.2f} {batch['tool_calls_per_ticker']:7.1f} "
+            f"{batch['tokens_per_ticker']:8d} {batch['peak_memory_mb']:8.1f} {batch['peak_memory_mb_per_ticker']:6.2f} "
+            f"{batch['sec_requests']:5d} {batch['yfinance_requests']:5d} {batch['slack_calls']:5d} "
+            f"{batch['tool_cache_hit_rate']:5.0%} {batch['failures']:6d}"
+        )
+    if not per_ticker:
+        return
+    for label, batch in results.items():
+        print(f"\n{label}: {'ticker':8} {'context s':>9} {'agent s':>8} {'model':>5} {'tools':>5} {'tokens':>7}")
+        for symbol, ticker in batch["per_ticker"].items():
+            print(
+                f"{'':{len(label) + 1}} {symbol:8} {ticker['context_seconds']:9.2f} {ticker['agent_seconds']:8.2f} "
+                f"{ticker['model_calls']:5d} {ticker['tool_calls']:5d} "
+                f"{ticker['input_tokens'] + ticker['output_tokens']:7d}"
+            )
+
+
+def compare(results: dict[str, dict[str, Any]], previous: dict[str, dict[str, Any]]) -> None:
+    for label, batch in results.items():
+        before = previous.get(label)
+        if before is None:
+            continue
+        changes = []
+        for metric in COMPARED_METRICS:
+            old, new = before.get(metric), batch[metric]
+            change = f"{(new - old) / old:+.0%}" if old else "n/a"
+            changes.append(f"{metric} {old} -> {new} ({change})")
+        print(f"{label:10} " + ", ".join(changes))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batches", type=int, nargs="+", default=BATCH_SIZES, help="batch sizes (default 1 5 50)")
+    parser.add_argument(
+        "--mode", choices=["thread", "async"], default="thread", help="execute_per_ticker or aexecute_per_ticker"
+    )
+    parser.add_argument("--warm", action="store_true", help="run every batch a second time with warm caches")
+    parser.add_argument("--latency-scale", type=float, default=0.1, help="factor of recorded latencies (default 0.1)")
+    parser.add_argument("--concurrency", type=int, default=int(os.environ.get("TICKER_MAX_CONCURRENCY", "5")))
+    parser.add_argument("--cache-dir", type=Path, help="cache directory to use instead of a fresh temporary one")
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc, which slows Python code down")
+    parser.add_argument("--per-ticker", action="store_true", help="print the metrics of every ticker")
+    parser.add_argument("--verbose", action="store_true", help="show the agents' output while they run")
+    parser.add_argument("--output", type=Path, help="write the results as JSON")
+    parser.add_argument("--compare", type=Path, help="results of an earlier run (--output) to compare with")
+    args = parser.parse_args()
+
+    # Nothing may leave the machine: no telemetry, no caches shared with a real digest.
+    os.environ["AGNO_TELEMETRY"] = "false"
+    os.environ["YAYA_CACHE_DIR"] = str(args.cache_dir or tempfile.mkdtemp(prefix="offline_digest_"))
+    print(f"Caches in {os.environ['YAYA_CACHE_DIR']}, latency scale {args.latency_scale}, mode {args.mode}")
+
+    tickers = bench_tickers(sum(args.batches))
+    bench = build_bench(tickers, args.latency_scale, args.concurrency)
+    if not args.no_memory:
+        tracemalloc.start()
+
+    results: dict[str, dict[str, Any]] = {}
+    offset = 0
+    try:
+        for size in args.batches:
+            batch = tickers[offset : offset + size]
+            offset += size
+            results[f"{size} cold"] = run_batch(bench, batch, args.mode, quiet=not args.verbose)
+            if args.warm:
+                results[f"{size} warm"] = run_batch(bench, batch, args.mode, quiet=not args.verbose)
+    finally:
+        tracemalloc.stop()
+        bench.slack.close()
+
+    report(results, args.per_ticker)
+    if args.compare:
+        print(f"\nCompared with {args.compare}:")
+        compare(results, json.loads(args.compare.read_text(encoding="utf-8")))
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
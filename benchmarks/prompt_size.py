@@ -0,0 +1,67 @@
+"""
+Prompt size regression benchmark.
+
+Measures the estimated token count of every prompt the team sends (leader instructions per section, agent
+instructions, and the leader prompt plus the routed styler template per asset type) and compares them with
+``prompt_size_baseline.json``. Exits with status 1 when any prompt grew by more than the tolerance.
+
+    uv run python -m benchmarks.prompt_size            # compare with the baseline
+    uv run python -m benchmarks.prompt_size --update   # accept the current sizes as the new baseline
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from invesetment_agent.infrastructure.adapter.agno_financial_team.financial_team import build_leader_prompt
+from invesetment_agent.infrastructure.adapter.agno_financial_team.instruction_registry import get_instruction_registry
+from invesetment_agent.infrastructure.adapter.asset_type_router import STYLER_TEMPLATES
+
+BASELINE_PATH = Path(__file__).resolve().parent / "prompt_size_baseline.json"
+
+
+def measure() -> dict[str, int]:
+    registry = get_instruction_registry()
+    leader_prompt = build_leader_prompt(registry)
+    sizes = {f"leader/{name}": tokens for name, tokens in leader_prompt.token_counts().items()}
+    sizes["leader/total"] = leader_prompt.total_tokens
+    for name in ("finance_agent_instructions.md", "news_sentiment_instructions.md"):
+        sizes[f"agent/{name}"] = registry.instruction(name).tokens
+    for asset_type, template in STYLER_TEMPLATES.items():
+        sizes[f"routed/{asset_type}"] = leader_prompt.total_tokens + registry.instruction(template).tokens
+    return sizes
+
+
+def compare(sizes: dict[str, int], baseline: dict[str, int], tolerance: float) -> list[str]:
+    regressions = []
+    for name, tokens in sizes.items():
+        previous = baseline.get(name)
+        change = f"{tokens - previous:+d}" if previous is not None else "new"
+        print(f"{name:55} {tokens:6d} tokens ({change})")
+        if previous is not None and tokens > previous * (1 + tolerance):
+            regressions.append(f"{name}: {previous} -> {tokens} tokens")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--update", action="store_true", help="write the current sizes as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.05, help="allowed growth ratio (default 0.05)")
+    args = parser.parse_args()
+
+    sizes = measure()
+    if args.update:
+        BASELINE_PATH.write_text(json.dumps(sizes, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"Baseline written to {BASELINE_PATH}")
+        return
+
+    baseline = json.loads(BASELINE_PATH.read_text(encoding="utf-8")) if BASELINE_PATH.exists() else {}
+    regressions = compare(sizes, baseline, args.tolerance)
+    if regressions:
+        print("Prompt size regressions:\n" + "\n".join(regressions))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
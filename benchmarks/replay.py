@@ -0,0 +1,436 @@
+"""
+Replays of the external services a digest talks to, so the real team, tools and caches run offline.
+
+- ``ReplayModel``: Agno model answering every agent turn, tool calls included, from ``fixtures/model_turns.json``.
+- ``SecCassette``: requests transport adapter mounted on the SEC client's session. It serves
+  ``company_tickers.json``, submissions and Form 4 documents from ``fixtures/http.json`` and
+  ``fixtures/sec_form4.xml``, with ETags so conditional requests get their 304.
+- ``RecordedYahooFinance``: stands in for ``yfinance.Ticker``. yfinance talks to Yahoo through its own curl_cffi
+  session, which no requests adapter can intercept, so its responses are replayed one level up.
+- ``SlackStubServer``: local HTTP server answering the Slack Web API methods the publisher calls.
+
+Fixture strings are templates: ``{ticker}``, ``{ticker_lower}``, ``{name}``, ``{cik}`` and ``{cik_padded}`` are
+replaced for every benchmark ticker. Each replayed response takes its recorded latency times ``latency_scale``.
+"""
+
+import asyncio
+import hashlib
+import io
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from collections.abc import AsyncIterator, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import date
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+from uuid import uuid4
+
+import pandas as pd
+import yfinance
+from agno.models.base import Model
+from agno.models.message import Message
+from agno.models.metrics import Metrics
+from agno.models.response import ModelResponse
+from requests import PreparedRequest, Response  # type: ignore
+from requests.adapters import BaseAdapter  # type: ignore
+from requests.structures import CaseInsensitiveDict  # type: ignore
+
+from invesetment_agent.application.external_service.sec_http import SecHttpClient
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+# Trading days returned by ``Ticker.history`` per period.
+HISTORY_PERIODS = {"1d": 1, "5d": 5, "1mo": 21, "3mo": 63, "6mo": 126, "1y": 252, "ytd": 200}
+
+
+def load_fixture(name: str) -> Any:
+    return json.loads((FIXTURES_DIR / name).read_text(encoding="utf-8"))
+
+
+@dataclass(frozen=True)
+class BenchTicker:
+    symbol: str
+    cik: int
+    name: str
+
+    def render(self, value: Any) -> Any:
+        """``value`` with the placeholders of every nested string replaced for this ticker."""
+        if isinstance(value, str):
+            for placeholder, replacement in (
+                ("{ticker}", self.symbol),
+                ("{ticker_lower}", self.symbol.lower()),
+                ("{name}", self.name),
+                ("{cik}", str(self.cik)),
+                ("{cik_padded}", str(self.cik).zfill(10)),
+            ):
+                value = value.replace(placeholder, replacement)
+            return value
+        if isinstance(value, dict):
+            return {key: self.render(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.render(item) for item in value]
+        return value
+
+
+def bench_tickers(count: int, start: int = 1) -> list[BenchTicker]:
+    """Made-up tickers T001, T002, ..., each with its own CIK, so no two batches share cached data."""
+    return [
+        BenchTicker(symbol=f"T{index:03d}", cik=900_000 + index, name=f"Benchmark Corp {index}")
+        for index in range(start, start + count)
+    ]
+
+
+@dataclass
+class TickerUsage:
+    """What the replayed model did for one ticker, plus where the ticker's time went."""
+
+    ticker: BenchTicker
+    context_seconds: float = 0.0
+    agent_seconds: float = 0.0
+    model_calls: int = 0
+    tool_calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens
+
+    def record_turn(self, tool_calls: int, input_tokens: int, output_tokens: int) -> None:
+        with self._lock:
+            self.model_calls += 1
+            self.tool_calls += tool_calls
+            self.input_tokens += input_tokens
+            self.output_tokens += output_tokens
+
+
+_current_usage: ContextVar[TickerUsage | None] = ContextVar("replay_ticker_usage", default=None)
+
+
+@contextmanager
+def recording(usage: TickerUsage) -> Iterator[TickerUsage]:
+    """Replay model turns made by the current context for ``usage.ticker`` and count them there."""
+    token = _current_usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _current_usage.reset(token)
+
+
+@dataclass
+class ReplayModel(Model):
+    """
+    Agno model replaying the recorded turns of one agent. The turn is chosen by the number of assistant
+    messages already in the conversation, so a single instance serves any number of concurrent runs.
+    """
+
+    id: str = "replay"
+    name: str = "Replay"
+    provider: str = "Replay"
+    turns: list[dict[str, Any]] = field(default_factory=list)
+    latency_scale: float = 1.0
+
+    def invoke(self, *args: Any, **kwargs: Any) -> ModelResponse:
+        turn = self._next_turn(kwargs["messages"])
+        time.sleep(float(turn.get("latency_seconds", 0.0)) * self.latency_scale)
+        return self._response(turn)
+
+    async def ainvoke(self, *args: Any, **kwargs: Any) -> ModelResponse:
+        turn = self._next_turn(kwargs["messages"])
+        await asyncio.sleep(float(turn.get("latency_seconds", 0.0)) * self.latency_scale)
+        return self._response(turn)
+
+    def invoke_stream(self, *args: Any, **kwargs: Any) -> Iterator[ModelResponse]:
+        yield self.invoke(*args, **kwargs)
+
+    async def ainvoke_stream(self, *args: Any, **kwargs: Any) -> AsyncIterator[ModelResponse]:
+        yield await self.ainvoke(*args, **kwargs)
+
+    def _parse_provider_response(self, response: Any, **kwargs: Any) -> ModelResponse:
+        # ``invoke`` already answers with parsed responses.
+        assert isinstance(response, ModelResponse)
+        return response
+
+    def _parse_provider_response_delta(self, response: Any) -> ModelResponse:
+        assert isinstance(response, ModelResponse)
+        return response
+
+    def _next_turn(self, messages: list[Message]) -> dict[str, Any]:
+        usage = _current_usage.get()
+        if usage is None:
+            raise RuntimeError("ReplayModel called outside of recording(), no ticker to replay for")
+        if not self.turns:
+            raise RuntimeError(f"No recorded turns for model {self.id}")
+        index = sum(1 for message in messages if message.role == "assistant")
+        turn = dict(usage.ticker.render(self.turns[min(index, len(self.turns) - 1)]))
+        if index >= len(self.turns):
+            # More turns than recorded: answer with the last one and stop calling tools.
+            turn["tool_calls"] = []
+        recorded = turn.get("usage", {})
+        usage.record_turn(
+            tool_calls=len(turn.get("tool_calls", [])),
+            input_tokens=int(recorded.get("input_tokens", 0)),
+            output_tokens=int(recorded.get("output_tokens", 0)),
+        )
+        return turn
+
+    @staticmethod
+    def _response(turn: dict[str, Any]) -> ModelResponse:
+        recorded = turn.get("usage", {})
+        input_tokens = int(recorded.get("input_tokens", 0))
+        output_tokens = int(recorded.get("output_tokens", 0))
+        return ModelResponse(
+            role="assistant",
+            content=turn.get("content"),
+            tool_calls=[
+                {
+                    "id": f"call_{uuid4().hex[:16]}",
+                    "type": "function",
+                    "function": {"name": call["name"], "arguments": json.dumps(call.get("arguments", {}))},
+                }
+                for call in turn.get("tool_calls", [])
+            ],
+            response_usage=Metrics(
+                input_tokens=input_tokens, output_tokens=output_tokens, total_tokens=input_tokens + output_tokens
+            ),
+        )
+
+
+class SecCassette(BaseAdapter):
+    """Transport adapter answering EDGAR requests from the fixtures, for the benchmark tickers only."""
+
+    def __init__(self, tickers: list[BenchTicker], fixture: dict[str, Any], form4_xml: str, latency_scale: float):
+        super().__init__()
+        self.latency = float(fixture.get("latency_seconds", 0.0)) * latency_scale
+        self.requests = 0
+        self._lock = threading.Lock()
+        # Bodies are rendered up front so the replay itself does not show up in the measured memory.
+        self._company_tickers = json.dumps(
+            {str(i): {"cik_str": t.cik, "ticker": t.symbol, "title": t.name} for i, t in enumerate(tickers)}
+        ).encode()
+        self._submissions = {t.cik: json.dumps(self._submissions_for(t, fixture)).encode() for t in tickers}
+        self._form4 = {t.cik: t.render(form4_xml).encode() for t in tickers}
+
+    def install(self, client: SecHttpClient) -> None:
+        """Route every request of ``client`` to EDGAR through this cassette."""
+        for host in ("www.sec.gov", "data.sec.gov"):
+            client.session.mount(f"https://{host}/", self)
+
+    def send(
+        self,
+        request: PreparedRequest,
+        stream: bool = False,
+        timeout: Any = None,
+        verify: Any = True,
+        cert: Any = None,
+        proxies: Any = None,
+    ) -> Response:
+        time.sleep(self.latency)
+        with self._lock:
+            self.requests += 1
+        body = self._body(str(request.url))
+        if body is None:
+            return self._response(request, HTTPStatus.NOT_FOUND, b"", {})
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+        if request.headers.get("If-None-Match") == etag:
+            return self._response(request, HTTPStatus.NOT_MODIFIED, b"", {"ETag": etag})
+        content_type = "application/xml" if body.startswith(b"<?xml") else "application/json"
+        return self._response(request, HTTPStatus.OK, body, {"ETag": etag, "Content-Type": content_type})
+
+    def close(self) -> None:
+        pass
+
+    def _body(self, url: str) -> bytes | None:
+        path = urlsplit(url).path
+        if path == "/files/company_tickers.json":
+            return self._company_tickers
+        if match := re.fullmatch(r"/submissions/CIK(\d{10})\.json", path):
+            return self._submissions.get(int(match[1]))
+        if match := re.fullmatch(r"/Archives/edgar/data/(\d+)/\d+/[^/]+\.xml", path):
+            return self._form4.get(int(match[1]))
+        return None
+
+    @staticmethod
+    def _submissions_for(ticker: BenchTicker, fixture: dict[str, Any]) -> dict[str, Any]:
+        submissions: dict[str, Any] = ticker.render(fixture["submissions"])
+        recent = submissions["filings"]["recent"]
+        # Real submission files list about a thousand filings; pad with older 8-Ks to get a realistic size.
+        for number in range(len(recent["form"]), int(fixture.get("recent_filings", 0))):
+            recent["accessionNumber"].append(f"{ticker.cik:010d}-19-{number:06d}")
+            recent["filingDate"].append("2019-01-02")
+            recent["form"].append("8-K")
+            recent["primaryDocument"].append(f"{ticker.symbol.lower()}-8k_{number}.htm")
+        return submissions
+
+    @staticmethod
+    def _response(request: PreparedRequest, status: HTTPStatus, body: bytes, headers: dict[str, str]) -> Response:
+        response = Response()
+        response.status_code = int(status)
+        response.reason = status.phrase
+        response.headers = CaseInsensitiveDict(headers)
+        response.raw = io.BytesIO(body)
+        response.url = str(request.url)
+        response.request = request
+        return response
+
+
+class RecordedTicker:
+    """The parts of ``yfinance.Ticker`` used by the agents' tools and the prefetcher."""
+
+    def __init__(self, symbol: str, source: "RecordedYahooFinance"):
+        self.ticker = symbol.strip().upper()
+        self._source = source
+        self._info: dict[str, Any] | None = None
+
+    @property
+    def info(self) -> dict[str, Any]:
+        # yfinance keeps the quote summary on the Ticker after the first request as well.
+        if self._info is None:
+            self._info = self._source.info(self.ticker)
+        return self._info
+
+    @property
+    def news(self) -> list[dict[str, Any]]:
+        return self._source.news(self.ticker)
+
+    def history(self, period: str = "1mo", interval: str = "1d", **kwargs: Any) -> pd.DataFrame:
+        return self._source.history(self.ticker, period)
+
+    @property
+    def financials(self) -> pd.DataFrame:
+        return pd.DataFrame()
+
+    @property
+    def recommendations(self) -> pd.DataFrame:
+        return pd.DataFrame()
+
+
+class RecordedYahooFinance:
+    def __init__(self, tickers: list[BenchTicker], fixture: dict[str, Any], latency_scale: float):
+        self.fixture = fixture
+        self.latency = float(fixture.get("latency_seconds", 0.0)) * latency_scale
+        self.requests = 0
+        self._tickers = {ticker.symbol: ticker for ticker in tickers}
+        self._lock = threading.Lock()
+
+    def ticker(self, symbol: str, session: Any = None) -> RecordedTicker:
+        return RecordedTicker(symbol, self)
+
+    @contextmanager
+    def installed(self) -> Iterator[None]:
+        """Replace ``yfinance.Ticker`` with the recorded one while the block runs."""
+        original = yfinance.Ticker
+        yfinance.Ticker = self.ticker  # type: ignore[assignment,misc]
+        try:
+            yield
+        finally:
+            yfinance.Ticker = original  # type: ignore[misc]
+
+    def info(self, symbol: str) -> dict[str, Any]:
+        ticker = self._request(symbol)
+        return dict(ticker.render(self.fixture["info"])) if ticker else {}
+
+    def news(self, symbol: str) -> list[dict[str, Any]]:
+        ticker = self._request(symbol)
+        return list(ticker.render(self.fixture.get("news", []))) if ticker else []
+
+    def history(self, symbol: str, period: str) -> pd.DataFrame:
+        ticker = self._request(symbol)
+        if ticker is None:
+            return pd.DataFrame(columns=["Open", "High", "Low", "Close", "Volume"])
+        days = int(self.fixture.get("history_days", 252))
+        spread = float(self.fixture.get("daily_range", 0.02))
+        # A deterministic walk back from the recorded close, the same for every run of a ticker.
+        rng = random.Random(ticker.symbol)
+        closes = [float(self.fixture["last_close"])]
+        for _ in range(days - 1):
+            closes.append(closes[-1] / (1 + rng.uniform(-spread, spread)))
+        closes.reverse()
+        frame = pd.DataFrame(
+            {
+                "Open": closes,
+                "High": [close * (1 + spread / 2) for close in closes],
+                "Low": [close * (1 - spread / 2) for close in closes],
+                "Close": closes,
+                "Volume": [rng.randint(20_000_000, 80_000_000) for _ in closes],
+            },
+            index=pd.bdate_range(end=date.today(), periods=days),
+        )
+        return frame.tail(HISTORY_PERIODS.get(period, days))
+
+    def _request(self, symbol: str) -> BenchTicker | None:
+        time.sleep(self.latency)
+        with self._lock:
+            self.requests += 1
+        return self._tickers.get(symbol.strip().upper())
+
+
+class _SlackHttpServer(ThreadingHTTPServer):
+    daemon_threads = True
+    stub: "SlackStubServer"
+
+
+class _SlackApiHandler(BaseHTTPRequestHandler):
+    server: _SlackHttpServer
+
+    def do_POST(self) -> None:
+        raw = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if "json" in (self.headers.get("Content-Type") or ""):
+            params = json.loads(raw or b"{}")
+        else:
+            params = {key: values[0] for key, values in parse_qs(raw.decode()).items()}
+        body = json.dumps(self.server.stub.answer(self.path.rsplit("/", 1)[-1], params)).encode()
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class SlackStubServer:
+    """Slack Web API on localhost; point a ``WebClient`` at ``base_url``."""
+
+    def __init__(self, fixture: dict[str, Any], latency_scale: float):
+        self.latency = float(fixture.get("latency_seconds", 0.0)) * latency_scale
+        self.calls: Counter[str] = Counter()
+        self._lock = threading.Lock()
+        self._server = _SlackHttpServer(("127.0.0.1", 0), _SlackApiHandler)
+        self._server.stub = self
+        self._thread = threading.Thread(target=self._server.serve_forever, name="slack-stub", daemon=True)
+        self._thread.start()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host!s}:{port}/api/"
+
+    def answer(self, method: str, params: dict[str, Any]) -> dict[str, Any]:
+        time.sleep(self.latency)
+        with self._lock:
+            self.calls[method] += 1
+        channel = str(params.get("channel", ""))
+        if channel.startswith("#"):
+            channel = "C" + hashlib.sha1(channel.encode()).hexdigest()[:10].upper()
+        if method == "chat.postMessage":
+            ts = f"{time.time():.6f}"
+            return {"ok": True, "channel": channel, "ts": ts, "message": {"text": params.get("text"), "ts": ts}}
+        if method == "chat.update":
+            return {"ok": True, "channel": channel, "ts": params.get("ts"), "text": params.get("text")}
+        return {"ok": False, "error": "unknown_method"}
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
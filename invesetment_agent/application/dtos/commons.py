@@ -19,6 +19,7 @@ class ErrorCode(Enum):
     UNAUTHORIZED = "UNAUTHORIZED"
     CONFLICT = "CONFLICT"
     AGENT_EXECUTION_ERROR = "AGENT_EXECUTION_ERROR"
+    TIMEOUT = "TIMEOUT"
 
 
 @dataclass(frozen=True)
@@ -57,6 +58,11 @@ class Error:
         """Create a BUSINESS_RULE_VIOLATION error with the specified message."""
         return cls(code=ErrorCode.BUSINESS_RULE_VIOLATION, message=message)
 
+    @classmethod
+    def timeout(cls, message: str) -> Self:
+        """Create a TIMEOUT error with the specified message."""
+        return cls(code=ErrorCode.TIMEOUT, message=message)
+
 
 @dataclass(frozen=True)
 class Result(Generic[T]):
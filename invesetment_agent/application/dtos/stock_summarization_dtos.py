@@ -2,6 +2,8 @@ from dataclasses import dataclass, field
 
 import yfinance
 
+from invesetment_agent.application.dtos.commons import Result
+
 
 @dataclass(frozen=True)
 class SingleTickerSummarizationRequest:
@@ -23,3 +25,9 @@ class SingleTickerSummarizationRequest:
 @dataclass(frozen=True)
 class MultiTickerSummarizationRequest:
     single_requests: list[SingleTickerSummarizationRequest] = field(default_factory=lambda: [])
+
+
+@dataclass(frozen=True)
+class SingleTickerSummarizationResponse:
+    ticker: str
+    result: Result
@@ -0,0 +1,106 @@
+"""
+Streaming parser for SEC Form 4 ownership documents.
+
+The document is fed to an incremental ``XMLPullParser`` chunk by chunk as it is downloaded. Each transaction
+element is converted to a ``Form4Transaction`` as soon as its closing tag arrives and then cleared, so the
+full tree is never held in memory and parsing stops as soon as the caller has enough transactions.
+"""
+
+import xml.etree.ElementTree as ET
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from typing import cast
+
+_TRANSACTION_TAGS = {"nonDerivativeTransaction": False, "derivativeTransaction": True}
+
+
+@dataclass(frozen=True)
+class Form4Transaction:
+    date: str
+    owner: str
+    security: str
+    code: str | None
+    acquired: bool
+    shares: float | None
+    price: float | None
+    owned_after: float | None
+    derivative: bool
+
+    @property
+    def action(self) -> str:
+        return "Buy" if self.acquired else "Sell"
+
+    def to_record(self) -> dict:
+        """Dictionary shape returned by the ``fetch_form4_transactions`` tool."""
+        return {
+            "date": self.date,
+            "name": self.owner,
+            "action": self.action,
+            "price": _format_number(self.price),
+            "shares": _format_number(self.shares),
+            "security": self.security,
+            "code": self.code or "",
+            "owned_after": _format_number(self.owned_after),
+            "derivative": self.derivative,
+        }
+
+
+def iter_form4_transactions(
+    chunks: Iterable[bytes], filing_date: str, include_derivative: bool = False
+) -> Iterator[Form4Transaction]:
+    """
+    Yield the transactions of a Form 4 document in document order while its body is still arriving.
+    Transactions without a ``transactionAmounts`` block are skipped. ``filing_date`` is used when a
+    transaction has no date of its own.
+    """
+    parser: ET.XMLPullParser = ET.XMLPullParser(events=("end",))
+    owner = "Unknown"
+    for chunk in chunks:
+        parser.feed(chunk)
+        for _, element in cast(Iterator[tuple[str, ET.Element]], parser.read_events()):
+            if element.tag == "rptOwnerName" and owner == "Unknown" and element.text:
+                owner = element.text
+            elif element.tag in _TRANSACTION_TAGS:
+                derivative = _TRANSACTION_TAGS[element.tag]
+                if include_derivative or not derivative:
+                    transaction = _to_transaction(element, owner, filing_date, derivative)
+                    if transaction is not None:
+                        yield transaction
+                element.clear()
+    parser.close()
+
+
+def _to_transaction(element: ET.Element, owner: str, filing_date: str, derivative: bool) -> Form4Transaction | None:
+    amounts = element.find("transactionAmounts")
+    if amounts is None:
+        return None
+    return Form4Transaction(
+        date=_text(element, "transactionDate/value") or filing_date,
+        owner=owner,
+        security=_text(element, "securityTitle/value") or "Security",
+        code=_text(element, "transactionCoding/transactionCode"),
+        acquired=_text(amounts, "transactionAcquiredDisposedCode/value") == "A",
+        shares=_number(amounts, "transactionShares/value"),
+        price=_number(amounts, "transactionPricePerShare/value"),
+        owned_after=_number(element, "postTransactionAmounts/sharesOwnedFollowingTransaction/value"),
+        derivative=derivative,
+    )
+
+
+def _text(element: ET.Element, path: str) -> str | None:
+    child = element.find(path)
+    return child.text.strip() if child is not None and child.text else None
+
+
+def _number(element: ET.Element, path: str) -> float | None:
+    text = _text(element, path)
+    try:
+        return float(text) if text else None
+    except ValueError:
+        return None
+
+
+def _format_number(value: float | None) -> str:
+    if value is None:
+        return "0"
+    return str(int(value)) if value.is_integer() else f"{value:f}".rstrip("0")
@@ -0,0 +1,37 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. ``acquire`` blocks until a token is available, so a single
+    bucket shared by every worker caps the aggregate request rate.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Take ``tokens`` from the bucket, sleeping as needed. Returns the time spent waiting."""
+        waited = 0.0
+        while (delay := self.try_acquire(tokens)) > 0:
+            time.sleep(delay)
+            waited += delay
+        return waited
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """Take ``tokens`` if they are available. Returns 0 when taken, otherwise the seconds until they will be."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
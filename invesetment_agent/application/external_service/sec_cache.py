@@ -0,0 +1,153 @@
+"""
+Persistent cache for SEC EDGAR responses.
+
+Filing documents under ``/Archives/edgar/data/{cik}/{accession}/`` never change once published, so they are
+cached forever and keyed by accession number. Everything else (``submissions/CIK*.json``) is kept for a short
+TTL and revalidated with its ETag afterwards. The cache is a sqlite file shared by every process using the
+same cache directory, bounded in size with least-recently-used eviction.
+"""
+
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+_ARCHIVE_URL = re.compile(r"/Archives/edgar/data/\d+/(?P<accession>\d{18})/(?P<document>[^/?#]+)$")
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    etag: str | None
+    last_modified: str | None
+    fetched_at: float
+    immutable: bool
+
+    def is_fresh(self, ttl: float) -> bool:
+        return self.immutable or time.time() - self.fetched_at < ttl
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    revalidations: int = 0
+    evictions: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record(self, counter: str, count: int = 1) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + count)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses + self.revalidations
+        return (self.hits + self.revalidations) / lookups if lookups else 0.0
+
+
+def cache_key(url: str) -> str:
+    """Archive documents are addressed by accession number, other resources by URL."""
+    match = _ARCHIVE_URL.search(url)
+    if match:
+        return f"archive:{match['accession']}/{match['document']}"
+    return url
+
+
+class EdgarCache:
+    def __init__(self, db_path: Path, ttl: float = 600, max_bytes: int = 256 * 1024 * 1024):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, body BLOB NOT NULL, etag TEXT, last_modified TEXT, fetched_at REAL NOT NULL, "
+                "last_access REAL NOT NULL, size INTEGER NOT NULL, immutable INTEGER NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)")
+            # Running total of the body sizes, kept by triggers so every process sharing the file sees writes made
+            # by the others without summing the whole table on each put.
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_size (id INTEGER PRIMARY KEY CHECK (id = 0), bytes INTEGER)"
+            )
+            self._conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS responses_size_insert AFTER INSERT ON responses "
+                "BEGIN UPDATE cache_size SET bytes = bytes + new.size; END"
+            )
+            self._conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS responses_size_update AFTER UPDATE OF size ON responses "
+                "BEGIN UPDATE cache_size SET bytes = bytes + new.size - old.size; END"
+            )
+            self._conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS responses_size_delete AFTER DELETE ON responses "
+                "BEGIN UPDATE cache_size SET bytes = bytes - old.size; END"
+            )
+            # Created after the triggers, so rows written in between are counted by exactly one of the two.
+            self._conn.execute(
+                "INSERT OR IGNORE INTO cache_size (id, bytes) SELECT 0, COALESCE(SUM(size), 0) FROM responses"
+            )
+
+    def get(self, url: str) -> CachedResponse | None:
+        """
+        Return the cached response for ``url``, fresh or stale. Only fresh responses count as hits;
+        callers revalidate stale ones and report the outcome with ``revalidated`` or ``put``.
+        """
+        key = cache_key(url)
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT body, etag, last_modified, fetched_at, immutable FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+        if row is None:
+            self.stats.record("misses")
+            return None
+        cached = CachedResponse(
+            body=bytes(row[0]), etag=row[1], last_modified=row[2], fetched_at=row[3], immutable=bool(row[4])
+        )
+        if cached.is_fresh(self.ttl):
+            self.stats.record("hits")
+        return cached
+
+    def put(self, url: str, body: bytes, etag: str | None = None, last_modified: str | None = None) -> None:
+        key = cache_key(url)
+        now = time.time()
+        with self._lock, self._conn:
+            # An upsert rather than INSERT OR REPLACE, whose implicit delete would not fire the size trigger.
+            self._conn.execute(
+                "INSERT INTO responses (key, body, etag, last_modified, fetched_at, last_access, size, immutable) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET body = excluded.body, "
+                "etag = excluded.etag, last_modified = excluded.last_modified, fetched_at = excluded.fetched_at, "
+                "last_access = excluded.last_access, size = excluded.size, immutable = excluded.immutable",
+                (key, body, etag, last_modified, now, now, len(body), key.startswith("archive:")),
+            )
+        self._evict()
+
+    def revalidated(self, url: str) -> None:
+        """Mark a stale response as fresh again after the server answered 304 Not Modified."""
+        self.stats.record("revalidations")
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE responses SET fetched_at = ? WHERE key = ?", (time.time(), cache_key(url)))
+
+    def size(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT bytes FROM cache_size").fetchone()[0])
+
+    def _evict(self) -> None:
+        excess = self.size() - self.max_bytes
+        if excess <= 0:
+            return
+        with self._lock, self._conn:
+            evicted = 0
+            for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY last_access").fetchall():
+                if excess <= 0:
+                    break
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                excess -= size
+                evicted += 1
+        self.stats.record("evictions", evicted)
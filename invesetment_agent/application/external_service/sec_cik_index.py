@@ -0,0 +1,138 @@
+"""
+Persistent ticker <-> CIK index built from SEC's ``company_tickers.json``.
+
+The file is downloaded once into a sqlite table and looked up by primary key afterwards.
+Stale indexes are refreshed in a background thread with a conditional GET (ETag / Last-Modified),
+so lookups never wait on the network once the index has been populated.
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from invesetment_agent.application.external_service.sec_http import SecHttpClient
+
+COMPANY_TICKERS_URL = "https://www.sec.gov/files/company_tickers.json"
+DEFAULT_REFRESH_INTERVAL_SECONDS = 24 * 60 * 60
+
+
+def normalize_ticker(ticker: str) -> str:
+    """SEC lists share classes with a dash (BRK-B), users usually type a dot (BRK.B)."""
+    return ticker.strip().upper().replace(".", "-")
+
+
+class CikIndex:
+    """
+    Ticker -> CIK and CIK -> ticker lookups backed by a local sqlite file.
+
+    The sqlite file can be shared by several processes; each process keeps a single connection
+    guarded by a lock so the index can be used from worker threads.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        client: SecHttpClient,
+        refresh_interval: float = DEFAULT_REFRESH_INTERVAL_SECONDS,
+        url: str = COMPANY_TICKERS_URL,
+    ):
+        self._url = url
+        self._client = client
+        self._refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._refreshing = threading.Event()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS tickers (ticker TEXT PRIMARY KEY, cik TEXT NOT NULL, title TEXT)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS tickers_cik ON tickers (cik)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    def cik_for(self, ticker: str) -> str | None:
+        """Return the zero-padded CIK for a ticker, or None if SEC does not list it."""
+        self._ensure_fresh()
+        with self._lock:
+            row = self._conn.execute("SELECT cik FROM tickers WHERE ticker = ?", (normalize_ticker(ticker),)).fetchone()
+        return str(row[0]) if row else None
+
+    def tickers_for(self, cik: str) -> list[str]:
+        """Return every ticker listed under a CIK, in SEC's file order (primary share class first)."""
+        self._ensure_fresh()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT ticker FROM tickers WHERE cik = ? ORDER BY rowid", (str(int(cik)).zfill(10),)
+            ).fetchall()
+        return [str(row[0]) for row in rows]
+
+    def __contains__(self, ticker: object) -> bool:
+        return isinstance(ticker, str) and self.cik_for(ticker) is not None
+
+    def refresh(self) -> bool:
+        """
+        Revalidate the index against SEC. Returns True if a new file was downloaded,
+        False if SEC answered 304 Not Modified.
+        """
+        with self._refresh_lock:
+            headers: dict[str, str] = {}
+            etag = self._get_meta("etag")
+            last_modified = self._get_meta("last_modified")
+            if etag and self._has_rows():
+                headers["If-None-Match"] = etag
+            if last_modified and self._has_rows():
+                headers["If-Modified-Since"] = last_modified
+
+            resp = self._client.get(self._url, headers=headers)
+            if resp.status_code == 304:
+                self._set_meta(checked_at=str(time.time()))
+                return False
+            resp.raise_for_status()
+
+            rows = [
+                (normalize_ticker(entry["ticker"]), str(entry["cik_str"]).zfill(10), entry.get("title"))
+                for entry in resp.json().values()
+            ]
+            with self._lock, self._conn:
+                self._conn.execute("DELETE FROM tickers")
+                self._conn.executemany("INSERT OR IGNORE INTO tickers (ticker, cik, title) VALUES (?, ?, ?)", rows)
+            self._set_meta(
+                etag=resp.headers.get("ETag", ""),
+                last_modified=resp.headers.get("Last-Modified", ""),
+                checked_at=str(time.time()),
+            )
+            return True
+
+    def _ensure_fresh(self) -> None:
+        if not self._has_rows():
+            # Nothing to serve yet, the first caller has to wait for the download.
+            self.refresh()
+            return
+        checked_at = float(self._get_meta("checked_at") or 0)
+        if time.time() - checked_at > self._refresh_interval and not self._refreshing.is_set():
+            self._refreshing.set()
+            threading.Thread(target=self._background_refresh, name="sec-cik-index-refresh", daemon=True).start()
+
+    def _background_refresh(self) -> None:
+        try:
+            self.refresh()
+        except Exception:
+            # Keep serving the stale index, the next lookup after the interval will retry.
+            pass
+        finally:
+            self._refreshing.clear()
+
+    def _has_rows(self) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM tickers LIMIT 1").fetchone() is not None
+
+    def _get_meta(self, key: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return str(row[0]) if row and row[0] else None
+
+    def _set_meta(self, **values: str) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", list(values.items()))
@@ -0,0 +1,137 @@
+"""
+Shared HTTP client for SEC traffic.
+
+One ``requests.Session`` is reused for every call so connections to www.sec.gov and data.sec.gov stay alive
+across requests, with a connection pool sized per host. Every attempt takes a token from the shared rate
+limiter, and 429/503 responses are retried with exponential backoff (or SEC's Retry-After).
+"""
+
+import threading
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+import requests  # type: ignore
+from requests.adapters import HTTPAdapter  # type: ignore
+from tenacity import (
+    RetryCallState,
+    Retrying,
+    retry_if_exception_type,
+    retry_if_result,
+    stop_after_attempt,
+    wait_exponential,
+)
+
+from invesetment_agent.application.external_service.rate_limiter import TokenBucket
+from invesetment_agent.application.external_service.tracing import span
+
+RETRY_STATUSES = frozenset({429, 503})
+MAX_RETRY_AFTER_SECONDS = 60.0
+_EXPONENTIAL_BACKOFF = wait_exponential(multiplier=0.5, max=10)
+
+
+@dataclass
+class HostMetrics:
+    requests: int = 0
+    retries: int = 0
+    errors: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    @property
+    def average_seconds(self) -> float:
+        return self.total_seconds / self.requests if self.requests else 0.0
+
+
+class SecHttpClient:
+    def __init__(
+        self,
+        headers: dict[str, str],
+        rate_limiter: TokenBucket,
+        pool_sizes: dict[str, int] | None = None,
+        default_pool_size: int = 10,
+        max_attempts: int = 4,
+        timeout: float = 30,
+    ):
+        self.rate_limiter = rate_limiter
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self._metrics: dict[str, HostMetrics] = {}
+        self._metrics_lock = threading.Lock()
+
+        self.session = requests.Session()
+        self.session.headers.update(headers)
+        self.session.mount("https://", HTTPAdapter(pool_maxsize=default_pool_size))
+        for host, size in (pool_sizes or {}).items():
+            self.session.mount(f"https://{host}/", HTTPAdapter(pool_maxsize=size, pool_block=True))
+
+    def get(self, url: str, headers: dict[str, str] | None = None, stream: bool = False) -> requests.Response:
+        """
+        GET ``url`` over the pooled session. 429/503 answers and connection errors are retried with
+        exponential backoff; the final response is returned without raising so callers can handle 304s.
+        """
+        host = urlsplit(url).netloc
+        retrying = Retrying(
+            retry=retry_if_result(lambda resp: resp.status_code in RETRY_STATUSES)
+            | retry_if_exception_type(requests.ConnectionError),
+            wait=self._backoff,
+            stop=stop_after_attempt(self.max_attempts),
+            before_sleep=lambda state: self._before_retry(host, state),
+            retry_error_callback=lambda state: state.outcome.result() if state.outcome else None,
+        )
+        return retrying(self._timed_get, host, url, headers, stream)
+
+    def iter_content(
+        self, url: str, headers: dict[str, str] | None = None, chunk_size: int = 64 * 1024
+    ) -> Iterator[bytes]:
+        """Stream a response body, gzip-decoded chunk by chunk as it arrives."""
+        resp = self.get(url, headers=headers, stream=True)
+        try:
+            resp.raise_for_status()
+            yield from resp.iter_content(chunk_size=chunk_size)
+        finally:
+            resp.close()
+
+    def metrics(self) -> dict[str, HostMetrics]:
+        """Snapshot of request timing per host."""
+        with self._metrics_lock:
+            return {host: HostMetrics(**vars(metrics)) for host, metrics in self._metrics.items()}
+
+    @staticmethod
+    def _backoff(state: RetryCallState) -> float:
+        # Honour SEC's Retry-After when it is given in seconds, otherwise back off exponentially.
+        if state.outcome and not state.outcome.failed:
+            retry_after = state.outcome.result().headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return min(float(retry_after), MAX_RETRY_AFTER_SECONDS)
+        return float(_EXPONENTIAL_BACKOFF(state))
+
+    def _before_retry(self, host: str, state: RetryCallState) -> None:
+        self._record(host, retries=1)
+        if state.outcome and not state.outcome.failed:
+            state.outcome.result().close()
+
+    def _timed_get(self, host: str, url: str, headers: dict[str, str] | None, stream: bool) -> requests.Response:
+        with span("sec.http GET", **{"http.url": url}) as current:
+            current.set_attribute("rate_limit.wait_seconds", self.rate_limiter.acquire())
+            started = time.perf_counter()
+            try:
+                resp = self.session.get(url, headers=headers, timeout=self.timeout, stream=stream)
+            except requests.RequestException as e:
+                self._record(host, seconds=time.perf_counter() - started, errors=1)
+                current.set_attribute("error", repr(e))
+                raise
+            self._record(host, seconds=time.perf_counter() - started, errors=int(resp.status_code >= 400))
+            current.set_attribute("http.status_code", resp.status_code)
+            return resp
+
+    def _record(self, host: str, seconds: float | None = None, retries: int = 0, errors: int = 0) -> None:
+        with self._metrics_lock:
+            metrics = self._metrics.setdefault(host, HostMetrics())
+            metrics.retries += retries
+            metrics.errors += errors
+            if seconds is not None:
+                metrics.requests += 1
+                metrics.total_seconds += seconds
+                metrics.max_seconds = max(metrics.max_seconds, seconds)
@@ -1,10 +1,23 @@
+import contextvars
+import json
 import os
-import xml.etree.ElementTree as ET
-from typing import Any
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache, partial
+from itertools import islice
+from typing import Any, TypeVar
 
-import requests  # type: ignore
 from agno.tools import tool
 
+from invesetment_agent.application.external_service.form4_parser import Form4Transaction, iter_form4_transactions
+from invesetment_agent.application.external_service.rate_limiter import TokenBucket
+from invesetment_agent.application.external_service.sec_cache import EdgarCache
+from invesetment_agent.application.external_service.sec_cik_index import CikIndex
+from invesetment_agent.application.external_service.sec_http import SecHttpClient
+from invesetment_agent.application.external_service.storage import default_cache_dir
+from invesetment_agent.application.external_service.tracing import span
+
 # SEC requires a descriptive User-Agent with an email
 SEC_USER_AGENT = os.getenv("SEC_USER_AGENT", "InvestmentAgent/1.0 (contact@example.com)")
 
@@ -17,6 +30,14 @@ def resolve_cik(ticker: str) -> str:
     return _resolve_cik(ticker)
 
 
+@tool()
+def resolve_ticker(cik: str) -> str:
+    """
+    Resolve an SEC CIK to the company's primary stock ticker.
+    """
+    return _resolve_ticker(cik)
+
+
 @tool()
 def fetch_sec_submissions(cik: str) -> dict:
     """
@@ -30,7 +51,7 @@ def fetch_latest_filing_link(ticker: str, form_type: str = "10-K") -> str:
     """
     Fetch the URL for the most recent filing of a specific type (e.g., '10-K', '10-Q', '8-K').
     """
-    return _fetch_latest_filing_link(ticker, form_type)
+    return latest_filing_link(ticker, form_type)
 
 
 @tool()
@@ -38,11 +59,22 @@ def build_insider_table(ticker: str) -> str:
     """
     Fetch recent insider transactions for a ticker and format them as an ASCII table.
     """
-    return _build_insider_table(ticker)
+    return insider_table(ticker)
 
 
 SEC_USER_AGENT = os.environ.get("SEC_USER_AGENT", "Example App contact@example.com")
 
+# SEC fair access policy allows at most 10 requests/second per client, keep some headroom.
+SEC_MAX_REQUESTS_PER_SECOND = float(os.environ.get("SEC_MAX_REQUESTS_PER_SECOND", "8"))
+SEC_FETCH_CONCURRENCY = int(os.environ.get("SEC_FETCH_CONCURRENCY", "4"))
+# No burst: a full bucket plus a second of refill would let capacity + rate requests through in one second.
+SEC_RATE_LIMITER = TokenBucket(rate=SEC_MAX_REQUESTS_PER_SECOND, capacity=1)
+SEC_SUBMISSIONS_TTL_SECONDS = float(os.environ.get("SEC_SUBMISSIONS_TTL_SECONDS", "600"))
+SEC_CACHE_MAX_MB = int(os.environ.get("SEC_CACHE_MAX_MB", "256"))
+
+T = TypeVar("T")
+R = TypeVar("R")
+
 
 def _get_headers() -> dict[str, str]:
     return {
@@ -51,21 +83,80 @@ def _get_headers() -> dict[str, str]:
     }
 
 
+@lru_cache(maxsize=1)
+def get_sec_client() -> SecHttpClient:
+    """Process-wide pooled keep-alive client used for every SEC request."""
+    return SecHttpClient(
+        headers=_get_headers(),
+        rate_limiter=SEC_RATE_LIMITER,
+        pool_sizes={"www.sec.gov": SEC_FETCH_CONCURRENCY, "data.sec.gov": 2},
+    )
+
+
+@lru_cache(maxsize=1)
+def get_cik_index() -> CikIndex:
+    """Process-wide ticker <-> CIK index, persisted under the shared cache directory."""
+    return CikIndex(db_path=default_cache_dir() / "sec_cik_index.sqlite3", client=get_sec_client())
+
+
+@lru_cache(maxsize=1)
+def get_edgar_cache() -> EdgarCache:
+    """Process-wide EDGAR response cache, shared on disk by the CLI digest and the Slack bot."""
+    return EdgarCache(
+        db_path=default_cache_dir() / "sec_edgar_cache.sqlite3",
+        ttl=SEC_SUBMISSIONS_TTL_SECONDS,
+        max_bytes=SEC_CACHE_MAX_MB * 1024 * 1024,
+    )
+
+
+def _sec_get(url: str) -> bytes:
+    """
+    GET an EDGAR resource through the persistent cache. Archive documents are served from disk once
+    downloaded; other resources are revalidated with their ETag once the TTL has passed.
+    """
+    with span("sec.get", **{"http.url": url}) as current:
+        cache = get_edgar_cache()
+        cached = cache.get(url)
+        if cached is not None and cached.is_fresh(cache.ttl):
+            current.set_attribute("sec_cache", "hit")
+            return cached.body
+
+        headers: dict[str, str] = {}
+        if cached is not None and cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached is not None and cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+
+        resp = get_sec_client().get(url, headers=headers)
+        if cached is not None and resp.status_code == 304:
+            cache.revalidated(url)
+            current.set_attribute("sec_cache", "revalidated")
+            return cached.body
+        current.set_attribute("sec_cache", "miss")
+        resp.raise_for_status()
+        body = bytes(resp.content)
+        cache.put(url, body, etag=resp.headers.get("ETag"), last_modified=resp.headers.get("Last-Modified"))
+        return body
+
+
 def _resolve_cik(ticker: str) -> str:
     """
     Resolve a stock ticker to a zero-padded SEC CIK.
     """
-    url = "https://www.sec.gov/files/company_tickers.json"
-    resp = requests.get(url, headers=_get_headers())
-    resp.raise_for_status()
-    data = resp.json()
+    cik = get_cik_index().cik_for(ticker)
+    if cik is None:
+        raise ValueError(f"CIK not found for ticker: {ticker.upper()}")
+    return cik
 
-    ticker = ticker.upper()
-    for entry in data.values():
-        if entry["ticker"] == ticker:
-            return str(entry["cik_str"]).zfill(10)
 
-    raise ValueError(f"CIK not found for ticker: {ticker}")
+def _resolve_ticker(cik: str) -> str:
+    """
+    Resolve an SEC CIK to the company's primary stock ticker.
+    """
+    tickers = get_cik_index().tickers_for(cik)
+    if not tickers:
+        raise ValueError(f"Ticker not found for CIK: {cik}")
+    return tickers[0]
 
 
 def _fetch_sec_submissions(cik: str) -> dict[Any, Any]:
@@ -75,12 +166,10 @@ def _fetch_sec_submissions(cik: str) -> dict[Any, Any]:
     # Ensure CIK is 10 digits
     cik = cik.zfill(10)
     url = f"https://data.sec.gov/submissions/CIK{cik}.json"
-    resp = requests.get(url, headers=_get_headers())
-    resp.raise_for_status()
-    return dict(resp.json())
+    return dict(json.loads(_sec_get(url)))
 
 
-def _fetch_latest_filing_link(ticker: str, form_type: str = "10-K") -> str:
+def latest_filing_link(ticker: str, form_type: str = "10-K") -> str:
     """
     Fetch the URL for the most recent filing of a specific type (e.g., '10-K', '10-Q', '8-K').
     """
@@ -100,9 +189,64 @@ def _fetch_latest_filing_link(ticker: str, form_type: str = "10-K") -> str:
     return f"No recent {form_type} filing found for {ticker}."
 
 
-def _fetch_form4_transactions(ticker: str, limit: int = 5) -> list[dict]:
+def _prefetch_in_order(
+    executor: ThreadPoolExecutor, fn: Callable[[T], R], items: Iterable[T], window: int
+) -> Iterator[Future[R]]:
     """
-    Fetch and parse recent Form 4 insider transactions for a company.
+    Yield futures for ``fn(item)`` in input order while keeping up to ``window`` calls in flight.
+    Futures that were submitted but not consumed are cancelled when the caller stops iterating.
+    """
+    items = iter(items)
+
+    def submit(item: T) -> Future[R]:
+        # Calls run in a copy of the caller's context, so their spans are children of the caller's span.
+        return executor.submit(contextvars.copy_context().run, fn, item)
+
+    pending: deque[Future[R]] = deque(submit(item) for item in islice(items, window))
+    try:
+        while pending:
+            future = pending.popleft()
+            for item in islice(items, 1):
+                pending.append(submit(item))
+            yield future
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def _stream_sec_archive(url: str) -> Iterator[bytes]:
+    """
+    Stream an immutable archive document, from the EDGAR cache when possible. Bodies are only cached
+    once they have been read completely, so a caller that stops early does not store a truncated file.
+    """
+    cache = get_edgar_cache()
+    cached = cache.get(url)
+    if cached is not None:
+        with span("sec.archive", **{"http.url": url, "sec_cache": "hit"}):
+            yield cached.body
+        return
+
+    chunks: list[bytes] = []
+    with span("sec.archive", **{"http.url": url, "sec_cache": "miss"}):
+        for chunk in get_sec_client().iter_content(url):
+            chunks.append(chunk)
+            yield chunk
+    cache.put(url, b"".join(chunks))
+
+
+def _read_form4(candidate: tuple[str, str], limit: int, include_derivative: bool) -> list[Form4Transaction]:
+    url, filing_date = candidate
+    chunks = _stream_sec_archive(url)
+    records = list(islice(iter_form4_transactions(chunks, filing_date, include_derivative), limit))
+    # Read the rest of the document without parsing it, so a filing with more than ``limit`` transactions
+    # still ends up in the EDGAR cache.
+    deque(chunks, maxlen=0)
+    return records
+
+
+def _fetch_form4_records(ticker: str, limit: int = 5, include_derivative: bool = False) -> list[Form4Transaction]:
+    """
+    Fetch and parse recent Form 4 insider transactions for a company as typed records, newest filing first.
     """
     cik = _resolve_cik(ticker)
     submissions = _fetch_sec_submissions(cik)
@@ -113,7 +257,7 @@ def _fetch_form4_transactions(ticker: str, limit: int = 5) -> list[dict]:
     primary_documents = filings.get("primaryDocument", [])
     filing_dates = filings.get("filingDate", [])
 
-    records = []
+    candidates: list[tuple[str, str]] = []
     for form, acc, doc, date in zip(forms, accession_numbers, primary_documents, filing_dates, strict=False):
         if form != "4":
             continue
@@ -122,66 +266,46 @@ def _fetch_form4_transactions(ticker: str, limit: int = 5) -> list[dict]:
         # The primaryDocument in JSON might have a prefix like xslF345X05/
         # We need the raw XML which is usually just the file name at the end
         xml_name = doc.split("/")[-1]
-        url = f"https://www.sec.gov/Archives/edgar/data/{int(cik)}/{acc_clean}/{xml_name}"
-
-        try:
-            resp = requests.get(url, headers=_get_headers())
-            resp.raise_for_status()
-
-            # Simple XML parsing for Form 4
-            root = ET.fromstring(resp.content)
-
-            # Reporting Owner
-            rpt_owner = root.find(".//reportingOwner/reportingOwnerId/rptOwnerName")
-            owner_name = rpt_owner.text if rpt_owner is not None else "Unknown"
-
-            # Non-Derivative Transactions
-            for tx in root.findall(".//nonDerivativeTransaction"):
-                security_title = tx.find(".//securityTitle/value")
-                tx_date = tx.find(".//transactionDate/value")
-                tx.find(".//transactionCoding/transactionCode")
-                tx_amounts = tx.find(".//transactionAmounts")
-
-                if tx_amounts is not None:
-                    shares = tx_amounts.find(".//transactionShares/value")
-                    price = tx_amounts.find(".//transactionPricePerShare/value")
-                    acquired_disposed = tx_amounts.find(".//transactionAcquiredDisposedCode/value")
-
-                    action = "Buy" if acquired_disposed is not None and acquired_disposed.text == "A" else "Sell"
-
-                    records.append(
-                        {
-                            "date": tx_date.text if tx_date is not None else date,
-                            "name": owner_name,
-                            "action": action,
-                            "price": price.text if price is not None else "0",
-                            "shares": shares.text if shares is not None else "0",
-                            "security": security_title.text if security_title is not None else "Security",
-                        }
-                    )
-
-                if len(records) >= limit:
-                    break
-        except Exception:
-            # Skip failures and move to next
-            continue
+        candidates.append((f"https://www.sec.gov/Archives/edgar/data/{int(cik)}/{acc_clean}/{xml_name}", date))
 
-        if len(records) >= limit:
-            break
+    records: list[Form4Transaction] = []
+    executor = ThreadPoolExecutor(max_workers=SEC_FETCH_CONCURRENCY, thread_name_prefix="sec-form4")
+    try:
+        read = partial(_read_form4, limit=limit, include_derivative=include_derivative)
+        window = min(SEC_FETCH_CONCURRENCY, max(limit, 1))
+        for document in _prefetch_in_order(executor, read, candidates, window=window):
+            try:
+                records.extend(document.result()[: limit - len(records)])
+            except Exception:
+                # Skip failures and move to next
+                continue
+
+            if len(records) >= limit:
+                break
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
 
     return records
 
 
+def _fetch_form4_transactions(ticker: str, limit: int = 5) -> list[dict]:
+    """
+    Fetch and parse recent Form 4 insider transactions for a company.
+    """
+    return [record.to_record() for record in _fetch_form4_records(ticker, limit)]
+
+
 @tool()
 def fetch_form4_transactions(ticker: str, limit: int = 5) -> list[dict]:
     """
     Fetch and parse recent Form 4 insider transactions for a company.
-    Returns a list of transaction dictionaries with Date, Insider Name, Action, Price, and Shares.
+    Returns a list of transaction dictionaries with Date, Insider Name, Action, Price, Shares,
+    transaction code and shares owned after the transaction.
     """
     return _fetch_form4_transactions(ticker, limit)
 
 
-def _build_insider_table(ticker: str) -> str:
+def insider_table(ticker: str) -> str:
     """
     Fetch recent insider transactions for a ticker and format them as an ASCII table.
     """
@@ -211,4 +335,4 @@ def _build_insider_table(ticker: str) -> str:
 
 
 if __name__ == "__main__":
-    print(_build_insider_table("AAPL"))
+    print(insider_table("AAPL"))
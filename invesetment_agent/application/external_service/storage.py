@@ -0,0 +1,12 @@
+import os
+from pathlib import Path
+
+
+def default_cache_dir() -> Path:
+    """
+    Directory shared by the on-disk caches, so the CLI cron and the Slack bot reuse each other's data.
+    Override with YAYA_CACHE_DIR.
+    """
+    path = Path(os.getenv("YAYA_CACHE_DIR", str(Path.home() / ".cache" / "super_yaya_agents")))
+    path.mkdir(parents=True, exist_ok=True)
+    return path
@@ -0,0 +1,134 @@
+"""
+Tracing of a report across the use case, agents, tools, SEC requests and Slack posts.
+
+Spans are created through the OpenTelemetry API. Without an SDK tracer provider (or without OpenTelemetry
+installed at all) every span is a no-op, so instrumented code costs next to nothing until ``configure_tracing``
+installs one that writes finished spans to the console or a JSON-lines file.
+"""
+
+import functools
+import inspect
+import os
+import sys
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Protocol, TypeVar, cast
+
+try:
+    from opentelemetry import trace as _otel_trace
+except ImportError:  # pragma: no cover - optional dependency
+    _otel_trace = None  # type: ignore[assignment]
+
+F = TypeVar("F", bound=Callable[..., Any])
+AttributeValue = str | bool | int | float
+
+
+class Span(Protocol):
+    def set_attribute(self, key: str, value: AttributeValue) -> None: ...
+
+
+class _NoOpSpan:
+    def set_attribute(self, key: str, value: AttributeValue) -> None:
+        pass
+
+
+_NO_OP_SPAN = _NoOpSpan()
+
+
+@contextmanager
+def span(name: str, **attributes: AttributeValue | None) -> Iterator[Span]:
+    """Run the block inside a child span of the current one. Attributes that are None are left out."""
+    if _otel_trace is None:
+        yield _NO_OP_SPAN
+        return
+    tracer = _otel_trace.get_tracer("invesetment_agent")
+    with tracer.start_as_current_span(name) as current:
+        for key, value in attributes.items():
+            if value is not None:
+                current.set_attribute(key, value)
+        yield current
+
+
+def current_span() -> Span:
+    """The active span, for adding attributes to it; a no-op span when nothing is being traced."""
+    if _otel_trace is None:
+        return _NO_OP_SPAN
+    return cast(Span, _otel_trace.get_current_span())
+
+
+def traced(name: str | None = None) -> Callable[[F], F]:
+    """Decorate a function or coroutine function so that every call runs in a span, named after it by default."""
+
+    def decorator(func: F) -> F:
+        span_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with span(span_name):
+                    return await func(*args, **kwargs)
+
+            return cast(F, async_wrapper)
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(span_name):
+                return func(*args, **kwargs)
+
+        return cast(F, wrapper)
+
+    return decorator
+
+
+def tool_span_hook(function_name: str, function_call: Callable[..., Any], arguments: dict[str, Any]) -> Any:
+    """Agno tool hook running each tool call in a span. List it first so cache hits are recorded on the span."""
+    with span(f"tool {function_name}", **{"tool.name": function_name}) as current:
+        result = function_call(**arguments)
+        current.set_attribute("tool.result_chars", len(str(result)))
+        return result
+
+
+async def atool_span_hook(function_name: str, function_call: Callable[..., Any], arguments: dict[str, Any]) -> Any:
+    """
+    ``tool_span_hook`` for async runs of tools that are coroutines themselves, such as the team's member
+    delegation in ``arun``: Agno then hands hooks an async ``function_call`` and only awaits coroutine hooks.
+    """
+    with span(f"tool {function_name}", **{"tool.name": function_name}) as current:
+        result = function_call(**arguments)
+        if inspect.isawaitable(result):
+            result = await result
+        current.set_attribute("tool.result_chars", len(str(result)))
+        return result
+
+
+def configure_tracing(exporter: str, path: Path | None = None, service_name: str = "super-yaya-agents") -> bool:
+    """
+    Install an SDK tracer provider exporting spans to stdout (``console``) or appending them as JSON lines to
+    ``path`` (``file``). Returns False when the OpenTelemetry SDK is not installed.
+    """
+    try:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+    except ImportError:
+        print(f"Tracing to {exporter} needs the OpenTelemetry SDK: uv sync --extra tracing")
+        return False
+    assert _otel_trace is not None
+
+    if exporter == "console":
+        out = sys.stdout
+    elif exporter == "file" and path is not None:
+        out = path.open("a", encoding="utf-8")
+    else:
+        raise ValueError(f"Unknown tracing exporter {exporter!r}, expected 'console' or 'file' with a path")
+
+    def one_line(finished: ReadableSpan) -> str:
+        return str(finished.to_json(indent=None)) + os.linesep
+
+    provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+    provider.add_span_processor(BatchSpanProcessor(ConsoleSpanExporter(out=out, formatter=one_line)))
+    _otel_trace.set_tracer_provider(provider)
+    print(f"Tracing spans to {path if exporter == 'file' else 'stdout'}")
+    return True
@@ -1,7 +1,17 @@
+import asyncio
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
 
 
 class AgentService(ABC):
     @abstractmethod
     def get_answer(self, query: str) -> str:
         raise NotImplementedError("Subclasses must implement get_answer method")
+
+    async def aget_answer(self, query: str) -> str:
+        """Async counterpart of ``get_answer``. Services without a native async path run it in a worker thread."""
+        return await asyncio.to_thread(self.get_answer, query)
+
+    def stream_answer(self, query: str) -> Iterator[str]:
+        """Yield the answer in chunks as it is produced. Services that cannot stream yield it in one piece."""
+        yield self.get_answer(query)
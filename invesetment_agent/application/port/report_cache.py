@@ -0,0 +1,12 @@
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+
+
+class ReportCache(ABC):
+    @abstractmethod
+    def get_or_compute(self, ticker: str, compute: Callable[[], str]) -> str:
+        """
+        Return the cached report for ``ticker`` or produce it with ``compute`` and cache it.
+        Concurrent callers asking for the same ticker share a single ``compute`` run.
+        """
+        raise NotImplementedError("Subclasses must implement get_or_compute method")
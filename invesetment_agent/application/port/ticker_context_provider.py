@@ -0,0 +1,11 @@
+from abc import ABC, abstractmethod
+
+
+class TickerContextProvider(ABC):
+    @abstractmethod
+    def build_context(self, ticker: str) -> str:
+        """
+        Return a compact block of facts about ``ticker`` to append to the analysis prompt,
+        or an empty string when there is nothing to add.
+        """
+        raise NotImplementedError("Subclasses must implement build_context method")
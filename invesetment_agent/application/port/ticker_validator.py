@@ -0,0 +1,8 @@
+from abc import ABC, abstractmethod
+
+
+class TickerValidator(ABC):
+    @abstractmethod
+    def validate(self, tickers: list[str]) -> dict[str, bool]:
+        """Return whether each ticker is a known, tradable symbol, keyed by the tickers as given."""
+        raise NotImplementedError("Subclasses must implement validate method")
@@ -1,26 +1,264 @@
+import asyncio
+import contextvars
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
 from invesetment_agent.application.dtos.commons import Error, ErrorCode, Result
-from invesetment_agent.application.dtos.stock_summarization_dtos import MultiTickerSummarizationRequest
-from invesetment_agent.application.exceptions import MultiAgentExecutionError
+from invesetment_agent.application.dtos.stock_summarization_dtos import (
+    MultiTickerSummarizationRequest,
+    SingleTickerSummarizationRequest,
+    SingleTickerSummarizationResponse,
+)
+from invesetment_agent.application.exceptions import AgentExecutionError, MultiAgentExecutionError
+from invesetment_agent.application.external_service.tracing import span, traced
 from invesetment_agent.application.port.ai_agent_service import AgentService
+from invesetment_agent.application.port.report_cache import ReportCache
+from invesetment_agent.application.port.ticker_context_provider import TickerContextProvider
 
 
 class EquitySummarizationUseCase:
-    def __init__(self, agent_service: AgentService):
+    def __init__(
+        self,
+        agent_service: AgentService,
+        max_concurrency: int = 1,
+        ticker_timeout: float | None = None,
+        report_cache: ReportCache | None = None,
+        context_providers: list[TickerContextProvider] | None = None,
+    ):
+        """
+        Args:
+            agent_service: Service producing the report for a single ticker.
+            max_concurrency: Maximum number of tickers analyzed at the same time.
+            ticker_timeout: Seconds after which a ticker still running is reported as a TIMEOUT failure.
+            report_cache: Optional cache returning an existing report for the ticker instead of running the agents.
+            context_providers: Facts about the ticker gathered before the agents run and appended to the prompt.
+        """
         self.agent_service = agent_service
+        self.report_cache = report_cache
+        self.context_providers = context_providers or []
+        self.max_concurrency = max(1, max_concurrency)
+        self.ticker_timeout = ticker_timeout
 
+    @traced()
     def execute(self, multi_ticker_summarization_request: MultiTickerSummarizationRequest) -> Result:
-        answers: list[str] = []
-        for single_request in multi_ticker_summarization_request.single_requests:
-            try:
-                answer: str = self.agent_service.get_answer(
-                    query=f"Analyze the ticker {single_request.ticker} to provide a detailed investment report",
+        return self._combine(self.execute_per_ticker(multi_ticker_summarization_request))
+
+    @traced()
+    async def aexecute(self, multi_ticker_summarization_request: MultiTickerSummarizationRequest) -> Result:
+        return self._combine(await self.aexecute_per_ticker(multi_ticker_summarization_request))
+
+    @staticmethod
+    def _combine(responses: list[SingleTickerSummarizationResponse]) -> Result:
+        """
+        The answers in request order. When only some tickers fail, each failure is reported in place by a note,
+        so the reader sees which tickers are missing and why.
+        """
+        answers = [response.result.value for response in responses if response.result.is_success]
+        failures = [response for response in responses if not response.result.is_success]
+        if failures and not answers:
+            if len(failures) == 1:
+                return failures[0].result
+            return Result.failure(
+                Error(
+                    message=f"{len(failures)} tickers failed to be analyzed.",
+                    code=ErrorCode.AGENT_EXECUTION_ERROR,
+                    details={failure.ticker: failure.result.error.message for failure in failures},
                 )
-                answers.append(answer)
-            except MultiAgentExecutionError as e:
-                error: Error = Error(
+            )
+        return Result.success(
+            "\n".join(
+                response.result.value
+                if response.result.is_success
+                else f"⚠️ *{response.ticker.upper()} could not be analyzed:* {response.result.error.message}"
+                for response in responses
+            )
+        )
+
+    @traced()
+    def execute_per_ticker(
+        self,
+        multi_ticker_summarization_request: MultiTickerSummarizationRequest,
+        on_chunk: Callable[[str, str], None] | None = None,
+    ) -> list[SingleTickerSummarizationResponse]:
+        """
+        Analyze every ticker, up to ``max_concurrency`` at a time, and return one result per ticker in request
+        order. A failing or timed out ticker does not fail the others.
+
+        When ``on_chunk`` is given the reports are streamed and it is called with ``(ticker, chunk)`` from the
+        worker threads as the report is produced. Reports served from the cache are not streamed.
+        """
+        single_requests = multi_ticker_summarization_request.single_requests
+        results: list[Result | None] = [None] * len(single_requests)
+        queued = deque(enumerate(single_requests))
+        running: dict[Future[Result], tuple[int, float]] = {}
+        # Timed out runs cannot be interrupted, so the pool is sized for every ticker and
+        # max_concurrency is enforced here instead, counting only runs that are still awaited.
+        executor = ThreadPoolExecutor(max_workers=max(1, len(single_requests)), thread_name_prefix="ticker")
+        try:
+            while queued or running:
+                while queued and len(running) < self.max_concurrency:
+                    index, single_request = queued.popleft()
+                    # Each run gets a copy of the caller's context so its spans are children of this one.
+                    context = contextvars.copy_context()
+                    future = executor.submit(context.run, self._summarize, single_request, on_chunk)
+                    running[future] = (index, time.monotonic())
+
+                done, _ = wait(running, timeout=self._next_timeout(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, _ = running.pop(future)
+                    results[index] = future.result()
+
+                for future, (index, started_at) in list(running.items()):
+                    if self.ticker_timeout is not None and time.monotonic() - started_at >= self.ticker_timeout:
+                        del running[future]
+                        results[index] = Result.failure(
+                            Error.timeout(f"{single_requests[index].ticker} timed out after {self.ticker_timeout}s")
+                        )
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return [
+            SingleTickerSummarizationResponse(ticker=single_request.ticker, result=result)
+            for single_request, result in zip(single_requests, results, strict=True)
+            if result is not None
+        ]
+
+    @traced()
+    async def aexecute_per_ticker(
+        self, multi_ticker_summarization_request: MultiTickerSummarizationRequest
+    ) -> list[SingleTickerSummarizationResponse]:
+        """
+        Async counterpart of ``execute_per_ticker``: every ticker is a task on the running event loop, up to
+        ``max_concurrency`` of them analyzing at a time. A timed out ticker is cancelled.
+        """
+        single_requests = multi_ticker_summarization_request.single_requests
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        # Report cache calls block a thread until the analysis they hand back to the loop is done. They get their
+        # own threads: in the default executor they could take every worker that analysis needs for its context
+        # providers and sync tools, and deadlock.
+        cache_executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="report-cache")
+
+        async def summarize(single_request: SingleTickerSummarizationRequest) -> Result:
+            async with semaphore:
+                try:
+                    return await asyncio.wait_for(
+                        self._asummarize(single_request, cache_executor), timeout=self.ticker_timeout
+                    )
+                except TimeoutError:
+                    return Result.failure(
+                        Error.timeout(f"{single_request.ticker} timed out after {self.ticker_timeout}s")
+                    )
+
+        try:
+            results = await asyncio.gather(*(summarize(single_request) for single_request in single_requests))
+        finally:
+            cache_executor.shutdown(wait=False)
+        return [
+            SingleTickerSummarizationResponse(ticker=single_request.ticker, result=result)
+            for single_request, result in zip(single_requests, results, strict=True)
+        ]
+
+    def _summarize(
+        self, single_request: SingleTickerSummarizationRequest, on_chunk: Callable[[str, str], None] | None = None
+    ) -> Result:
+        base_query = f"Analyze the ticker {single_request.ticker} to provide a detailed investment report"
+        computed = False
+
+        def compute() -> str:
+            nonlocal computed
+            computed = True
+            query = self._with_context(base_query, single_request.ticker)
+            if on_chunk is None:
+                return self.agent_service.get_answer(query=query)
+            chunks: list[str] = []
+            for chunk in self.agent_service.stream_answer(query=query):
+                chunks.append(chunk)
+                on_chunk(single_request.ticker, chunk)
+            return "".join(chunks)
+
+        with span("summarize_ticker", ticker=single_request.ticker) as current:
+            try:
+                answer: str
+                if self.report_cache is None:
+                    answer = compute()
+                else:
+                    answer = self.report_cache.get_or_compute(single_request.ticker, compute)
+                    current.set_attribute("report_cache.hit", not computed)
+                return Result.success(answer)
+            except (MultiAgentExecutionError, AgentExecutionError) as e:
+                current.set_attribute("error", str(e))
+                return self._agent_failure(e)
+
+    async def _asummarize(
+        self, single_request: SingleTickerSummarizationRequest, cache_executor: ThreadPoolExecutor
+    ) -> Result:
+        ticker = single_request.ticker
+        base_query = f"Analyze the ticker {ticker} to provide a detailed investment report"
+        computed = False
+
+        async def compute() -> str:
+            nonlocal computed
+            computed = True
+            # Context providers do blocking I/O, keep them off the event loop.
+            query = await asyncio.to_thread(self._with_context, base_query, ticker)
+            return await self.agent_service.aget_answer(query=query)
+
+        with span("summarize_ticker", ticker=ticker) as current:
+            try:
+                answer: str
+                if self.report_cache is None:
+                    answer = await compute()
+                else:
+                    loop = asyncio.get_running_loop()
+                    # The cache blocks while another caller computes the same ticker, so it runs in a worker
+                    # thread and hands the actual analysis back to the event loop.
+                    context = contextvars.copy_context()
+                    answer = await loop.run_in_executor(
+                        cache_executor,
+                        context.run,
+                        self.report_cache.get_or_compute,
+                        ticker,
+                        lambda: asyncio.run_coroutine_threadsafe(compute(), loop).result(),
+                    )
+                    current.set_attribute("report_cache.hit", not computed)
+                return Result.success(answer)
+            except (MultiAgentExecutionError, AgentExecutionError) as e:
+                current.set_attribute("error", str(e))
+                return self._agent_failure(e)
+
+    @staticmethod
+    def _agent_failure(e: MultiAgentExecutionError | AgentExecutionError) -> Result:
+        if isinstance(e, MultiAgentExecutionError):
+            return Result.failure(
+                Error(
                     message=e.message,
                     code=ErrorCode.AGENT_EXECUTION_ERROR,
                     details={err.agent_name or "Unknown": str(err) for err in e.errors},
                 )
-                return Result.failure(error)
-        return Result.success("\n".join(answers))
+            )
+        return Result.failure(
+            Error(
+                message=str(e),
+                code=ErrorCode.AGENT_EXECUTION_ERROR,
+                details={e.agent_name or "Unknown": str(e)},
+            )
+        )
+
+    def _with_context(self, query: str, ticker: str) -> str:
+        """Append every provider's context to the query. A failing provider is skipped, the agents fetch the data."""
+        sections = [query]
+        for provider in self.context_providers:
+            try:
+                with span(f"{type(provider).__name__}.build_context", ticker=ticker):
+                    sections.append(provider.build_context(ticker))
+            except Exception as e:
+                print(f"{type(provider).__name__} failed for {ticker}: {e!r}")
+        return "\n\n".join(section for section in sections if section)
+
+    def _next_timeout(self, running: dict[Future[Result], tuple[int, float]]) -> float | None:
+        if self.ticker_timeout is None or not running:
+            return None
+        oldest_start = min(started_at for _, started_at in running.values())
+        return max(0.0, oldest_start + self.ticker_timeout - time.monotonic())
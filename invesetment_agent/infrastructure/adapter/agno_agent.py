@@ -1,19 +1,261 @@
+import asyncio
+import time
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
 from invesetment_agent.application.exceptions import AgentExecutionError, MultiAgentExecutionError
+from invesetment_agent.application.external_service.tracing import traced
 from invesetment_agent.application.port.ai_agent_service import AgentService
+from invesetment_agent.infrastructure.adapter.provider_stats import CircuitState, ProviderHealth
 
 
 class FallbackAgnoAgentService(AgentService):
-    def __init__(self, agent_services: list[AgentService]):
+    def __init__(
+        self,
+        agent_services: list[AgentService],
+        hedge: bool = False,
+        hedge_delay: float = 30.0,
+        hedge_percentile: float = 0.95,
+        hedge_min_samples: int = 5,
+        failure_threshold: int = 3,
+        reset_timeout: float = 60.0,
+    ):
+        """
+        Args:
+            agent_services: Providers in order of preference.
+            hedge: Start the next provider while the current one is still running once it is slower than usual,
+                and return the first non-empty answer.
+            hedge_delay: Seconds to wait before hedging, also the upper bound of the adaptive delay.
+            hedge_percentile: Latency percentile of the running provider after which the next one is started.
+            hedge_min_samples: Samples a provider needs before its percentile replaces ``hedge_delay``.
+            failure_threshold: Consecutive failures after which a provider's circuit opens and it is skipped.
+            reset_timeout: Seconds an open circuit waits before letting a single probe call through.
+        """
         self.agent_services: list[AgentService] = agent_services or []
+        self.hedge = hedge
+        self.hedge_delay = hedge_delay
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.health: dict[str, ProviderHealth] = {
+            self.provider_name(index): ProviderHealth(failure_threshold=failure_threshold, reset_timeout=reset_timeout)
+            for index in range(len(self.agent_services))
+        }
+
+    def provider_name(self, index: int) -> str:
+        return f"{index}:{type(self.agent_services[index]).__name__}"
+
+    def provider_health(self) -> dict[str, dict[str, float | int | str | None]]:
+        """Circuit state, success rate and latency percentiles per provider, for metrics."""
+        return {name: health.snapshot() for name, health in self.health.items()}
+
+    def ordered_providers(self) -> list[int]:
+        """
+        Indices of the providers in the order they should be tried: closed circuits before open ones, then highest
+        rolling success rate, lowest p50 latency and configured order.
+        """
+
+        def score(index: int) -> tuple[bool, float, float, int]:
+            health = self.health[self.provider_name(index)]
+            p50 = health.latencies.percentile(0.5)
+            return (
+                health.breaker.state == CircuitState.OPEN,
+                -round(health.success_rate, 1),
+                # Providers without latency history are tried early so they get measured.
+                p50 if p50 is not None else 0.0,
+                index,
+            )
 
+        return sorted(range(len(self.agent_services)), key=score)
+
+    @traced()
     def get_answer(self, query: str) -> str:
+        if self.hedge and len(self.agent_services) > 1:
+            return self._get_hedged_answer(query)
+
         agent_errors: list[AgentExecutionError] = []
-        for agent_service in self.agent_services:
+        for index in self.ordered_providers():
             try:
-                answer = agent_service.get_answer(query)
+                answer = self._timed_answer(index, query)
                 if answer:
                     return answer
             except AgentExecutionError as e:
                 agent_errors.append(e)
 
         raise MultiAgentExecutionError(errors=agent_errors)
+
+    @traced()
+    async def aget_answer(self, query: str) -> str:
+        if self.hedge and len(self.agent_services) > 1:
+            return await self._aget_hedged_answer(query)
+
+        agent_errors: list[AgentExecutionError] = []
+        for index in self.ordered_providers():
+            try:
+                answer = await self._atimed_answer(index, query)
+                if answer:
+                    return answer
+            except AgentExecutionError as e:
+                agent_errors.append(e)
+
+        raise MultiAgentExecutionError(errors=agent_errors)
+
+    def stream_answer(self, query: str) -> Iterator[str]:
+        """
+        Stream the answer of the first healthy provider. Providers are only switched while nothing has been
+        yielded yet; a provider failing mid-stream fails the whole answer. Streams are never hedged.
+        """
+        agent_errors: list[AgentExecutionError] = []
+        for index in self.ordered_providers():
+            name = self.provider_name(index)
+            health = self.health[name]
+            if not health.breaker.allow_request():
+                agent_errors.append(AgentExecutionError(message="circuit open, provider skipped", name=name))
+                continue
+
+            started_at = time.monotonic()
+            streamed = False
+            # True while a chunk is with the caller: what is raised then comes from the caller, not the provider.
+            consuming = False
+            try:
+                for chunk in self.agent_services[index].stream_answer(query):
+                    if chunk:
+                        streamed = True
+                        consuming = True
+                        yield chunk
+                        consuming = False
+            except Exception as e:
+                if consuming:
+                    health.breaker.release_probe()
+                    raise
+                health.record_failure()
+                if streamed or not isinstance(e, AgentExecutionError):
+                    raise
+                agent_errors.append(e)
+                continue
+            except BaseException:
+                # GeneratorExit when the caller stops reading, or an interrupt: it says nothing about the provider,
+                # only its probe slot is given back.
+                health.breaker.release_probe()
+                raise
+
+            if streamed:
+                health.record_success(time.monotonic() - started_at)
+                return
+            health.record_failure()
+
+        raise MultiAgentExecutionError(errors=agent_errors)
+
+    def _get_hedged_answer(self, query: str) -> str:
+        agent_errors: list[AgentExecutionError] = []
+        running: dict[Future[str], int] = {}
+        providers = self.ordered_providers()
+        next_position = 0
+        start_next = True
+        executor = ThreadPoolExecutor(max_workers=len(self.agent_services), thread_name_prefix="hedged-agent")
+        try:
+            while True:
+                if start_next and next_position < len(providers):
+                    index = providers[next_position]
+                    running[executor.submit(self._timed_answer, index, query)] = index
+                    next_position += 1
+                    start_next = False
+                if not running:
+                    break
+
+                delay = self._hedge_delay(providers[next_position - 1]) if next_position < len(providers) else None
+                done, _ = wait(running, timeout=delay, return_when=FIRST_COMPLETED)
+                # Either the hedge delay elapsed or a provider finished without an answer: start the next one.
+                start_next = True
+                for future in done:
+                    del running[future]
+                    try:
+                        answer = future.result()
+                    except AgentExecutionError as e:
+                        agent_errors.append(e)
+                        continue
+                    if answer:
+                        return answer
+        finally:
+            # Slower providers are abandoned, their answers are ignored.
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        raise MultiAgentExecutionError(errors=agent_errors)
+
+    async def _aget_hedged_answer(self, query: str) -> str:
+        """Same hedging as ``_get_hedged_answer`` with tasks instead of threads, losing runs are cancelled."""
+        agent_errors: list[AgentExecutionError] = []
+        running: dict[asyncio.Task[str], int] = {}
+        providers = self.ordered_providers()
+        next_position = 0
+        start_next = True
+        try:
+            while True:
+                if start_next and next_position < len(providers):
+                    index = providers[next_position]
+                    running[asyncio.create_task(self._atimed_answer(index, query))] = index
+                    next_position += 1
+                    start_next = False
+                if not running:
+                    break
+
+                delay = self._hedge_delay(providers[next_position - 1]) if next_position < len(providers) else None
+                done, _ = await asyncio.wait(running, timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+                start_next = True
+                for task in done:
+                    del running[task]
+                    try:
+                        answer = task.result()
+                    except AgentExecutionError as e:
+                        agent_errors.append(e)
+                        continue
+                    if answer:
+                        return answer
+        finally:
+            for task in running:
+                task.cancel()
+
+        raise MultiAgentExecutionError(errors=agent_errors)
+
+    def _hedge_delay(self, index: int) -> float:
+        latencies = self.health[self.provider_name(index)].latencies
+        if len(latencies) < self.hedge_min_samples:
+            return self.hedge_delay
+        return min(self.hedge_delay, latencies.percentile(self.hedge_percentile) or self.hedge_delay)
+
+    def _timed_answer(self, index: int, query: str) -> str:
+        name = self.provider_name(index)
+        health = self.health[name]
+        if not health.breaker.allow_request():
+            raise AgentExecutionError(message="circuit open, provider skipped", name=name)
+        started_at = time.monotonic()
+        try:
+            answer = self.agent_services[index].get_answer(query)
+        except Exception:
+            health.record_failure()
+            raise
+        if answer:
+            health.record_success(time.monotonic() - started_at)
+        else:
+            health.record_failure()
+        return answer
+
+    async def _atimed_answer(self, index: int, query: str) -> str:
+        name = self.provider_name(index)
+        health = self.health[name]
+        if not health.breaker.allow_request():
+            raise AgentExecutionError(message="circuit open, provider skipped", name=name)
+        started_at = time.monotonic()
+        try:
+            answer = await self.agent_services[index].aget_answer(query)
+        except asyncio.CancelledError:
+            # A hedged run that lost the race says nothing about the provider, only its probe slot is given back.
+            health.breaker.release_probe()
+            raise
+        except Exception:
+            health.record_failure()
+            raise
+        if answer:
+            health.record_success(time.monotonic() - started_at)
+        else:
+            health.record_failure()
+        return answer
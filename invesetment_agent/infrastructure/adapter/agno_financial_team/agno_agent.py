@@ -1,9 +1,18 @@
 from abc import abstractmethod
+from collections.abc import Iterator
 
 from agno.agent import Agent
+from agno.run.agent import RunContentEvent, RunErrorEvent, RunOutput
+from agno.run.team import RunContentEvent as TeamRunContentEvent
+from agno.run.team import RunErrorEvent as TeamRunErrorEvent
+from agno.run.team import TeamRunOutput
 from agno.team import Team
 
+from invesetment_agent.application.exceptions import AgentExecutionError
+from invesetment_agent.application.external_service.tracing import span
 from invesetment_agent.application.port.ai_agent_service import AgentService
+from invesetment_agent.infrastructure.adapter.agno_financial_team.run_usage import log_run_usage
+from invesetment_agent.infrastructure.adapter.agno_financial_team.tool_cache import run_scope
 
 
 class AgnoAgentService(AgentService):
@@ -13,3 +22,26 @@ class AgnoAgentService(AgentService):
     @abstractmethod
     def get_agent(self) -> Agent | Team:
         raise NotImplementedError
+
+    def instruction_tokens(self) -> int:
+        """Estimated size of the instructions assembled by the service, reported with each run's usage."""
+        return 0
+
+    def get_async_agent(self) -> Agent | Team:
+        """The agent used by ``arun``, for services whose tool hooks need a coroutine twin."""
+        return self.get_agent()
+
+    def stream_answer(self, query: str) -> Iterator[str]:
+        agent = self.get_agent()
+        # Team runs also stream their members' events, only the team's own content is part of the answer.
+        content_event: type = TeamRunContentEvent if isinstance(agent, Team) else RunContentEvent
+        error_event: type = TeamRunErrorEvent if isinstance(agent, Team) else RunErrorEvent
+
+        with span(f"{type(self).__name__}.stream_answer"), run_scope():
+            for event in agent.run(query, stream=True, yield_run_output=True):
+                if isinstance(event, content_event) and isinstance(event.content, str) and event.content:
+                    yield event.content
+                elif isinstance(event, error_event):
+                    raise AgentExecutionError(message=str(event.content or ""), name=agent.name or "Unknown")
+                elif isinstance(event, (RunOutput, TeamRunOutput)):
+                    log_run_usage(agent.name or "Unknown", event, self.instruction_tokens())
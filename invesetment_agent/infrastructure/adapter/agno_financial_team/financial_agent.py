@@ -1,39 +1,94 @@
+import asyncio
+import functools
+from collections.abc import Callable
+from typing import Any
+
 from agno.agent import Agent
 from agno.db import BaseDb
 from agno.db.base import AsyncBaseDb
 from agno.models.base import Model
 from agno.run import RunStatus
 from agno.run.agent import RunOutput
+from agno.tools import Function
 from agno.tools.yfinance import YFinanceTools
 
 from invesetment_agent.application.exceptions import AgentExecutionError
 from invesetment_agent.application.external_service.sec_tools import build_insider_table
+from invesetment_agent.application.external_service.tracing import atool_span_hook, tool_span_hook, traced
 from invesetment_agent.infrastructure.adapter.agno_financial_team.agno_agent import AgnoAgentService
-from invesetment_agent.infrastructure.adapter.agno_financial_team.utils import current_file_dir, load_instruction
+from invesetment_agent.infrastructure.adapter.agno_financial_team.instruction_registry import get_instruction_registry
+from invesetment_agent.infrastructure.adapter.agno_financial_team.tool_cache import get_tool_cache, run_scope
+
+
+def _in_worker_thread(tool: Function) -> Function:
+    """Copy of a blocking tool with a coroutine entrypoint, so Agno awaits it instead of blocking the event loop."""
+    entrypoint = tool.entrypoint
+    assert entrypoint is not None
 
-finance_rules = load_instruction(current_file_dir / "instructions" / "finance_agent_instructions.md")
+    @functools.wraps(entrypoint)
+    async def run(*args: Any, **kwargs: Any) -> Any:
+        return await asyncio.to_thread(entrypoint, *args, **kwargs)
+
+    threaded = tool.model_copy()
+    threaded.entrypoint = run
+    return threaded
 
 
 class AgnoFinancialAgent(AgnoAgentService):
     def get_agent(self):
         return self.finance_agent
 
+    def get_async_agent(self):
+        return self.async_finance_agent
+
     def __init__(self, model: Model, db: BaseDb | AsyncBaseDb | None = None):
-        self.finance_agent = Agent(
-            name="Finance_Agent",
-            role="Data Provider",
-            tools=[YFinanceTools(), build_insider_table],
-            model=model,
-            db=db,
-            instructions=[finance_rules.format(insider_tool_name=build_insider_table.name)],
-            debug_mode=True,
+        finance_rules = get_instruction_registry().get("finance_agent_instructions.md")
+        yfinance_tools = YFinanceTools()
+
+        def finance_agent(tools: list[Any], tool_hooks: list[Callable[..., Any]]) -> Agent:
+            return Agent(
+                name="Finance_Agent",
+                role="Data Provider",
+                tools=tools,
+                model=model,
+                db=db,
+                instructions=[finance_rules],
+                tool_hooks=tool_hooks,
+                debug_mode=True,
+            )
+
+        self.finance_agent = finance_agent(
+            [yfinance_tools, build_insider_table], [tool_span_hook, get_tool_cache().hook]
+        )
+        # In ``arun`` Agno hands coroutine hooks an async ``function_call`` and leaves the result of sync hooks
+        # un-awaited, so async runs go through a twin with async hooks and tools that block in worker threads.
+        self.async_finance_agent = finance_agent(
+            [_in_worker_thread(tool) for tool in [*yfinance_tools.functions.values(), build_insider_table]],
+            [atool_span_hook, get_tool_cache().ahook],
         )
 
+    @traced()
     def get_answer(self, query: str) -> str:
-        run: RunOutput = self.finance_agent.run(
-            query,
-            stream=False,
-        )
+        with run_scope():
+            run: RunOutput = self.finance_agent.run(
+                query,
+                stream=False,
+            )
+        content = run.content or ""
+        if run.status == RunStatus.error:
+            raise AgentExecutionError(
+                message=content,
+                name=run.agent_name or self.finance_agent.name or "Unknown",
+            )
+        return content
+
+    @traced()
+    async def aget_answer(self, query: str) -> str:
+        with run_scope():
+            run: RunOutput = await self.async_finance_agent.arun(
+                query,
+                stream=False,
+            )
         content = run.content or ""
         if run.status == RunStatus.error:
             raise AgentExecutionError(
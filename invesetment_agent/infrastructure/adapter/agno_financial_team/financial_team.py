@@ -1,4 +1,5 @@
-from pathlib import Path
+from collections.abc import Callable
+from typing import Any
 
 from agno.agent import Agent
 from agno.db import BaseDb
@@ -9,59 +10,113 @@ from agno.run.team import TeamRunOutput
 from agno.team import Team
 
 from invesetment_agent.application.exceptions import AgentExecutionError
+from invesetment_agent.application.external_service.tracing import atool_span_hook, tool_span_hook, traced
 from invesetment_agent.infrastructure.adapter.agno_financial_team.agno_agent import AgnoAgentService
-from invesetment_agent.infrastructure.adapter.agno_financial_team.utils import (
-    get_instruction_content,
-    load_instruction,
+from invesetment_agent.infrastructure.adapter.agno_financial_team.instruction_registry import (
+    InstructionRegistry,
+    get_instruction_registry,
 )
+from invesetment_agent.infrastructure.adapter.agno_financial_team.prompt_assembler import (
+    AssembledPrompt,
+    PromptSection,
+    assemble_prompt,
+)
+from invesetment_agent.infrastructure.adapter.agno_financial_team.run_usage import log_run_usage
+from invesetment_agent.infrastructure.adapter.agno_financial_team.tool_cache import run_scope
+from invesetment_agent.infrastructure.adapter.agno_financial_team.utils import get_instruction_content
+
+LEADER_RULES = [
+    "--- ASSET TYPE VALIDATION & ROUTING ---",
+    "0. PRE-ROUTED REQUESTS: If the request includes an ASSET TYPE ROUTING block, the asset type is "
+    "already validated and the Styler template is included: "
+    "skip steps 1 to 3 and pass that template to Slack_Styler.",
+    "1. MANDATORY VALIDATION: Use Finance_Agent to identify the ticker's asset type.",
+    "   Supported types: [Stock, Equity Fund, Mutual Fund, Index Fund, Bond ETF, Bond Fund].",
+    "2. VALIDITY CHECK: If the identified type is not in the supported list above, "
+    "stop and inform the user that the asset type is currently unsupported.",
+    "3. TEMPLATE SELECTION (DYNAMIC LOADING):",
+    "   Use the `get_instruction_content` tool to load the appropriate template for each agent:",
+    "   - IF STOCK: Load 'styler_stock_instructions.md' for Styler AND 'news_sentiment_instructions.md' for News_Sentiment_Agent.",
+    "   - IF EQUITY/MUTUAL/INDEX FUND: Load 'styler_equity_fund_instructions.md' for Styler.",
+    "   - IF BOND ETF: Load 'styler_bond_etf_instructions.md' for Styler.",
+    "   - IF BOND FUND: Load 'styler_bond_fund_instructions.md' for Styler.",
+    "4. FINAL AUDIT: Verify that Slack_Styler followed the selected template exactly. ",
+    "PREFETCHED DATA: If the request includes a PREFETCHED DATA block, treat it as verified Finance_Agent "
+    "output, pass the relevant parts along when delegating and only request data that is missing from it.",
+]
+
 
-current_file_dir = Path(__file__).resolve().parent
-instructions_path = current_file_dir / "instructions"
-leader_rules = load_instruction(instructions_path / "team_leader_instructions.md")
+def build_leader_prompt(registry: InstructionRegistry | None = None) -> AssembledPrompt:
+    """Inline routing rules plus ``team_leader_instructions.md``, without the rules stated twice."""
+    registry = registry or get_instruction_registry()
+    return assemble_prompt(
+        [
+            PromptSection("leader_rules", "\n".join(LEADER_RULES)),
+            PromptSection("team_leader_instructions.md", registry.get("team_leader_instructions.md")),
+        ]
+    )
 
 
 class AgnoFinancialTeam(AgnoAgentService):
     def get_agent(self) -> Agent | Team:
         return self.team_leader
 
+    def get_async_agent(self) -> Agent | Team:
+        return self.async_team_leader
+
+    def instruction_tokens(self) -> int:
+        return self.leader_prompt.total_tokens
+
     def __init__(
-            self, agno_agent_services: list[AgnoAgentService], model: Model, db: BaseDb | AsyncBaseDb | None = None
+        self, agno_agent_services: list[AgnoAgentService], model: Model, db: BaseDb | AsyncBaseDb | None = None
     ):
-        self.team_leader = Team(
-            name="Investment_Team_Leader",
-            members=[agno_agent_service.get_agent() for agno_agent_service in agno_agent_services],
-            model=model,
-            db=db,
-            tools=[get_instruction_content],
-            reasoning=False,
-            instructions=[
-                "--- ASSET TYPE VALIDATION & ROUTING ---",
-                "1. MANDATORY VALIDATION: Use Finance_Agent to identify the ticker's asset type.",
-                "   Supported types: [Stock, Equity Fund, Mutual Fund, Index Fund, Bond ETF, Bond Fund].",
-                "2. VALIDITY CHECK: If the identified type is not in the supported list above, "
-                "stop and inform the user that the asset type is currently unsupported.",
-                "3. TEMPLATE SELECTION (DYNAMIC LOADING):",
-                "   Use the `get_instruction_content` tool to load the appropriate template for each agent:",
-                "   - IF STOCK: Load 'styler_stock_instructions.md' for Styler AND 'news_sentiment_instructions.md' for News_Sentiment_Agent.",
-                "   - IF EQUITY/MUTUAL/INDEX FUND: Load 'styler_equity_fund_instructions.md' for Styler.",
-                "   - IF BOND ETF: Load 'styler_bond_etf_instructions.md' for Styler.",
-                "   - IF BOND FUND: Load 'styler_bond_fund_instructions.md' for Styler.",
-                "4. FINAL AUDIT: Verify that Slack_Styler followed the selected template exactly. ",
-                "MANDATORY: Every output MUST start with the title: 📡 *Daily [Asset Type] Intelligence: [COMPANY/FUND NAME] ($[TICKER])*. ",
-                "CRITICAL: The final output MUST be a plain text message for Slack. ",
-                "STRICTLY FORBIDDEN: JSON structures, standard Markdown (like **Bold**), or internal reasoning logs. ",
-                "DATA AVAILABILITY: If certain metrics are missing, ensure the report still includes all other available data. Do not skip the entire report.",
-                leader_rules,
-            ],
-            debug_mode=True,
-            markdown=True,
-        )
+        # Its size is reported with every run's usage; ``benchmarks/prompt_size.py`` breaks it down by section.
+        self.leader_prompt = leader_prompt = build_leader_prompt()
 
+        def leader(members: list[Agent | Team], tool_hook: Callable[..., Any]) -> Team:
+            return Team(
+                name="Investment_Team_Leader",
+                members=members,
+                model=model,
+                db=db,
+                tools=[get_instruction_content],
+                tool_hooks=[tool_hook],
+                reasoning=False,
+                instructions=leader_prompt.instructions,
+                debug_mode=True,
+                markdown=True,
+            )
+
+        self.team_leader = leader([service.get_agent() for service in agno_agent_services], tool_span_hook)
+        # In ``arun`` the member delegation is a coroutine tool, whose hooks Agno only awaits when they are
+        # coroutines themselves, while ``run`` skips coroutine hooks. Async runs go through a twin leader
+        # delegating to the members' async twins.
+        self.async_team_leader = leader([service.get_async_agent() for service in agno_agent_services], atool_span_hook)
+
+    @traced()
     def get_answer(self, query: str) -> str:
-        run: TeamRunOutput = self.team_leader.run(
-            query,
-            stream=False,
-        )
+        with run_scope():
+            run: TeamRunOutput = self.team_leader.run(
+                query,
+                stream=False,
+            )
+        log_run_usage(self.team_leader.name or "Investment_Team_Leader", run, self.instruction_tokens())
+        content = run.content or ""
+        if run.status == RunStatus.error:
+            raise AgentExecutionError(
+                message=content,
+                name=run.team_name or "Investment_Team_Leader",
+            )
+        return content
+
+    @traced()
+    async def aget_answer(self, query: str) -> str:
+        with run_scope():
+            run: TeamRunOutput = await self.async_team_leader.arun(
+                query,
+                stream=False,
+            )
+        log_run_usage(self.async_team_leader.name or "Investment_Team_Leader", run, self.instruction_tokens())
         content = run.content or ""
         if run.status == RunStatus.error:
             raise AgentExecutionError(
@@ -0,0 +1,125 @@
+"""
+In-memory registry of the instruction and template files.
+
+Every ``*.md`` file under ``instructions/`` is read once, with its ``str.format`` substitutions already applied,
+a content hash and a token estimate. ``reload`` only re-reads files whose size or modification time changed,
+so polling it is cheap; ``fingerprint`` changes whenever any file does and is used in cache keys.
+"""
+
+import hashlib
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from invesetment_agent.application.external_service.sec_tools import build_insider_table
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about 4 characters per token), good enough to budget prompt size."""
+    return (len(text) + 3) // 4
+
+
+@dataclass(frozen=True)
+class Instruction:
+    name: str
+    content: str
+    sha256: str
+    size: int
+    mtime_ns: int
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.content)
+
+
+class InstructionRegistry:
+    def __init__(self, directory: Path, substitutions: dict[str, dict[str, str]] | None = None):
+        """
+        Args:
+            directory: Directory of the ``*.md`` instruction files.
+            substitutions: ``str.format`` arguments per file name, applied once when the file is loaded.
+        """
+        self.directory = directory
+        self.substitutions = substitutions or {}
+        self._instructions: dict[str, Instruction] = {}
+        self._lock = threading.Lock()
+        self.reload()
+
+    def get(self, name: str) -> str:
+        return self.instruction(name).content
+
+    def instruction(self, name: str) -> Instruction:
+        with self._lock:
+            try:
+                return self._instructions[name]
+            except KeyError:
+                raise KeyError(f"Instruction not found: {name}") from None
+
+    def names(self) -> list[str]:
+        with self._lock:
+            return sorted(self._instructions)
+
+    @property
+    def fingerprint(self) -> str:
+        """Short hash of every instruction file, changes whenever a prompt or template is edited."""
+        digest = hashlib.sha256()
+        with self._lock:
+            for name in sorted(self._instructions):
+                digest.update(name.encode())
+                digest.update(self._instructions[name].sha256.encode())
+        return digest.hexdigest()[:16]
+
+    def token_estimates(self) -> dict[str, int]:
+        with self._lock:
+            return {name: instruction.tokens for name, instruction in sorted(self._instructions.items())}
+
+    def reload(self) -> bool:
+        """Re-read added or modified files and forget deleted ones. Returns True if anything changed."""
+        paths = {path.name: path for path in self.directory.glob("*.md")}
+        with self._lock:
+            current = dict(self._instructions)
+        changed = current.keys() != paths.keys()
+        loaded: dict[str, Instruction] = {}
+        for name, path in paths.items():
+            stat = path.stat()
+            previous = current.get(name)
+            if previous is not None and (previous.size, previous.mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+                loaded[name] = previous
+                continue
+            raw = path.read_bytes()
+            sha256 = hashlib.sha256(raw).hexdigest()
+            content = raw.decode("utf-8")
+            if name in self.substitutions:
+                content = content.format(**self.substitutions[name])
+            loaded[name] = Instruction(name, content, sha256, stat.st_size, stat.st_mtime_ns)
+            changed = changed or previous is None or previous.sha256 != sha256
+        with self._lock:
+            self._instructions = loaded
+        return changed
+
+    def watch(self, interval: float = 30.0, on_change: Callable[[], None] | None = None) -> threading.Thread:
+        """Start a daemon thread that reloads changed files every ``interval`` seconds."""
+
+        def watch() -> None:
+            stop = threading.Event()
+            while not stop.wait(interval):
+                try:
+                    if self.reload() and on_change is not None:
+                        on_change()
+                except Exception as e:
+                    print(f"Instruction reload failed, keeping the previous files: {e!r}")
+
+        thread = threading.Thread(target=watch, name="instruction-registry-watcher", daemon=True)
+        thread.start()
+        return thread
+
+
+@lru_cache(maxsize=1)
+def get_instruction_registry() -> InstructionRegistry:
+    """Process-wide registry of the files under ``instructions/``."""
+    return InstructionRegistry(
+        directory=Path(__file__).resolve().parent / "instructions",
+        substitutions={"finance_agent_instructions.md": {"insider_tool_name": build_insider_table.name}},
+    )
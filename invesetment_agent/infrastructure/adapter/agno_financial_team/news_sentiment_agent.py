@@ -9,10 +9,9 @@ from agno.tools.hackernews import HackerNewsTools
 from agno.tools.reddit import RedditTools
 
 from invesetment_agent.application.exceptions import AgentExecutionError
+from invesetment_agent.application.external_service.tracing import tool_span_hook, traced
 from invesetment_agent.infrastructure.adapter.agno_financial_team.agno_agent import AgnoAgentService
-from invesetment_agent.infrastructure.adapter.agno_financial_team.utils import current_file_dir, load_instruction
-
-news_sentiment_rules = load_instruction(current_file_dir / "instructions" / "news_sentiment_instructions.md")
+from invesetment_agent.infrastructure.adapter.agno_financial_team.instruction_registry import get_instruction_registry
 
 
 class AgnoNewsSentimentAgent(AgnoAgentService):
@@ -20,16 +19,19 @@ class AgnoNewsSentimentAgent(AgnoAgentService):
         return self.web_agent
 
     def __init__(self, model: Model, db: BaseDb | AsyncBaseDb | None = None):
+        news_sentiment_rules = get_instruction_registry().get("news_sentiment_instructions.md")
         self.web_agent = Agent(
             name="News_Sentiment_Agent",
             role="Sentiment Analyst",
             tools=[DuckDuckGoTools(), RedditTools(), HackerNewsTools()],
+            tool_hooks=[tool_span_hook],
             model=model,
             db=db,
             instructions=[news_sentiment_rules],
             debug_mode=True,
         )
 
+    @traced()
     def get_answer(self, query: str) -> str:
         run: RunOutput = self.web_agent.run(
             query,
@@ -39,3 +41,14 @@ class AgnoNewsSentimentAgent(AgnoAgentService):
         if run.status == RunStatus.error:
             raise AgentExecutionError(message=content, name=run.agent_name or self.web_agent.name or "Unknown")
         return content
+
+    @traced()
+    async def aget_answer(self, query: str) -> str:
+        run: RunOutput = await self.web_agent.arun(
+            query,
+            stream=False,
+        )
+        content = run.content or ""
+        if run.status == RunStatus.error:
+            raise AgentExecutionError(message=content, name=run.agent_name or self.web_agent.name or "Unknown")
+        return content
@@ -0,0 +1,65 @@
+"""
+Prompt assembly with per-section token counts and removal of repeated rules.
+
+A rule (one line of a section) is dropped when an earlier line already states it, i.e. their word sequences
+match with a ratio of at least ``similarity``. Short lines, headings and fenced code blocks (report templates)
+are always kept.
+"""
+
+import re
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+
+from invesetment_agent.infrastructure.adapter.agno_financial_team.instruction_registry import estimate_tokens
+
+_WORD = re.compile(r"\w+")
+
+
+@dataclass(frozen=True)
+class PromptSection:
+    name: str
+    text: str
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.text)
+
+
+@dataclass(frozen=True)
+class AssembledPrompt:
+    sections: list[PromptSection]
+    dropped_rules: list[str]
+
+    @property
+    def instructions(self) -> list[str]:
+        return [section.text for section in self.sections if section.text]
+
+    @property
+    def total_tokens(self) -> int:
+        return sum(section.tokens for section in self.sections)
+
+    def token_counts(self) -> dict[str, int]:
+        return {section.name: section.tokens for section in self.sections}
+
+
+def assemble_prompt(sections: list[PromptSection], similarity: float = 0.9, min_words: int = 6) -> AssembledPrompt:
+    seen: list[list[str]] = []
+    dropped: list[str] = []
+    assembled: list[PromptSection] = []
+    for section in sections:
+        kept: list[str] = []
+        in_code_block = False
+        for line in section.text.splitlines():
+            if line.lstrip().startswith("```"):
+                in_code_block = not in_code_block
+            words = _WORD.findall(line.lower())
+            if in_code_block or line.lstrip().startswith("#") or len(words) < min_words:
+                kept.append(line)
+                continue
+            if any(SequenceMatcher(None, words, previous).ratio() >= similarity for previous in seen):
+                dropped.append(line.strip())
+                continue
+            seen.append(words)
+            kept.append(line)
+        assembled.append(PromptSection(section.name, "\n".join(kept)))
+    return AssembledPrompt(sections=assembled, dropped_rules=dropped)
@@ -0,0 +1,66 @@
+from dataclasses import dataclass
+from typing import Any
+
+from invesetment_agent.application.external_service.tracing import current_span
+from invesetment_agent.infrastructure.adapter.agno_financial_team.instruction_registry import estimate_tokens
+
+
+@dataclass
+class RunUsage:
+    """
+    Token usage of one run, from Agno's run metrics. Tool result and instruction tokens are estimated and part of
+    input tokens.
+    """
+
+    input_tokens: int = 0
+    output_tokens: int = 0
+    member_input_tokens: int = 0
+    member_output_tokens: int = 0
+    tool_calls: int = 0
+    tool_result_tokens: int = 0
+    instruction_tokens: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens + self.member_input_tokens + self.member_output_tokens
+
+
+def run_usage(output: Any) -> RunUsage:
+    """Usage of a ``RunOutput``, ``TeamRunOutput`` or run completed event, including the team members' runs."""
+    usage = RunUsage()
+    metrics = getattr(output, "metrics", None)
+    if metrics is not None:
+        usage.input_tokens = metrics.input_tokens or 0
+        usage.output_tokens = metrics.output_tokens or 0
+    for tool in getattr(output, "tools", None) or []:
+        usage.tool_calls += 1
+        usage.tool_result_tokens += estimate_tokens(str(tool.result or ""))
+    for member_output in getattr(output, "member_responses", None) or []:
+        member = run_usage(member_output)
+        usage.member_input_tokens += member.input_tokens + member.member_input_tokens
+        usage.member_output_tokens += member.output_tokens + member.member_output_tokens
+        usage.tool_calls += member.tool_calls
+        usage.tool_result_tokens += member.tool_result_tokens
+    return usage
+
+
+def log_run_usage(name: str, output: Any, instruction_tokens: int = 0) -> RunUsage:
+    """Report the usage of a run on the current span and stdout. ``instruction_tokens``: size of the system prompt."""
+    usage = run_usage(output)
+    usage.instruction_tokens = instruction_tokens
+    current = current_span()
+    current.set_attribute("tokens.input", usage.input_tokens)
+    current.set_attribute("tokens.output", usage.output_tokens)
+    current.set_attribute("tokens.member_input", usage.member_input_tokens)
+    current.set_attribute("tokens.member_output", usage.member_output_tokens)
+    current.set_attribute("tokens.tool_results", usage.tool_result_tokens)
+    current.set_attribute("tokens.instructions", usage.instruction_tokens)
+    current.set_attribute("tokens.total", usage.total_tokens)
+    current.set_attribute("tool_calls", usage.tool_calls)
+    print(
+        f"Run usage [{name}]: prompt {usage.input_tokens}, completion {usage.output_tokens}, "
+        f"members {usage.member_input_tokens}/{usage.member_output_tokens}, "
+        f"tools {usage.tool_calls} calls ~{usage.tool_result_tokens} tokens, "
+        f"instructions ~{usage.instruction_tokens}, total {usage.total_tokens}"
+    )
+    return usage
@@ -7,10 +7,8 @@ from agno.run.agent import RunOutput
 from agno.team import Team
 
 from invesetment_agent.application.exceptions import AgentExecutionError
+from invesetment_agent.application.external_service.tracing import traced
 from invesetment_agent.infrastructure.adapter.agno_financial_team.agno_agent import AgnoAgentService
-from invesetment_agent.infrastructure.adapter.agno_financial_team.utils import current_file_dir, load_instruction
-
-finance_rules = load_instruction(current_file_dir / "instructions" / "finance_agent_instructions.md")
 
 
 class AgnoStylerAgent(AgnoAgentService):
@@ -27,6 +25,7 @@ class AgnoStylerAgent(AgnoAgentService):
             instructions=["Wait for the Team Leader to provide the specific MD template based on asset type."],
         )
 
+    @traced()
     def get_answer(self, query: str) -> str:
         run: RunOutput = self.styler_agent.run(
             query,
@@ -39,3 +38,17 @@ class AgnoStylerAgent(AgnoAgentService):
                 name=run.agent_name or self.styler_agent.name or "Unknown",
             )
         return content
+
+    @traced()
+    async def aget_answer(self, query: str) -> str:
+        run: RunOutput = await self.styler_agent.arun(
+            query,
+            stream=False,
+        )
+        content = run.content or ""
+        if run.status == RunStatus.error:
+            raise AgentExecutionError(
+                message=content,
+                name=run.agent_name or self.styler_agent.name or "Unknown",
+            )
+        return content
@@ -0,0 +1,229 @@
+"""
+Memoization of Finance_Agent tool calls, installed as an Agno tool hook.
+
+Results are cached per process with a TTL that depends on the kind of data (quotes, fundamentals, filings),
+and per team run: within a ``run_scope`` every repeated call is answered from memory whatever its TTL, so the
+leader asking the Finance_Agent several times for overlapping data costs nothing.
+"""
+
+import inspect
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any
+
+from agno.tools import Function
+from agno.tools.yfinance import YFinanceTools
+
+from invesetment_agent.application.external_service.sec_tools import (
+    build_insider_table,
+    fetch_form4_transactions,
+    fetch_latest_filing_link,
+)
+from invesetment_agent.application.external_service.tracing import current_span
+
+QUOTES = "quotes"
+FUNDAMENTALS = "fundamentals"
+FILINGS = "filings"
+
+TOOL_DATA_CLASSES = {
+    "get_current_stock_price": QUOTES,
+    "get_historical_stock_prices": QUOTES,
+    "get_technical_indicators": QUOTES,
+    "get_company_news": QUOTES,
+    # Fetched by the ticker data prefetcher before the team runs.
+    "yfinance_info": QUOTES,
+    "yfinance_price_levels": QUOTES,
+    "get_company_info": FUNDAMENTALS,
+    "get_stock_fundamentals": FUNDAMENTALS,
+    "get_income_statements": FUNDAMENTALS,
+    "get_key_financial_ratios": FUNDAMENTALS,
+    "get_analyst_recommendations": FUNDAMENTALS,
+    "build_insider_table": FILINGS,
+    "fetch_form4_transactions": FILINGS,
+    "fetch_latest_filing_link": FILINGS,
+}
+
+# Tools report failures as text instead of raising, those answers are never cached.
+_ERROR_PREFIXES = ("Error", "Could not")
+
+_run_results: ContextVar[dict[str, Any] | None] = ContextVar("tool_cache_run_results", default=None)
+
+
+@dataclass
+class ToolCacheStats:
+    hits: int = 0
+    run_hits: int = 0
+    misses: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    @property
+    def hit_rate(self) -> float:
+        calls = self.hits + self.run_hits + self.misses
+        return (self.hits + self.run_hits) / calls if calls else 0.0
+
+
+def cache_key(function_name: str, arguments: dict[str, Any], defaults: dict[str, Any] | None = None) -> str:
+    """
+    Tool name plus arguments, with tickers upper-cased so ``aapl`` and ``AAPL `` share an entry and the tool's
+    ``defaults`` filled in so a call leaving out an argument shares the entry of one passing its default value.
+    """
+    normalized = {
+        name: value.strip().upper() if name in ("symbol", "ticker") and isinstance(value, str) else value
+        for name, value in {**(defaults or {}), **arguments}.items()
+    }
+    return f"{function_name}:{json.dumps(normalized, sort_keys=True, default=str)}"
+
+
+def tool_defaults(tools: list[Function]) -> dict[str, dict[str, Any]]:
+    """Default argument values of each tool, by tool name."""
+    return {
+        tool.name: {
+            name: parameter.default
+            for name, parameter in inspect.signature(tool.entrypoint).parameters.items()
+            if parameter.default is not inspect.Parameter.empty
+        }
+        for tool in tools
+        if tool.entrypoint is not None
+    }
+
+
+class ToolCache:
+    def __init__(
+        self, ttls: dict[str, float], max_entries: int = 2048, defaults: dict[str, dict[str, Any]] | None = None
+    ):
+        """
+        Args:
+            ttls: Seconds a result stays cached in the process, per data class. Tools without a data class
+                are only deduplicated within a run.
+            max_entries: Least recently used results beyond this count are evicted.
+            defaults: Default argument values per tool name, applied to the cache keys.
+        """
+        self.ttls = ttls
+        self.max_entries = max_entries
+        self.defaults = defaults or {}
+        self.stats = ToolCacheStats()
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def ttl_for(self, function_name: str) -> float:
+        data_class = TOOL_DATA_CLASSES.get(function_name)
+        return self.ttls.get(data_class, 0.0) if data_class else 0.0
+
+    def hook(self, function_name: str, function_call: Callable[..., Any], arguments: dict[str, Any]) -> Any:
+        """Agno tool hook: answer from the run or process cache, otherwise call the tool and remember its result."""
+        return self.call(function_name, function_call, arguments)
+
+    async def ahook(self, function_name: str, function_call: Callable[..., Any], arguments: dict[str, Any]) -> Any:
+        """``hook`` for async runs, where Agno hands the hook a coroutine function and awaits only coroutine hooks."""
+        return await self.acall(function_name, function_call, arguments)
+
+    def call(self, function_name: str, function: Callable[..., Any], arguments: dict[str, Any]) -> Any:
+        """
+        Memoized ``function(**arguments)``. Code fetching data outside of an agent run uses the tool's name here
+        so its results are reused by later tool calls.
+        """
+        key = cache_key(function_name, arguments, self.defaults.get(function_name))
+        found, result = self._lookup(key)
+        if not found:
+            result = function(**arguments)
+            self._remember(key, function_name, result)
+        return result
+
+    async def acall(self, function_name: str, function: Callable[..., Any], arguments: dict[str, Any]) -> Any:
+        """``call`` for a ``function`` that may return an awaitable, awaited before its result is cached."""
+        key = cache_key(function_name, arguments, self.defaults.get(function_name))
+        found, result = self._lookup(key)
+        if not found:
+            result = function(**arguments)
+            if inspect.isawaitable(result):
+                result = await result
+            self._remember(key, function_name, result)
+        return result
+
+    def _lookup(self, key: str) -> tuple[bool, Any]:
+        run_results = _run_results.get()
+        if run_results is not None and key in run_results:
+            self.stats.record("run_hits")
+            current_span().set_attribute("tool_cache", "run_hit")
+            return True, run_results[key]
+
+        found, result = self._get(key)
+        current_span().set_attribute("tool_cache", "hit" if found else "miss")
+        self.stats.record("hits" if found else "misses")
+        if found and run_results is not None:
+            run_results[key] = result
+        return found, result
+
+    def _remember(self, key: str, function_name: str, result: Any) -> None:
+        # An awaitable means a sync hook was given an async tool call: it can only be awaited once, never cache it.
+        if inspect.isawaitable(result) or (isinstance(result, str) and result.startswith(_ERROR_PREFIXES)):
+            return
+        self._put(key, result, self.ttl_for(function_name))
+        run_results = _run_results.get()
+        if run_results is not None:
+            run_results[key] = result
+
+    def _get(self, key: str) -> tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, entry[1]
+
+    def _put(self, key: str, result: Any, ttl: float) -> None:
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+@contextmanager
+def run_scope() -> Iterator[None]:
+    """Deduplicate every tool call made by the current thread until the block exits (one team run)."""
+    if _run_results.get() is not None:
+        yield
+        return
+    token = _run_results.set({})
+    try:
+        yield
+    finally:
+        _run_results.reset(token)
+
+
+@lru_cache(maxsize=1)
+def get_tool_cache() -> ToolCache:
+    """Process-wide tool cache shared by every Finance_Agent instance."""
+    return ToolCache(
+        ttls={
+            QUOTES: float(os.environ.get("TOOL_CACHE_QUOTES_TTL_SECONDS", "60")),
+            FUNDAMENTALS: float(os.environ.get("TOOL_CACHE_FUNDAMENTALS_TTL_SECONDS", str(24 * 60 * 60))),
+            FILINGS: float(os.environ.get("TOOL_CACHE_FILINGS_TTL_SECONDS", str(7 * 24 * 60 * 60))),
+        },
+        defaults=tool_defaults(
+            [
+                *YFinanceTools().functions.values(),
+                build_insider_table,
+                fetch_latest_filing_link,
+                fetch_form4_transactions,
+            ]
+        ),
+    )
@@ -1,14 +1,6 @@
-from pathlib import Path
 from agno.tools import tool
 
-
-def load_instruction(path: Path) -> str:
-    if path.exists():
-        return path.read_text(encoding="utf-8")
-    return f"Error: {path} not found."
-
-
-current_file_dir = Path(__file__).resolve().parent
+from invesetment_agent.infrastructure.adapter.agno_financial_team.instruction_registry import get_instruction_registry
 
 
 @tool()
@@ -23,5 +15,7 @@ def get_instruction_content(instruction_name: str) -> str:
     Returns:
         The content of the instruction file as a string.
     """
-    instructions_path = current_file_dir / "instructions" / instruction_name
-    return load_instruction(instructions_path)
+    try:
+        return get_instruction_registry().get(instruction_name)
+    except KeyError:
+        return f"Error: {instruction_name} not found."
@@ -0,0 +1,150 @@
+"""
+Rule-based asset type classification and styler template routing.
+
+The asset type is derived from the yfinance ``quoteType``, ``category`` and name, and remembered in a sqlite
+lookup table since it practically never changes. The routed template is handed to the team in the prompt, so
+the leader neither delegates the classification to the Finance_Agent nor loads the template with a tool call.
+"""
+
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from invesetment_agent.application.port.ticker_context_provider import TickerContextProvider
+from invesetment_agent.infrastructure.adapter.agno_financial_team.instruction_registry import InstructionRegistry
+from invesetment_agent.infrastructure.adapter.agno_financial_team.tool_cache import ToolCache
+from invesetment_agent.infrastructure.adapter.ticker_data_prefetcher import fetch_ticker_info
+
+STOCK = "Stock"
+EQUITY_FUND = "Equity Fund"
+MUTUAL_FUND = "Mutual Fund"
+INDEX_FUND = "Index Fund"
+BOND_ETF = "Bond ETF"
+BOND_FUND = "Bond Fund"
+
+STYLER_TEMPLATES = {
+    STOCK: "styler_stock_instructions.md",
+    EQUITY_FUND: "styler_equity_fund_instructions.md",
+    MUTUAL_FUND: "styler_equity_fund_instructions.md",
+    INDEX_FUND: "styler_equity_fund_instructions.md",
+    BOND_ETF: "styler_bond_etf_instructions.md",
+    BOND_FUND: "styler_bond_fund_instructions.md",
+}
+
+
+def _whole_words(*keywords: str) -> re.Pattern[str]:
+    return re.compile(r"\b(?:" + "|".join(re.escape(keyword) for keyword in keywords) + r")\b")
+
+
+# Morningstar categories as reported by yfinance, e.g. "Intermediate Core Bond", "Long Government",
+# "Muni National Interm". Equity categories never use these words.
+_BOND_CATEGORY = _whole_words(
+    "bond", "government", "muni", "inflation-protected", "bank loan", "high yield", "ultrashort", "fixed income"
+)
+# Fund names only when the category is missing: "government" or "corporate" also name money market and equity funds.
+_BOND_NAME = _whole_words("bond", "bonds", "fixed income", "treasury", "treasuries", "municipal", "muni", "tips")
+_INDEX = _whole_words("index", "idx", "s&p 500")
+_MONEY_MARKET = _whole_words("money market")
+# Bumped when the rules change, so classifications remembered by earlier rules are dropped.
+_CLASSIFIER_VERSION = 2
+
+
+def classify_asset_type(quote_type: str | None, category: str | None = None, name: str | None = None) -> str | None:
+    """
+    Supported asset type for the yfinance metadata, or None when it is not one of the supported types.
+    Keywords match whole words, in the fund's category when yfinance has one and in its name otherwise.
+    """
+    quote_type = (quote_type or "").upper()
+    category = (category or "").lower()
+    name = (name or "").lower()
+    if _MONEY_MARKET.search(f"{category} {name}"):
+        return None
+    is_bond = bool(_BOND_CATEGORY.search(category) if category else _BOND_NAME.search(name))
+    is_index = bool(_INDEX.search(f"{category} {name}"))
+
+    if quote_type == "EQUITY":
+        return STOCK
+    if quote_type == "ETF":
+        if is_bond:
+            return BOND_ETF
+        return INDEX_FUND if is_index else EQUITY_FUND
+    if quote_type == "MUTUALFUND":
+        if is_bond:
+            return BOND_FUND
+        return INDEX_FUND if is_index else MUTUAL_FUND
+    return None
+
+
+class AssetTypeRouter(TickerContextProvider):
+    def __init__(
+        self,
+        db_path: Path,
+        tool_cache: ToolCache,
+        registry: InstructionRegistry,
+        ttl: float = 30 * 24 * 60 * 60,
+    ):
+        """
+        Args:
+            db_path: sqlite file of the ticker -> asset type lookup table.
+            tool_cache: Cache shared with the prefetcher, so the yfinance metadata is fetched once per ticker.
+            ttl: Seconds a classification is trusted before yfinance is asked again.
+            registry: Source of the styler templates.
+        """
+        self.tool_cache = tool_cache
+        self.ttl = ttl
+        self.registry = registry
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS asset_types "
+                "(ticker TEXT PRIMARY KEY, asset_type TEXT, quote_type TEXT, checked_at REAL NOT NULL)"
+            )
+            if self._conn.execute("PRAGMA user_version").fetchone()[0] < _CLASSIFIER_VERSION:
+                self._conn.execute("DELETE FROM asset_types")
+                self._conn.execute(f"PRAGMA user_version = {_CLASSIFIER_VERSION}")
+
+    def classify(self, ticker: str) -> tuple[str | None, str | None]:
+        """``(asset type, yfinance quote type)``; the asset type is None for unsupported or unknown securities."""
+        symbol = ticker.strip().upper()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT asset_type, quote_type, checked_at FROM asset_types WHERE ticker = ?", (symbol,)
+            ).fetchone()
+        if row is not None and time.time() - row[2] < self.ttl:
+            return row[0], row[1]
+
+        info = self.tool_cache.call("yfinance_info", fetch_ticker_info, {"symbol": symbol})
+        quote_type = info.get("quoteType")
+        if not quote_type:
+            # Nothing known about the symbol (or yfinance is down): do not remember it, let the team validate.
+            return None, None
+        asset_type = classify_asset_type(
+            quote_type, info.get("category"), info.get("longName") or info.get("shortName")
+        )
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO asset_types (ticker, asset_type, quote_type, checked_at) VALUES (?, ?, ?, ?)",
+                (symbol, asset_type, quote_type, time.time()),
+            )
+        return asset_type, quote_type
+
+    def build_context(self, ticker: str) -> str:
+        asset_type, quote_type = self.classify(ticker)
+        if quote_type is None:
+            return ""
+        if asset_type is None:
+            return (
+                "--- ASSET TYPE ROUTING ---\n"
+                f"Asset type: {quote_type} (unsupported). Do not produce a report, inform the user that this "
+                "asset type is currently unsupported."
+            )
+        template = STYLER_TEMPLATES[asset_type]
+        return (
+            "--- ASSET TYPE ROUTING ---\n"
+            f"Asset type: {asset_type} (validated, skip asset type validation and template loading).\n"
+            f"Styler template {template}, pass it to Slack_Styler as-is:\n" + self.registry.get(template)
+        )
@@ -0,0 +1,170 @@
+"""
+Gemini explicit context caching for the static part of every request.
+
+Agno sends each agent's system instruction and tool declarations with every model call, and they only change
+when the instruction files do; the ticker-specific data travels in the user message. ``CachedGemini`` moves that
+static prefix into a Gemini cached content, keyed by a hash of the model, system instruction and tools. A new
+cache is therefore created automatically when an instruction file changes, caches in use get their TTL extended
+shortly before they expire, and unused ones simply expire.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from agno.models.google import Gemini
+from google.genai import Client
+from google.genai.types import CreateCachedContentConfig, UpdateCachedContentConfig
+
+from invesetment_agent.infrastructure.adapter.agno_financial_team.instruction_registry import estimate_tokens
+
+
+@dataclass
+class _CacheHandle:
+    name: str
+    expires_at: float
+
+
+class GeminiContextCache:
+    def __init__(self, ttl: float = 60 * 60, refresh_margin: float = 5 * 60, min_tokens: int = 1024):
+        """
+        Args:
+            ttl: Lifetime of a cached content, extended while it is in use.
+            refresh_margin: Seconds before expiry at which a cache in use gets its TTL extended.
+            min_tokens: Estimated prefix size below which caching is not attempted (Gemini rejects small caches).
+        """
+        self.ttl = ttl
+        self.refresh_margin = refresh_margin
+        self.min_tokens = min_tokens
+        self.created = 0
+        self.reused = 0
+        self._handles: dict[str, _CacheHandle] = {}
+        self._unsupported: set[str] = set()
+        self._prefix_locks: dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def cached_content_for(
+        self, client: Client, model_id: str, system_instruction: Any, tools: Any = None, tool_config: Any = None
+    ) -> str | None:
+        """Name of the cached content holding this prefix, created on first use; None when it cannot be cached."""
+        prefix = json.dumps(
+            [model_id, _dump(system_instruction), _dump(tools), _dump(tool_config)], sort_keys=True, default=str
+        )
+        if estimate_tokens(prefix) < self.min_tokens:
+            return None
+        key = hashlib.sha256(prefix.encode()).hexdigest()
+
+        # The instance lock only guards the dicts. Cache round-trips run under a per-prefix lock, so a slow create
+        # delays the callers of that prefix alone, and only until the first one is done.
+        with self._lock:
+            name = self._usable(key, time.time(), refreshing=True)
+            if name is not None or key in self._unsupported:
+                return name
+            prefix_lock = self._prefix_locks.setdefault(key, threading.Lock())
+
+        with prefix_lock:
+            now = time.time()
+            with self._lock:
+                # Refreshed or created by the caller this one waited for.
+                name = self._usable(key, now, refreshing=False)
+                if name is not None or key in self._unsupported:
+                    return name
+                handle = self._handles.get(key)
+
+            if handle is not None and now < handle.expires_at:
+                try:
+                    client.caches.update(name=handle.name, config=UpdateCachedContentConfig(ttl=f"{int(self.ttl)}s"))
+                    with self._lock:
+                        handle.expires_at = now + self.ttl
+                        self.reused += 1
+                    return handle.name
+                except Exception as e:
+                    print(f"Could not extend Gemini cached content {handle.name}, creating a new one: {e!r}")
+
+            try:
+                cached = client.caches.create(
+                    model=model_id,
+                    config=CreateCachedContentConfig(
+                        display_name=f"super-yaya-{key[:12]}",
+                        system_instruction=system_instruction,
+                        tools=tools,
+                        tool_config=tool_config,
+                        ttl=f"{int(self.ttl)}s",
+                    ),
+                )
+            except Exception as e:
+                # Typically a prefix below the model's minimum cache size; send it uncached from now on.
+                print(f"Gemini context cache unavailable for {model_id}: {e!r}")
+                with self._lock:
+                    self._handles.pop(key, None)
+                    self._unsupported.add(key)
+                return None
+            if not cached.name:
+                return None
+            with self._lock:
+                self._handles[key] = _CacheHandle(name=cached.name, expires_at=now + self.ttl)
+                self.created += 1
+            return cached.name
+
+    def _usable(self, key: str, now: float, refreshing: bool) -> str | None:
+        """
+        Name of the cached content for ``key`` if it can be used without a round-trip: not due for a refresh, or,
+        with ``refreshing``, not expired yet while another caller is extending it. Call with ``_lock`` held.
+        """
+        handle = self._handles.get(key)
+        if handle is None or key in self._unsupported:
+            return None
+        prefix_lock = self._prefix_locks.get(key)
+        in_refresh = refreshing and prefix_lock is not None and prefix_lock.locked() and now < handle.expires_at
+        if now < handle.expires_at - self.refresh_margin or in_refresh:
+            self.reused += 1
+            return handle.name
+        return None
+
+    def delete_all(self, client: Client) -> None:
+        """Delete every cached content created by this process instead of waiting for the TTL."""
+        with self._lock:
+            handles, self._handles = self._handles, {}
+        for handle in handles.values():
+            try:
+                client.caches.delete(name=handle.name)
+            except Exception as e:
+                print(f"Could not delete Gemini cached content {handle.name}: {e!r}")
+
+
+def _dump(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_dump(item) for item in value]
+    model_dump = getattr(value, "model_dump", None)
+    return model_dump(exclude_none=True) if callable(model_dump) else value
+
+
+@dataclass
+class CachedGemini(Gemini):
+    """Gemini model whose system instruction and tools are served from a ``GeminiContextCache`` when possible."""
+
+    context_cache: GeminiContextCache | None = None
+
+    def get_request_params(self, *args: Any, **kwargs: Any) -> dict[str, Any]:
+        request_params = super().get_request_params(*args, **kwargs)
+        config = request_params.get("config")
+        if self.context_cache is None or self.cached_content or config is None or not config.system_instruction:
+            return request_params
+
+        cached_content = self.context_cache.cached_content_for(
+            self.get_client(), self.id, config.system_instruction, config.tools, config.tool_config
+        )
+        if cached_content:
+            # Gemini rejects requests repeating the system instruction, tools or tool config of the cache.
+            request_params["config"] = config.model_copy(
+                update={
+                    "cached_content": cached_content,
+                    "system_instruction": None,
+                    "tools": None,
+                    "tool_config": None,
+                }
+            )
+        return request_params
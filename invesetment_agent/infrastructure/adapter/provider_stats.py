@@ -0,0 +1,139 @@
+import threading
+import time
+from collections import deque
+from enum import Enum
+
+
+class LatencyHistogram:
+    """Rolling window of the latest successful call latencies of one provider, in seconds."""
+
+    def __init__(self, window: int = 100):
+        self._samples: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, q: float) -> float | None:
+        """Nearest-rank percentile for ``q`` in [0, 1], or None when nothing has been recorded yet."""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        rank = min(len(samples) - 1, max(0, round(q * len(samples)) - 1))
+        return samples[rank]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._samples)
+
+
+class CircuitState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Opens after ``failure_threshold`` consecutive failures and rejects calls for ``reset_timeout`` seconds.
+    After that a single probe call is let through (half-open); its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = CircuitState.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            if self._state == CircuitState.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return CircuitState.HALF_OPEN
+            return self._state
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            if self._state == CircuitState.CLOSED:
+                return True
+            if self._state == CircuitState.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    return False
+                self._state = CircuitState.HALF_OPEN
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = CircuitState.CLOSED
+            self._consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """Let the next call probe again after a probe was abandoned without an outcome."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._consecutive_failures += 1
+            if self._state == CircuitState.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                self._state = CircuitState.OPEN
+                self._opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+
+class ProviderHealth:
+    """
+    Circuit breaker, rolling success rate and latency histogram of one provider. Outcomes older than
+    ``window_seconds`` are forgotten, so a provider that failed once gets traffic again later.
+    """
+
+    def __init__(
+        self, window: int = 50, window_seconds: float = 600.0, failure_threshold: int = 3, reset_timeout: float = 60.0
+    ):
+        self.window_seconds = window_seconds
+        self.latencies = LatencyHistogram(window=window)
+        self.breaker = CircuitBreaker(failure_threshold=failure_threshold, reset_timeout=reset_timeout)
+        self._outcomes: deque[tuple[float, bool]] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record_success(self, seconds: float) -> None:
+        self.latencies.record(seconds)
+        self.breaker.record_success()
+        with self._lock:
+            self._outcomes.append((time.monotonic(), True))
+
+    def record_failure(self) -> None:
+        self.breaker.record_failure()
+        with self._lock:
+            self._outcomes.append((time.monotonic(), False))
+
+    @property
+    def success_rate(self) -> float:
+        """Share of successful recent calls; providers without recent history are assumed healthy."""
+        outcomes = self._recent_outcomes()
+        return sum(outcomes) / len(outcomes) if outcomes else 1.0
+
+    def snapshot(self) -> dict[str, float | int | str | None]:
+        return {
+            "state": self.breaker.state.value,
+            "calls": len(self._recent_outcomes()),
+            "success_rate": self.success_rate,
+            "p50_seconds": self.latencies.percentile(0.5),
+            "p95_seconds": self.latencies.percentile(0.95),
+        }
+
+    def _recent_outcomes(self) -> list[bool]:
+        horizon = time.monotonic() - self.window_seconds
+        with self._lock:
+            while self._outcomes and self._outcomes[0][0] < horizon:
+                self._outcomes.popleft()
+            return [ok for _, ok in self._outcomes]
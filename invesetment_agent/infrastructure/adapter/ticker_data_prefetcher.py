@@ -0,0 +1,157 @@
+"""
+Deterministic data fetch that runs before the team, so the leader starts from the facts instead of discovering
+them through sequential tool calls.
+
+Profile and quote, price levels, the insider table and the latest 10-K link are fetched in parallel through the
+tool cache, which also serves any later tool call asking for the same data. SEC data is only fetched for tickers
+SEC lists. Whatever fails or is too slow is left out of the bundle and remains available to the agents through
+their tools.
+"""
+
+import json
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import timedelta
+from typing import Any
+
+import yfinance
+
+from invesetment_agent.application.external_service.sec_tools import (
+    get_cik_index,
+    insider_table,
+    latest_filing_link,
+)
+from invesetment_agent.application.port.ticker_context_provider import TickerContextProvider
+from invesetment_agent.infrastructure.adapter.agno_financial_team.tool_cache import ToolCache
+
+# yfinance ``info`` key -> bundle key, only these are kept to keep the prompt small.
+PROFILE_FIELDS = {
+    "longName": "name",
+    "quoteType": "quote_type",
+    "category": "category",
+    "fundFamily": "fund_family",
+    "currency": "currency",
+    "regularMarketPrice": "price",
+    "navPrice": "nav",
+    "previousClose": "previous_close",
+    "marketCap": "market_cap",
+    "totalAssets": "total_assets",
+    "sector": "sector",
+    "industry": "industry",
+    "trailingPE": "trailing_pe",
+    "forwardPE": "forward_pe",
+    "trailingEps": "eps",
+    "priceToBook": "price_to_book",
+    "revenueGrowth": "revenue_growth",
+    "earningsGrowth": "earnings_growth",
+    "grossMargins": "gross_margins",
+    "profitMargins": "profit_margins",
+    "freeCashflow": "free_cashflow",
+    "totalCash": "total_cash",
+    "totalDebt": "total_debt",
+    "debtToEquity": "debt_to_equity",
+    "dividendYield": "dividend_yield",
+    "yield": "yield",
+    "netExpenseRatio": "expense_ratio",
+    "ytdReturn": "ytd_return",
+    "threeYearAverageReturn": "three_year_return",
+    "fiveYearAverageReturn": "five_year_return",
+    "beta": "beta",
+    "recommendationKey": "analyst_recommendation",
+    "targetMeanPrice": "analyst_target_price",
+    "earningsTimestamp": "next_earnings_timestamp",
+}
+
+PRICE_WINDOWS = {
+    "7d": timedelta(days=7),
+    "30d": timedelta(days=30),
+    "3mo": timedelta(days=91),
+    "1y": timedelta(days=365),
+}
+
+
+def fetch_ticker_info(symbol: str) -> dict[str, Any]:
+    return dict(yfinance.Ticker(symbol).info or {})
+
+
+def fetch_price_levels(symbol: str) -> dict[str, dict[str, float]]:
+    """Current close plus the high and low of the last 7 days, 30 days, 3 months and 1 year."""
+    history = yfinance.Ticker(symbol).history(period="1y", interval="1d")
+    if history.empty:
+        return {}
+    last = history.index[-1]
+    current = round(float(history["Close"].iloc[-1]), 2)
+    levels = {"current": {"high": current, "low": current}}
+    for name, window in PRICE_WINDOWS.items():
+        recent = history[history.index > last - window]
+        levels[name] = {"high": round(float(recent["High"].max()), 2), "low": round(float(recent["Low"].min()), 2)}
+    return levels
+
+
+class TickerDataPrefetcher(TickerContextProvider):
+    def __init__(self, tool_cache: ToolCache, timeout: float = 30.0):
+        """
+        Args:
+            tool_cache: Cache shared with the Finance_Agent tools.
+            timeout: Seconds to wait for the fetches; slower ones are left out of the bundle.
+        """
+        self.tool_cache = tool_cache
+        self.timeout = timeout
+
+    def fetch(self, ticker: str) -> dict[str, Any]:
+        """Every piece of data that could be fetched for ``ticker``, by section name."""
+        symbol = ticker.strip().upper()
+        tasks: dict[str, tuple[str, Callable[..., Any], dict[str, Any]]] = {
+            "profile": ("yfinance_info", fetch_ticker_info, {"symbol": symbol}),
+            "price_levels": ("yfinance_price_levels", fetch_price_levels, {"symbol": symbol}),
+        }
+        if self._has_sec_filings(symbol):
+            # Cached under the tools' names and arguments, so the Finance_Agent asking for them is answered here.
+            tasks["insider_activity"] = ("build_insider_table", insider_table, {"ticker": symbol})
+            tasks["latest_10k"] = ("fetch_latest_filing_link", latest_filing_link, {"ticker": symbol})
+        executor = ThreadPoolExecutor(max_workers=len(tasks), thread_name_prefix="prefetch")
+        try:
+            futures = {
+                executor.submit(self.tool_cache.call, name, function, arguments): section
+                for section, (name, function, arguments) in tasks.items()
+            }
+            done, _ = wait(futures, timeout=self.timeout)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        data: dict[str, Any] = {}
+        for future in done:
+            try:
+                data[futures[future]] = future.result()
+            except Exception as e:
+                print(f"Prefetch of {futures[future]} for {symbol} failed: {e!r}")
+        return data
+
+    @staticmethod
+    def _has_sec_filings(symbol: str) -> bool:
+        """Whether SEC lists the ticker; most funds and ETFs have no CIK of their own, nothing to look up then."""
+        try:
+            return get_cik_index().cik_for(symbol) is not None
+        except Exception as e:
+            print(f"SEC ticker lookup for {symbol} failed, skipping SEC prefetch: {e!r}")
+            return False
+
+    def build_context(self, ticker: str) -> str:
+        data = self.fetch(ticker)
+        bundle: dict[str, Any] = {}
+        profile = {key: data.get("profile", {}).get(field) for field, key in PROFILE_FIELDS.items()}
+        if any(value is not None for value in profile.values()):
+            bundle["profile"] = {key: value for key, value in profile.items() if value is not None}
+        if data.get("price_levels"):
+            bundle["price_levels"] = data["price_levels"]
+        for section in ("insider_activity", "latest_10k"):
+            value = data.get(section)
+            if isinstance(value, str) and value and not value.startswith(("Error", "No recent")):
+                bundle[section] = value
+        if not bundle:
+            return ""
+        return (
+            f"--- PREFETCHED DATA for {ticker.strip().upper()} ---\n"
+            "Use this data as-is. Only call tools or delegate for information that is missing below.\n"
+            + json.dumps(bundle, separators=(",", ":"), default=str)
+        )
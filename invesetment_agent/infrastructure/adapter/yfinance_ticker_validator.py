@@ -0,0 +1,101 @@
+"""
+Ticker validation with a local symbol universe and a persistent result cache.
+
+Symbols are resolved in three steps, cheapest first: previously cached results (positive and negative, each with
+its own TTL), the SEC ticker index for listed equities, and finally one batched yfinance price download for
+whatever is left (funds, ETFs, foreign listings).
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import yfinance
+
+from invesetment_agent.application.external_service.sec_cik_index import CikIndex
+from invesetment_agent.application.port.ticker_validator import TickerValidator
+
+
+class YFinanceTickerValidator(TickerValidator):
+    def __init__(
+        self,
+        db_path: Path,
+        symbol_index: CikIndex | None = None,
+        positive_ttl: float = 7 * 24 * 60 * 60,
+        negative_ttl: float = 24 * 60 * 60,
+    ):
+        self.symbol_index = symbol_index
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS tickers (ticker TEXT PRIMARY KEY, valid INTEGER NOT NULL, checked_at REAL)"
+            )
+
+    def validate(self, tickers: list[str]) -> dict[str, bool]:
+        symbols = {ticker: ticker.strip().upper() for ticker in tickers}
+        known = self._cached(set(symbols.values()))
+        unknown = [symbol for symbol in dict.fromkeys(symbols.values()) if symbol not in known]
+
+        listed = {symbol for symbol in unknown if self._is_listed_equity(symbol)}
+        known.update(dict.fromkeys(listed, True))
+        fetched = self._download([symbol for symbol in unknown if symbol not in listed])
+        known.update(fetched)
+        self._store({**dict.fromkeys(listed, True), **fetched})
+
+        return {ticker: known.get(symbol, False) for ticker, symbol in symbols.items()}
+
+    def _is_listed_equity(self, symbol: str) -> bool:
+        if self.symbol_index is None:
+            return False
+        try:
+            return symbol in self.symbol_index
+        except Exception:
+            return False
+
+    @staticmethod
+    def _download(symbols: list[str]) -> dict[str, bool]:
+        """One batched price history request; a symbol is valid if Yahoo returned any close price for it."""
+        if not symbols:
+            return {}
+        try:
+            prices = yfinance.download(
+                symbols, period="5d", group_by="ticker", progress=False, threads=True, auto_adjust=False
+            )
+        except Exception:
+            # Network failure: report the symbols as invalid for now, without caching the answer.
+            return {}
+        results: dict[str, bool] = {}
+        for symbol in symbols:
+            try:
+                results[symbol] = bool(prices[symbol]["Close"].notna().any())
+            except (KeyError, TypeError):
+                results[symbol] = False
+        return results
+
+    def _cached(self, symbols: set[str]) -> dict[str, bool]:
+        if not symbols:
+            return {}
+        now = time.time()
+        placeholders = ", ".join("?" * len(symbols))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT ticker, valid, checked_at FROM tickers WHERE ticker IN ({placeholders})", tuple(symbols)
+            ).fetchall()
+        return {
+            ticker: bool(valid)
+            for ticker, valid, checked_at in rows
+            if now - checked_at < (self.positive_ttl if valid else self.negative_ttl)
+        }
+
+    def _store(self, results: dict[str, bool]) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO tickers (ticker, valid, checked_at) VALUES (?, ?, ?)",
+                [(ticker, valid, now) for ticker, valid in results.items()],
+            )
@@ -0,0 +1,156 @@
+"""
+Ticker report cache shared by every process using the same sqlite file (CLI cron, Slack bot, Streamlit).
+
+Reports are keyed by ticker, US market date and a namespace (the hash of the instruction files), so a new
+trading day or an instruction change produces a new report. Concurrent requests for the same key are
+de-duplicated in-process with a shared flight, and across processes with a lease row in the ``inflight`` table.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from datetime import datetime
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+from invesetment_agent.application.port.report_cache import ReportCache
+
+MARKET_TIMEZONE = ZoneInfo("America/New_York")
+
+
+class _Flight:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.report = ""
+        self.error: BaseException | None = None
+
+
+class SqliteReportCache(ReportCache):
+    def __init__(
+        self,
+        db_path: Path,
+        namespace: str,
+        ttl: float = 6 * 60 * 60,
+        max_entries: int = 500,
+        lease_seconds: float = 15 * 60,
+        poll_interval: float = 2.0,
+    ):
+        """
+        Args:
+            db_path: sqlite file, shared across processes.
+            namespace: Part of every key, e.g. the instruction files hash.
+            ttl: Seconds a report stays valid within its market date.
+            max_entries: Least recently used reports beyond this count are evicted.
+            lease_seconds: How long another process waits on an in-flight run before taking over.
+            poll_interval: Seconds between checks for a report produced by another process.
+        """
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.hits = 0
+        self.misses = 0
+        self._owner = f"{os.getpid()}:{id(self)}"
+        self._flights: dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS reports "
+                "(key TEXT PRIMARY KEY, report TEXT NOT NULL, created_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS inflight "
+                "(key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    def key(self, ticker: str) -> str:
+        market_date = datetime.now(MARKET_TIMEZONE).date().isoformat()
+        return f"{ticker.upper()}|{market_date}|{self.namespace}"
+
+    def get_or_compute(self, ticker: str, compute: Callable[[], str]) -> str:
+        key = self.key(ticker)
+        report = self._get(key)
+        with self._lock:
+            if report is not None:
+                self.hits += 1
+                return report
+            flight = self._flights.get(key)
+            leader = flight is None
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.report
+
+        try:
+            flight.report = self._compute_once_across_processes(key, compute)
+            return flight.report
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def _compute_once_across_processes(self, key: str, compute: Callable[[], str]) -> str:
+        while not self._acquire_lease(key):
+            time.sleep(self.poll_interval)
+            report = self._get(key)
+            if report is not None:
+                return report
+        try:
+            report = self._get(key)
+            if report is None:
+                report = compute()
+                if report:
+                    self._put(key, report)
+            return report
+        finally:
+            with self._lock, self._conn:
+                self._conn.execute("DELETE FROM inflight WHERE key = ? AND owner = ?", (key, self._owner))
+
+    def _acquire_lease(self, key: str) -> bool:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM inflight WHERE key = ? AND expires_at < ?", (key, now))
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO inflight (key, owner, expires_at) VALUES (?, ?, ?)",
+                (key, self._owner, now + self.lease_seconds),
+            )
+            return cursor.rowcount == 1
+
+    def _get(self, key: str) -> str | None:
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT report, created_at FROM reports WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if now - row[1] >= self.ttl:
+                self._conn.execute("DELETE FROM reports WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE reports SET last_access = ? WHERE key = ?", (now, key))
+        return str(row[0])
+
+    def _put(self, key: str, report: str) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO reports (key, report, created_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, report, now, now),
+            )
+            self._conn.execute(
+                "DELETE FROM reports WHERE key NOT IN (SELECT key FROM reports ORDER BY last_access DESC LIMIT ?)",
+                (self.max_entries,),
+            )
@@ -1,18 +1,27 @@
+import hashlib
 import os
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from zoneinfo import ZoneInfo
 
 from dotenv import load_dotenv
 from slack_sdk import WebClient
-from slack_sdk.errors import SlackApiError
+from slack_sdk.http_retry.builtin_handlers import RateLimitErrorRetryHandler
 
 from invesetment_agent.application.dtos.commons import Result
 from invesetment_agent.application.dtos.stock_summarization_dtos import (
     MultiTickerSummarizationRequest,
     SingleTickerSummarizationRequest,
 )
+from invesetment_agent.application.external_service.sec_tools import get_edgar_cache, get_sec_client
+from invesetment_agent.application.external_service.storage import default_cache_dir
+from invesetment_agent.infrastructure.adapter.agno_financial_team.tool_cache import get_tool_cache
+from invesetment_agent.infrastructure.cli.portfolios import Portfolio, distinct_tickers, load_portfolios
 from invesetment_agent.infrastructure.config.container import Application, create_application
+from invesetment_agent.infrastructure.slack.directory import SlackDirectory
+from invesetment_agent.infrastructure.slack.publisher import SlackPublisher
+from invesetment_agent.infrastructure.slack.streaming import StreamingSlackMessage
 
 # Load environment variables - try project root first, then current directory
 current_file_dir = Path(__file__).resolve().parent
@@ -24,39 +33,57 @@ else:
 SLACK_BOT_TOKEN = os.getenv("SLACK_BOT_TOKEN")
 SLACK_CHANNEL = os.getenv("SLACK_CHANNEL")
 SLACK_USER_EMAIL_MENTION = os.getenv("SLACK_USER_EMAIL_MENTION")
+SLACK_STREAM_UPDATE_SECONDS = float(os.getenv("SLACK_STREAM_UPDATE_SECONDS", "3"))
+SLACK_DIRECTORY_TTL_SECONDS = float(os.getenv("SLACK_DIRECTORY_TTL_SECONDS", "86400"))
+SLACK_CHANNEL_MESSAGES_PER_SECOND = float(os.getenv("SLACK_CHANNEL_MESSAGES_PER_SECOND", "1"))
+PORTFOLIOS_CONFIG = os.getenv("PORTFOLIOS_CONFIG")
+DEFAULT_TICKERS = ["VTSAX", "VBTLX", "FNMA", "TSLA", "AMZN"]
 
 
+@lru_cache(maxsize=1)
 def get_slack_client() -> WebClient:
-    """Get a Slack WebClient instance."""
+    """Process-wide Slack WebClient, retrying calls that hit a rate limit after their Retry-After delay."""
     if not SLACK_BOT_TOKEN:
         raise ValueError("SLACK_BOT_TOKEN not set in environment")
-    return WebClient(token=SLACK_BOT_TOKEN)
+    return WebClient(token=SLACK_BOT_TOKEN, retry_handlers=[RateLimitErrorRetryHandler(max_retry_count=3)])
 
 
-def resolve_channel_id(channel: str, slack_client: WebClient) -> str:
+@lru_cache(maxsize=1)
+def get_slack_directory() -> SlackDirectory:
+    """Channel and user index of the workspace, cached on disk per bot token."""
+    workspace = hashlib.sha256((SLACK_BOT_TOKEN or "").encode()).hexdigest()[:12]
+    return SlackDirectory(
+        client=get_slack_client(),
+        cache_path=default_cache_dir() / f"slack_directory_{workspace}.json",
+        ttl=SLACK_DIRECTORY_TTL_SECONDS,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_slack_publisher() -> SlackPublisher:
+    """Process-wide sender for every message of the digest, pacing posts per channel."""
+    if not SLACK_BOT_TOKEN:
+        raise ValueError("SLACK_BOT_TOKEN not set in environment")
+    # A client of its own, without the rate limit retry handler: the publisher backs off and retries itself.
+    return SlackPublisher(WebClient(token=SLACK_BOT_TOKEN), rate_per_channel=SLACK_CHANNEL_MESSAGES_PER_SECOND)
+
+
+def resolve_channel_id(channel: str) -> str:
     """Convert channel name to ID if needed."""
-    if channel.startswith("#"):
-        try:
-            response = slack_client.conversations_list()
-            for ch in response["channels"]:
-                if ch["name"] == channel[1:]:
-                    return str(ch["id"])
-        except SlackApiError:
-            pass
-    return channel
+    return get_slack_directory().channel_id(channel)
 
 
 class SlackUserConverter:
     """Converts email addresses to Slack user IDs."""
 
-    def __init__(self, slack_client: WebClient | None = None):
+    def __init__(self, directory: SlackDirectory | None = None):
         """
-        Initialize the converter with a Slack client.
+        Initialize the converter with a Slack directory.
 
         Args:
-            slack_client: Optional Slack WebClient. If not provided, will create one.
+            directory: Optional Slack directory. If not provided, the shared one is used.
         """
-        self._slack_client = slack_client or get_slack_client()
+        self._directory = directory or get_slack_directory()
 
     def convert(self, email: str) -> str | None:
         """
@@ -68,45 +95,32 @@ class SlackUserConverter:
         Returns:
             The Slack user ID if found, None otherwise.
         """
-        try:
-            response = self._slack_client.users_lookupByEmail(email=email)
-            if response["ok"] and "user" in response:
-                return str(response["user"]["id"])
-        except SlackApiError as e:
-            # User not found or other API error
-            if e.response.get("error") != "users_not_found":
-                # Log other errors if needed, but return None for any error
-                pass
-        return None
+        return self._directory.user_id(email)
 
 
 def post_to_slack(channel: str, text: str, thread_ts: str | None = None) -> str:
     """Post a message to a Slack channel. Returns the message timestamp."""
-    slack_client: WebClient = get_slack_client()
-    channel_id: str = resolve_channel_id(channel, slack_client)
+    message = get_slack_publisher().post(resolve_channel_id(channel), text, thread_ts=thread_ts)
+    return message.result().ts
 
-    response = slack_client.chat_postMessage(
-        channel=channel_id,
-        text=text,
-        thread_ts=thread_ts,
-    )
-    return str(response["ts"])
-
-
-def main() -> None:
-    app: Application = create_application()
-    stock_summarization_use_case = app.stock_summarization_use_case
 
-    # Define stocks to analyze
-    stocks = [
-        SingleTickerSummarizationRequest("VTSAX"),
-        # sAdd more stocks here as needed
-        SingleTickerSummarizationRequest("VBTLX"),
-        SingleTickerSummarizationRequest("FNMA"),
-        SingleTickerSummarizationRequest("TSLA"),
-        SingleTickerSummarizationRequest("AMZN"),
+def configured_portfolios() -> list[Portfolio]:
+    """Portfolios of PORTFOLIOS_CONFIG, or the default tickers posted to SLACK_CHANNEL when it is not set."""
+    if PORTFOLIOS_CONFIG:
+        return load_portfolios(Path(PORTFOLIOS_CONFIG))
+    if not SLACK_CHANNEL:
+        raise ValueError("SLACK_CHANNEL not set in environment")
+    return [
+        Portfolio(
+            name="default",
+            channel=SLACK_CHANNEL,
+            tickers=DEFAULT_TICKERS,
+            mention_emails=(SLACK_USER_EMAIL_MENTION or "").split(),
+        )
     ]
 
+
+def initial_message(portfolio: Portfolio) -> str:
     # Get current datetime in PST timezone
     pst_time = datetime.now(ZoneInfo("America/Los_Angeles"))
     # Format datetime in a more readable, Slack-friendly way
@@ -114,33 +128,77 @@ def main() -> None:
     time_str = pst_time.strftime("%I:%M %p %Z")  # e.g., "10:30 AM PST"
 
     # Create stock symbols string
-    stock_symbols = " ".join([stock.ticker.upper() for stock in stocks])
+    stock_symbols = " ".join(portfolio.tickers)
 
     # Create catchy, Slack-friendly initial message
-    initial_message: str = f"📊 *Daily Stock Analysis* | {date_str} at {time_str}\nAnalyzing: {stock_symbols}\n"
-    if SLACK_USER_EMAIL_MENTION:
-        emails = SLACK_USER_EMAIL_MENTION.split()
-        user_ids = [SlackUserConverter().convert(email) for email in emails]
+    title = "Daily Stock Analysis" if portfolio.name == "default" else f"Daily Stock Analysis: {portfolio.name}"
+    message = f"📊 *{title}* | {date_str} at {time_str}\nAnalyzing: {stock_symbols}\n"
+    if portfolio.mention_emails:
+        converter = SlackUserConverter()
+        user_ids = [converter.convert(email) for email in portfolio.mention_emails]
         user_tags = [f"<@{user_id}>" for user_id in user_ids if user_id]
         user_tag = " ".join(user_tags)
-        initial_message += f"Hey {user_tag}! 👋 Generating insights within thread..."
+        message += f"Hey {user_tag}! 👋 Generating insights within thread..."
+    return message
 
-    if not SLACK_CHANNEL:
-        raise ValueError("SLACK_CHANNEL not set in environment")
-    thread_ts = post_to_slack(SLACK_CHANNEL, initial_message)
-
-    # Execute stock summarization and post results as thread replies
-    for stock in stocks:
-        result: Result = stock_summarization_use_case.execute(MultiTickerSummarizationRequest([stock]))
-        if result.is_success:
-            # Post the summary as a thread reply
-            post_to_slack(SLACK_CHANNEL, result.value, thread_ts=thread_ts)
-        else:
-            error = result.error
-            error_message = f"❌ *Error processing stocks*\n*Code:* {error.code.value}\n*Message:* {error.message}"
-            if error.details:
-                error_message += f"\n*Details:* {error.details}"
-            post_to_slack(SLACK_CHANNEL, error_message, thread_ts=thread_ts)
+
+def format_result(ticker: str, result: Result) -> str:
+    if result.is_success:
+        return str(result.value)
+    error = result.error
+    error_message = f"❌ *Error processing {ticker}*\n*Code:* {error.code.value}\n*Message:* {error.message}"
+    if error.details:
+        error_message += f"\n*Details:* {error.details}"
+    return error_message
+
+
+def main() -> None:
+    app: Application = create_application()
+    stock_summarization_use_case = app.stock_summarization_use_case
+    portfolios = configured_portfolios()
+
+    # Open one thread per portfolio; every ticker gets a streamed reply in each thread subscribing to it
+    subscribers: dict[str, list[StreamingSlackMessage]] = {}
+    for portfolio in portfolios:
+        thread_ts = post_to_slack(portfolio.channel, initial_message(portfolio))
+        channel_id = resolve_channel_id(portfolio.channel)
+        for ticker in portfolio.tickers:
+            subscribers.setdefault(ticker, []).append(
+                StreamingSlackMessage(
+                    get_slack_publisher(), channel_id, thread_ts=thread_ts, interval=SLACK_STREAM_UPDATE_SECONDS
+                )
+            )
+
+    def fan_out(ticker: str, chunk: str) -> None:
+        for message in subscribers[ticker]:
+            message.append(chunk)
+
+    # Each distinct ticker is analyzed once, up to TICKER_MAX_CONCURRENCY at a time across all portfolios
+    tickers = distinct_tickers(portfolios)
+    print(
+        f"{len(portfolios)} portfolios subscribe to {sum(len(portfolio.tickers) for portfolio in portfolios)} "
+        f"tickers, {len(tickers)} distinct"
+    )
+    responses = stock_summarization_use_case.execute_per_ticker(
+        MultiTickerSummarizationRequest([SingleTickerSummarizationRequest(ticker) for ticker in tickers]),
+        on_chunk=fan_out,
+    )
+    for response in responses:
+        text = format_result(response.ticker, response.result)
+        for message in subscribers[response.ticker]:
+            message.finish(text)
+
+    publisher = get_slack_publisher()
+    if not publisher.flush(timeout=300):
+        print(f"Slack messages still pending after 300s: {publisher.metrics.pending}")
+
+    print(f"SEC cache: {get_edgar_cache().stats}")
+    print(f"SEC requests: {get_sec_client().metrics()}")
+    print(f"AI providers: {app.agent_service.provider_health()}")
+    print(f"Slack directory API calls: {get_slack_directory().api_calls}")
+    print(f"Slack publisher: {publisher.metrics} throughput {publisher.metrics.throughput:.2f} msg/s")
+    tool_stats = get_tool_cache().stats
+    print(f"Tool cache: {tool_stats} hit rate {tool_stats.hit_rate:.0%}")
 
 
 if __name__ == "__main__":
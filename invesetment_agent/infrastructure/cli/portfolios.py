@@ -0,0 +1,45 @@
+"""
+Portfolios of the daily digest.
+
+A portfolio is a list of tickers posted to one Slack channel, mentioning its own people. Several portfolios are
+read from a JSON file shaped like ``portfolios.example.json``; tickers shared by portfolios are analyzed once.
+"""
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+
+
+@dataclass(frozen=True)
+class Portfolio:
+    name: str
+    channel: str
+    tickers: list[str]
+    mention_emails: list[str] = field(default_factory=list)
+
+
+def load_portfolios(path: Path) -> list[Portfolio]:
+    """Read the portfolios of a config file. Raises ValueError when a portfolio has no channel or tickers."""
+    data = json.loads(path.read_text())
+    portfolios: list[Portfolio] = []
+    for index, entry in enumerate(data.get("portfolios", [])):
+        name = str(entry.get("name") or f"portfolio {index + 1}")
+        tickers = [str(ticker).strip().upper() for ticker in entry.get("tickers", []) if str(ticker).strip()]
+        if not entry.get("channel") or not tickers:
+            raise ValueError(f"{path}: portfolio '{name}' needs a channel and at least one ticker")
+        portfolios.append(
+            Portfolio(
+                name=name,
+                channel=str(entry["channel"]),
+                tickers=list(dict.fromkeys(tickers)),
+                mention_emails=[str(email) for email in entry.get("mention_emails", [])],
+            )
+        )
+    if not portfolios:
+        raise ValueError(f"{path}: no portfolios configured")
+    return portfolios
+
+
+def distinct_tickers(portfolios: list[Portfolio]) -> list[str]:
+    """Every ticker of the portfolios once, in order of first appearance."""
+    return list(dict.fromkeys(ticker for portfolio in portfolios for ticker in portfolio.tickers))
@@ -1,13 +1,21 @@
 from __future__ import annotations
 
 import os
+import threading
 from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
 
-from agno.models.google import Gemini
 from agno.models.groq import Groq
 from dotenv import load_dotenv
 
+from invesetment_agent.application.external_service.sec_tools import get_cik_index
+from invesetment_agent.application.external_service.storage import default_cache_dir
+from invesetment_agent.application.external_service.tracing import configure_tracing
 from invesetment_agent.application.port.ai_agent_service import AgentService
+from invesetment_agent.application.port.report_cache import ReportCache
+from invesetment_agent.application.port.ticker_context_provider import TickerContextProvider
+from invesetment_agent.application.port.ticker_validator import TickerValidator
 from invesetment_agent.application.usecases.ticker_summarization_usecase import EquitySummarizationUseCase
 from invesetment_agent.infrastructure.adapter.agno_agent import FallbackAgnoAgentService
 from invesetment_agent.infrastructure.adapter.agno_financial_team import (
@@ -16,17 +24,104 @@ from invesetment_agent.infrastructure.adapter.agno_financial_team import (
     AgnoNewsSentimentAgent,
     AgnoStylerAgent,
 )
+from invesetment_agent.infrastructure.adapter.agno_financial_team.instruction_registry import get_instruction_registry
+from invesetment_agent.infrastructure.adapter.agno_financial_team.tool_cache import get_tool_cache
+from invesetment_agent.infrastructure.adapter.asset_type_router import AssetTypeRouter
+from invesetment_agent.infrastructure.adapter.gemini_context_cache import CachedGemini, GeminiContextCache
+from invesetment_agent.infrastructure.adapter.ticker_data_prefetcher import TickerDataPrefetcher
+from invesetment_agent.infrastructure.adapter.yfinance_ticker_validator import YFinanceTickerValidator
+from invesetment_agent.infrastructure.cache.sqlite_report_cache import SqliteReportCache
 
 load_dotenv(verbose=True)
 
 
+_application: Application | None = None
+_application_fingerprint: str | None = None
+_application_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def get_gemini_context_cache() -> GeminiContextCache:
+    """Process-wide Gemini cache handles, kept across application reloads."""
+    return GeminiContextCache(
+        ttl=float(os.environ.get("GEMINI_CONTEXT_CACHE_TTL_SECONDS", "3600")),
+        min_tokens=int(os.environ.get("GEMINI_CONTEXT_CACHE_MIN_TOKENS", "1024")),
+    )
+
+
+@lru_cache(maxsize=1)
+def setup_tracing() -> bool:
+    """Export spans as configured by TRACING_EXPORTER (``console`` or ``file``), once per process."""
+    exporter = os.environ.get("TRACING_EXPORTER", "").lower()
+    if not exporter:
+        return False
+    path = Path(os.environ.get("TRACING_FILE", str(default_cache_dir() / "traces.jsonl")))
+    return configure_tracing(exporter, path)
+
+
 def create_application() -> Application:
+    setup_tracing()
     return Application()
 
 
+def get_application() -> Application:
+    """
+    Process-wide Application, built on first use. Long-running front ends (Slack bot, dashboard)
+    use this instead of ``create_application`` so models, agents and the team are built once.
+    """
+    global _application, _application_fingerprint
+    if _application is None:
+        with _application_lock:
+            if _application is None:
+                _application_fingerprint = get_instruction_registry().fingerprint
+                _application = create_application()
+    return _application
+
+
+def reload_application(force: bool = False) -> bool:
+    """
+    Rebuild the process-wide Application if the instruction files changed since it was built (or if ``force``).
+    Runs already in progress keep the previous instance. Returns True if a new Application was built.
+    """
+    global _application, _application_fingerprint
+    registry = get_instruction_registry()
+    registry.reload()
+    fingerprint = registry.fingerprint
+    with _application_lock:
+        if _application is not None and not force and fingerprint == _application_fingerprint:
+            return False
+        _application = create_application()
+        _application_fingerprint = fingerprint
+        return True
+
+
+def warm_up_application() -> Application:
+    """Build the Application and load the SEC ticker index ahead of the first request."""
+    application = get_application()
+    try:
+        get_cik_index().cik_for("AAPL")
+    except Exception as e:
+        print(f"SEC ticker index warm-up failed: {e!r}")
+    print(f"Instruction token estimates: {get_instruction_registry().token_estimates()}")
+    return application
+
+
+def watch_instructions(interval: float = 30.0) -> threading.Thread:
+    """Start a daemon thread that hot-reloads the Application when an instruction file changes."""
+
+    def on_change() -> None:
+        try:
+            if reload_application():
+                print("Instruction files changed, application reloaded.")
+        except Exception as e:
+            print(f"Application reload failed, keeping the previous one: {e!r}")
+
+    return get_instruction_registry().watch(interval=interval, on_change=on_change)
+
+
 @dataclass
 class Application:
-    def create_fallback_agent_service(self) -> AgentService:
+    def create_fallback_agent_service(self) -> FallbackAgnoAgentService:
         # hf_service = self.create_hf_agent_service()
         google_service = self.create_google_agent_service()
         # groq = self.create_grok_agent_service()
@@ -39,7 +134,12 @@ class Application:
                 # groq,
                 # deepseek,
                 # openrouter,
-            ]
+            ],
+            hedge=os.environ.get("AGENT_HEDGE", "false").lower() == "true",
+            hedge_delay=float(os.environ.get("AGENT_HEDGE_DELAY_SECONDS", "30")),
+            hedge_percentile=float(os.environ.get("AGENT_HEDGE_PERCENTILE", "0.95")),
+            failure_threshold=int(os.environ.get("AGENT_CIRCUIT_FAILURE_THRESHOLD", "3")),
+            reset_timeout=float(os.environ.get("AGENT_CIRCUIT_RESET_SECONDS", "60")),
         )
 
     @staticmethod
@@ -79,16 +179,23 @@ class Application:
         # - gemini-pro-latest for the Team Leader (Orchestrator) - High reasoning
         # - gemini-2.0-flash for all sub-agents - High speed, low cost, excellent performance
 
-        leader_model = Gemini(
+        # Static system instructions and tools are served from Gemini context caches when enabled.
+        context_cache = None
+        if os.environ.get("GEMINI_CONTEXT_CACHE", "false").lower() == "true":
+            context_cache = get_gemini_context_cache()
+
+        leader_model = CachedGemini(
             id="gemini-pro-latest",
             #id="gemini-3-flash-preview",
             api_key=google_api_key,
+            context_cache=context_cache,
         )
 
-        sub_agent_model = Gemini(
+        sub_agent_model = CachedGemini(
             id="gemini-2.0-flash",
             #id="gemini-3-flash-preview",
             api_key=google_api_key,
+            context_cache=context_cache,
         )
 
         team: AgentService = AgnoFinancialTeam(
@@ -101,6 +208,52 @@ class Application:
         )
         return team
 
+    @staticmethod
+    def create_report_cache() -> ReportCache | None:
+        ttl = float(os.environ.get("REPORT_CACHE_TTL_SECONDS", str(6 * 60 * 60)))
+        if ttl <= 0:
+            return None
+        return SqliteReportCache(
+            db_path=default_cache_dir() / "reports.sqlite3",
+            namespace=get_instruction_registry().fingerprint,
+            ttl=ttl,
+        )
+
+    @staticmethod
+    def create_context_providers() -> list[TickerContextProvider]:
+        providers: list[TickerContextProvider] = []
+        if os.environ.get("ASSET_TYPE_ROUTING", "true").lower() == "true":
+            providers.append(
+                AssetTypeRouter(
+                    db_path=default_cache_dir() / "asset_types.sqlite3",
+                    tool_cache=get_tool_cache(),
+                    registry=get_instruction_registry(),
+                )
+            )
+        if os.environ.get("TICKER_PREFETCH", "true").lower() == "true":
+            providers.append(
+                TickerDataPrefetcher(
+                    tool_cache=get_tool_cache(),
+                    timeout=float(os.environ.get("TICKER_PREFETCH_TIMEOUT_SECONDS", "30")),
+                )
+            )
+        return providers
+
+    @staticmethod
+    def create_ticker_validator() -> TickerValidator:
+        return YFinanceTickerValidator(
+            db_path=default_cache_dir() / "ticker_validation.sqlite3",
+            symbol_index=get_cik_index(),
+        )
+
     def __post_init__(self) -> None:
-        agent_service: AgentService = self.create_fallback_agent_service()
-        self.stock_summarization_use_case: EquitySummarizationUseCase = EquitySummarizationUseCase(agent_service)
+        self.agent_service: FallbackAgnoAgentService = self.create_fallback_agent_service()
+        ticker_timeout = os.environ.get("TICKER_TIMEOUT_SECONDS")
+        self.stock_summarization_use_case: EquitySummarizationUseCase = EquitySummarizationUseCase(
+            self.agent_service,
+            max_concurrency=int(os.environ.get("TICKER_MAX_CONCURRENCY", "5")),
+            ticker_timeout=float(ticker_timeout) if ticker_timeout else None,
+            report_cache=self.create_report_cache(),
+            context_providers=self.create_context_providers(),
+        )
+        self.ticker_validator: TickerValidator = self.create_ticker_validator()
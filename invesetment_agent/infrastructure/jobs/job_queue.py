@@ -0,0 +1,160 @@
+"""
+Bounded background job queue with a worker pool.
+
+Front ends submit a job and return immediately; workers run the registered handler for the job's kind.
+With a ``SqliteJobStore`` jobs survive a restart: they are recorded on submit, deleted once handled, and
+pending ones are queued again when the queue starts.
+"""
+
+import json
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+
+@dataclass(frozen=True)
+class Job:
+    kind: str
+    payload: dict[str, Any]
+    job_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    enqueued_at: float = field(default_factory=time.time)
+
+
+@dataclass
+class QueueMetrics:
+    depth: int = 0
+    running: int = 0
+    completed: int = 0
+    failed: int = 0
+    rejected: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+
+    @property
+    def average_wait_seconds(self) -> float:
+        handled = self.completed + self.failed
+        return self.total_wait_seconds / handled if handled else 0.0
+
+
+class SqliteJobStore:
+    def __init__(self, db_path: Path):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs "
+                "(job_id TEXT PRIMARY KEY, kind TEXT NOT NULL, payload TEXT NOT NULL, enqueued_at REAL NOT NULL)"
+            )
+
+    def add(self, job: Job) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO jobs (job_id, kind, payload, enqueued_at) VALUES (?, ?, ?, ?)",
+                (job.job_id, job.kind, json.dumps(job.payload), job.enqueued_at),
+            )
+
+    def remove(self, job: Job) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM jobs WHERE job_id = ?", (job.job_id,))
+
+    def pending(self) -> list[Job]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT job_id, kind, payload, enqueued_at FROM jobs ORDER BY enqueued_at"
+            ).fetchall()
+        return [
+            Job(kind=kind, payload=json.loads(payload), job_id=job_id, enqueued_at=at)
+            for job_id, kind, payload, at in rows
+        ]
+
+
+class JobQueue:
+    def __init__(
+        self,
+        handlers: dict[str, Callable[[dict[str, Any]], None]],
+        workers: int = 4,
+        max_size: int = 100,
+        store: SqliteJobStore | None = None,
+    ):
+        self.handlers = handlers
+        self.workers = workers
+        self.store = store
+        self._queue: queue.Queue[Job | None] = queue.Queue(maxsize=max_size)
+        self._metrics = QueueMetrics()
+        self._metrics_lock = threading.Lock()
+        self._threads: list[threading.Thread] = []
+
+    def start(self) -> None:
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        if self.store is not None:
+            for job in self.store.pending():
+                self._queue.put(job)
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Let workers finish the jobs already queued, then stop them."""
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads.clear()
+
+    def submit(self, kind: str, payload: dict[str, Any]) -> Job:
+        if kind not in self.handlers:
+            raise ValueError(f"No handler registered for job kind: {kind}")
+        job = Job(kind=kind, payload=payload)
+        # Recorded before it is queued: a worker may finish the job, and delete its row, before put returns.
+        if self.store is not None:
+            self.store.add(job)
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full as e:
+            if self.store is not None:
+                self.store.remove(job)
+            with self._metrics_lock:
+                self._metrics.rejected += 1
+            raise QueueFullError(f"Job queue is full ({self._queue.maxsize} jobs)") from e
+        return job
+
+    def metrics(self) -> QueueMetrics:
+        with self._metrics_lock:
+            return QueueMetrics(**{**vars(self._metrics), "depth": self._queue.qsize()})
+
+    def _work(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            wait_seconds = time.time() - job.enqueued_at
+            with self._metrics_lock:
+                self._metrics.running += 1
+                self._metrics.total_wait_seconds += wait_seconds
+                self._metrics.max_wait_seconds = max(self._metrics.max_wait_seconds, wait_seconds)
+            failed = False
+            try:
+                self.handlers[job.kind](job.payload)
+            except Exception as e:
+                failed = True
+                print(f"Job {job.kind}:{job.job_id} failed: {e!r}")
+            finally:
+                if self.store is not None:
+                    self.store.remove(job)
+                with self._metrics_lock:
+                    self._metrics.running -= 1
+                    if failed:
+                        self._metrics.failed += 1
+                    else:
+                        self._metrics.completed += 1
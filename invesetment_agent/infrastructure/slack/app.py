@@ -13,7 +13,15 @@ from invesetment_agent.application.dtos.stock_summarization_dtos import (
     MultiTickerSummarizationRequest,
     SingleTickerSummarizationRequest,
 )
-from invesetment_agent.infrastructure.config.container import Application, create_application
+from invesetment_agent.infrastructure.config.container import (
+    Application,
+    get_application,
+    warm_up_application,
+    watch_instructions,
+)
+from invesetment_agent.infrastructure.jobs.job_queue import JobQueue, QueueFullError, SqliteJobStore
+from invesetment_agent.infrastructure.slack.publisher import SlackPublisher
+from invesetment_agent.infrastructure.slack.streaming import StreamingSlackMessage
 
 env_path: Path = Path(__file__).parent / ".env"
 load_dotenv(dotenv_path=env_path)
@@ -36,53 +44,113 @@ if missing_vars:
 print("Environment variables loaded successfully.")
 
 app = App(token=SLACK_BOT_TOKEN)
+# Every reply goes through the publisher so that bursts of reports are paced per channel instead of hitting 429s.
+publisher = SlackPublisher(app.client, rate_per_channel=float(os.getenv("SLACK_CHANNEL_MESSAGES_PER_SECOND", "1")))
 
 
 @app.event("app_mention")
-def handle_mention(event: dict[str, Any], say: Any) -> None:
+def handle_mention(event: dict[str, Any]) -> None:
     """Respond when bot is mentioned"""
     user = event["user"]
     text = event["text"]
 
     # Simple response
-    say(f"Hi <@{user}>! You said: {text}")
+    publisher.post(event["channel"], f"Hi <@{user}>! You said: {text}")
 
 
 @app.message("yaya_stock_daily_digest")
-def handle_stock_daily_digest(message: dict[str, Any], say: Any) -> None:
-    """Respond to 'hello' messages"""
+def handle_stock_daily_digest(message: dict[str, Any]) -> None:
+    """Queue a digest for the symbols in the message; results are posted to the thread by the job workers."""
     thread_ts = message["ts"]
-    say("Wait for one sec!", thread_ts=thread_ts)
-
     text: str = message.get("text", "")
-    symbols = set(text.split("\n")[0].split()[1:])
-
-    invalid_stocks: list[SingleTickerSummarizationRequest] = []
-    valid_stocks: list[SingleTickerSummarizationRequest] = []
-    for symbol in symbols:
-        stock_request = SingleTickerSummarizationRequest(symbol)
-        if stock_request.is_valid():
-            valid_stocks.append(stock_request)
-        else:
-            invalid_stocks.append(stock_request)
+    symbols = sorted(set(text.split("\n")[0].split()[1:]))
+
+    # Acknowledged before the job is queued, a worker could otherwise reply first.
+    publisher.post(message["channel"], "Wait for one sec!", thread_ts=thread_ts)
+    try:
+        job_queue.submit(STOCK_DIGEST_JOB, {"channel": message["channel"], "thread_ts": thread_ts, "symbols": symbols})
+    except QueueFullError:
+        publisher.post(
+            message["channel"],
+            "🚧 Too many digests in progress, please try again in a few minutes.",
+            thread_ts=thread_ts,
+        )
 
-    if valid_stocks:
-        say(f"valid symbols: {', '.join([valid_stock.ticker for valid_stock in valid_stocks])}", thread_ts=thread_ts)
-    else:
-        say(
+
+@app.message("yaya_queue_status")
+def handle_queue_status(message: dict[str, Any]) -> None:
+    """Report job queue depth and wait times, and the Slack publisher's throughput and backoff."""
+    metrics = job_queue.metrics()
+    slack = publisher.metrics
+    publisher.post(
+        message["channel"],
+        f"queued: {metrics.depth}, running: {metrics.running}, completed: {metrics.completed}, "
+        f"failed: {metrics.failed}, rejected: {metrics.rejected}, "
+        f"avg wait: {metrics.average_wait_seconds:.1f}s, max wait: {metrics.max_wait_seconds:.1f}s\n"
+        f"slack pending: {slack.pending}, sent: {slack.sent}, failed: {slack.failed}, "
+        f"rate limited: {slack.rate_limited} ({slack.backoff_seconds:.0f}s backoff), "
+        f"throughput: {slack.throughput:.2f} msg/s, avg send wait: {slack.average_wait_seconds:.1f}s",
+        thread_ts=message["ts"],
+    )
+
+
+def _post(payload: dict[str, Any], text: str) -> None:
+    publisher.post(payload["channel"], text, thread_ts=payload["thread_ts"])
+
+
+def run_stock_digest_job(payload: dict[str, Any]) -> None:
+    """Validate the requested symbols and queue one analysis job per valid ticker."""
+    _app: Application = get_application()
+    validity = _app.ticker_validator.validate(payload["symbols"])
+    valid_symbols = [symbol for symbol, valid in validity.items() if valid]
+
+    if not valid_symbols:
+        _post(
+            payload,
             "❌ *No valid stock symbols found!*\n\n*Usage:* `yaya_stock_daily_digest AAPL TSLA MSFT GOOGL AMZN",
-            thread_ts=thread_ts,
         )
+        return
+    _post(payload, f"valid symbols: {', '.join(valid_symbols)}")
+
+    for symbol in valid_symbols:
+        try:
+            job_queue.submit(STOCK_TICKER_JOB, {**payload, "ticker": symbol})
+        except QueueFullError:
+            _post(payload, f"❌ *{symbol}* job queue is full, please try again later.")
+
+
+def run_stock_ticker_job(payload: dict[str, Any]) -> None:
+    """Analyse a single ticker, streaming its report into one thread message that is edited as it grows."""
+    use_case = get_application().stock_summarization_use_case
+    request = MultiTickerSummarizationRequest([SingleTickerSummarizationRequest(payload["ticker"])])
+    message = StreamingSlackMessage(
+        publisher, payload["channel"], thread_ts=payload["thread_ts"], interval=SLACK_STREAM_UPDATE_SECONDS
+    )
+    for response in use_case.execute_per_ticker(request, on_chunk=lambda _, chunk: message.append(chunk)):
+        if response.result.is_success:
+            message.finish(f"*{response.ticker}*\n{response.result.value}")
+        else:
+            error = response.result.error
+            message.finish(f"❌ *{response.ticker}* {error.code.value}: {error.message}")
 
-    _app: Application = create_application()
-    stock_summarization_use_case = _app.stock_summarization_use_case
 
-    for valid_stock in valid_stocks:
-        stock_result = stock_summarization_use_case.execute(MultiTickerSummarizationRequest([valid_stock]))
-        say(f"*{valid_stock.ticker}*\n{stock_result.value}", thread_ts=thread_ts)
+STOCK_DIGEST_JOB = "stock_digest"
+STOCK_TICKER_JOB = "stock_ticker"
+SLACK_JOB_DB = os.getenv("SLACK_JOB_DB")
+SLACK_STREAM_UPDATE_SECONDS = float(os.getenv("SLACK_STREAM_UPDATE_SECONDS", "3"))
+
+job_queue = JobQueue(
+    handlers={STOCK_DIGEST_JOB: run_stock_digest_job, STOCK_TICKER_JOB: run_stock_ticker_job},
+    workers=int(os.getenv("SLACK_JOB_WORKERS", "4")),
+    max_size=int(os.getenv("SLACK_JOB_QUEUE_SIZE", "100")),
+    store=SqliteJobStore(Path(SLACK_JOB_DB)) if SLACK_JOB_DB else None,
+)
 
 
 if __name__ == "__main__":
+    warm_up_application()
+    job_queue.start()
+    watch_instructions(interval=float(os.getenv("INSTRUCTIONS_RELOAD_INTERVAL_SECONDS", "30")))
     handler = SocketModeHandler(app, SLACK_APP_TOKEN)
     handler.start()  # This line makes @app.event handlers run
     print("Bot is running!")
@@ -0,0 +1,115 @@
+"""
+Channel and user directory of a Slack workspace.
+
+Resolving ``#channel`` names and user emails one API call at a time costs 2xN+1 calls per digest and runs into
+Tier-2 rate limits in large workspaces. The directory lists every channel and user once with paginated calls,
+keeps the index in a JSON file for ``ttl`` seconds and answers lookups from memory.
+"""
+
+import json
+import threading
+import time
+from pathlib import Path
+
+from slack_sdk import WebClient
+from slack_sdk.errors import SlackApiError
+
+CHANNEL_PAGE_SIZE = 1000
+USER_PAGE_SIZE = 200
+REFRESH_RETRY_SECONDS = 300
+
+
+class SlackDirectory:
+    def __init__(self, client: WebClient, cache_path: Path, ttl: float = 24 * 3600):
+        self.client = client
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self.api_calls = 0
+        self._channels: dict[str, str] = {}
+        self._users: dict[str, str] = {}
+        self._built_at = 0.0
+        self._lock = threading.Lock()
+
+    def channel_id(self, channel: str) -> str:
+        """ID of a ``#name`` channel; IDs and unknown names are returned unchanged."""
+        if not channel.startswith("#"):
+            return channel
+        with self._lock:
+            self._ensure_fresh()
+            return self._channels.get(channel[1:], channel)
+
+    def user_id(self, email: str) -> str | None:
+        """
+        Slack user ID of ``email``. Users missing from the index (e.g. added since it was built) are looked up
+        with a single ``users_lookupByEmail`` call and remembered.
+        """
+        email = email.strip().lower()
+        with self._lock:
+            self._ensure_fresh()
+            if email in self._users:
+                return self._users[email]
+        try:
+            self.api_calls += 1
+            response = self.client.users_lookupByEmail(email=email)
+        except SlackApiError:
+            return None
+        if not response["ok"] or "user" not in response:
+            return None
+        user_id = str(response["user"]["id"])
+        with self._lock:
+            self._users[email] = user_id
+            self._save()
+        return user_id
+
+    def refresh(self) -> None:
+        """Rebuild the index from the Slack API and store it on disk."""
+        with self._lock:
+            self._refresh()
+
+    def _ensure_fresh(self) -> None:
+        if time.time() - self._built_at < self.ttl:
+            return
+        if self._load() and time.time() - self._built_at < self.ttl:
+            return
+        self._refresh()
+
+    def _refresh(self) -> None:
+        channels: dict[str, str] = {}
+        users: dict[str, str] = {}
+        try:
+            for page in self.client.conversations_list(exclude_archived=True, limit=CHANNEL_PAGE_SIZE):
+                self.api_calls += 1
+                channels.update({str(ch["name"]): str(ch["id"]) for ch in page["channels"]})
+            for page in self.client.users_list(limit=USER_PAGE_SIZE):
+                self.api_calls += 1
+                for member in page["members"]:
+                    email = member.get("profile", {}).get("email")
+                    if email and not member.get("deleted"):
+                        users[email.lower()] = str(member["id"])
+        except SlackApiError as e:
+            # Keep serving the previous index and retry later; unknown names fall back to their input meanwhile.
+            print(f"Slack directory refresh failed: {e.response.get('error')}")
+            self._built_at = time.time() - self.ttl + min(self.ttl, REFRESH_RETRY_SECONDS)
+            return
+        self._channels, self._users, self._built_at = channels, users, time.time()
+        self._save()
+        print(f"Slack directory built: {len(channels)} channels, {len(users)} users")
+
+    def _load(self) -> bool:
+        try:
+            data = json.loads(self.cache_path.read_text())
+        except (OSError, ValueError):
+            return False
+        self._channels = dict(data.get("channels", {}))
+        self._users = dict(data.get("users", {}))
+        self._built_at = float(data.get("built_at", 0.0))
+        return True
+
+    def _save(self) -> None:
+        data = {"built_at": self._built_at, "channels": self._channels, "users": self._users}
+        tmp_path = self.cache_path.with_suffix(".tmp")
+        try:
+            tmp_path.write_text(json.dumps(data))
+            tmp_path.replace(self.cache_path)
+        except OSError as e:
+            print(f"Could not store the Slack directory in {self.cache_path}: {e}")
@@ -0,0 +1,257 @@
+"""
+Rate-limit-aware sender for Slack messages.
+
+Every post and edit goes through one sender thread. Each channel gets a token bucket sized to Slack's
+``chat.postMessage`` allowance of about one message per second per channel. A 429 answer pauses sending for its
+``Retry-After`` delay and the message is retried instead of lost. Reports longer than a Slack message are split
+into ordered chunks; messages for the same channel are always sent in the order they were queued.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+
+from slack_sdk import WebClient
+from slack_sdk.errors import SlackApiError
+
+from invesetment_agent.application.external_service.rate_limiter import TokenBucket
+from invesetment_agent.application.external_service.tracing import span
+
+# Slack truncates message text after 4000 characters, keep some room for the code fences added when splitting.
+MESSAGE_LIMIT = 3900
+FENCE = "```"
+
+
+@dataclass(frozen=True)
+class PostedMessage:
+    channel: str
+    ts: str
+
+
+@dataclass
+class PublisherMetrics:
+    pending: int = 0
+    sent: int = 0
+    failed: int = 0
+    rate_limited: int = 0
+    backoff_seconds: float = 0.0
+    total_wait_seconds: float = 0.0
+    started_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def throughput(self) -> float:
+        """Messages sent per second since the publisher started."""
+        elapsed = time.monotonic() - self.started_at
+        return self.sent / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def average_wait_seconds(self) -> float:
+        """Average time a message spent queued before it was sent."""
+        return self.total_wait_seconds / self.sent if self.sent else 0.0
+
+
+@dataclass
+class _Operation:
+    """A post when ``target`` is None, otherwise an edit of the message ``target`` resolves to."""
+
+    channel: str
+    text: str
+    thread_ts: str | None = None
+    target: Future[PostedMessage] | None = None
+    future: Future[PostedMessage] = field(default_factory=Future)
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+def split_message(text: str, limit: int = MESSAGE_LIMIT) -> list[str]:
+    """
+    Split ``text`` into ordered chunks of at most ``limit`` characters, at line breaks where possible.
+    A code block cut in two is closed at the end of one chunk and reopened at the start of the next.
+    """
+    if len(text) <= limit:
+        return [text]
+    budget = limit - 2 * (len(FENCE) + 1)
+    chunks: list[str] = []
+    current = ""
+    in_code = False
+    for line in _split_lines(text, budget):
+        if current and len(current) + len(line) > budget:
+            chunks.append((current + ("" if current.endswith("\n") else "\n") + FENCE) if in_code else current)
+            current = FENCE + "\n" if in_code else ""
+        current += line
+        in_code ^= line.count(FENCE) % 2 == 1
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _split_lines(text: str, width: int) -> list[str]:
+    pieces: list[str] = []
+    for line in text.splitlines(keepends=True):
+        while len(line) > width:
+            pieces.append(line[:width])
+            line = line[width:]
+        pieces.append(line)
+    return pieces
+
+
+class SlackPublisher:
+    """
+    Queue of outgoing Slack messages drained by a single sender thread.
+
+    ``post`` and ``update`` return futures of the first posted message, callers that need its ``ts`` wait on
+    them. Pending edits of the same message are merged, so a streamed report is never edited with stale text.
+    The client must not retry rate-limited calls itself, the publisher does.
+    """
+
+    def __init__(
+        self,
+        client: WebClient,
+        rate_per_channel: float = 1.0,
+        burst: float = 3.0,
+        max_message_length: int = MESSAGE_LIMIT,
+    ):
+        self.client = client
+        self.rate_per_channel = rate_per_channel
+        self.burst = burst
+        self.max_message_length = max_message_length
+        self.metrics = PublisherMetrics()
+        self._queues: dict[str, deque[_Operation]] = {}
+        self._buckets: dict[str, TokenBucket] = {}
+        self._paused_until = 0.0
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="slack-publisher", daemon=True)
+        self._thread.start()
+
+    def post(self, channel: str, text: str, thread_ts: str | None = None) -> Future[PostedMessage]:
+        """Queue ``text`` for ``channel``, split into as many messages as needed. Resolves to the first one."""
+        chunks = split_message(text, self.max_message_length)
+        operations = [_Operation(channel=channel, text=chunk, thread_ts=thread_ts) for chunk in chunks]
+        with self._condition:
+            self._queues.setdefault(channel, deque()).extend(operations)
+            self.metrics.pending += len(operations)
+            self._condition.notify_all()
+        return operations[0].future
+
+    def update(self, channel: str, message: Future[PostedMessage], text: str) -> Future[PostedMessage]:
+        """
+        Queue an edit of a message returned by ``post`` on the same ``channel``. Text beyond the message
+        limit is cut off; callers split long final texts themselves.
+        """
+        text = split_message(text, self.max_message_length)[0]
+        with self._condition:
+            queue = self._queues.setdefault(channel, deque())
+            if queue and queue[-1].target is message:
+                # An edit of this message is still waiting: send the newest text instead of both.
+                queue[-1].text = text
+                return queue[-1].future
+            operation = _Operation(channel=channel, text=text, target=message)
+            queue.append(operation)
+            self.metrics.pending += 1
+            self._condition.notify_all()
+        return operation.future
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until every queued message has been sent or failed. Returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self.metrics.pending:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(timeout=remaining)
+        return True
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                operation, delay = self._next_operation()
+                while operation is None:
+                    self._condition.wait(timeout=delay)
+                    operation, delay = self._next_operation()
+            self._send(operation)
+
+    def _next_operation(self) -> tuple[_Operation | None, float | None]:
+        """
+        Pop the next message of a channel whose bucket has a token, otherwise return the seconds until one
+        will have (None when nothing is queued). Must hold the condition.
+        """
+        pause = self._paused_until - time.monotonic()
+        if pause > 0:
+            return None, pause
+        delays: list[float] = []
+        for channel, queue in self._queues.items():
+            if queue:
+                delay = self._bucket(channel).try_acquire()
+                if delay == 0:
+                    return queue.popleft(), None
+                delays.append(delay)
+        return None, min(delays) if delays else None
+
+    def _bucket(self, channel: str) -> TokenBucket:
+        if channel not in self._buckets:
+            self._buckets[channel] = TokenBucket(rate=self.rate_per_channel, capacity=self.burst)
+        return self._buckets[channel]
+
+    def _send(self, operation: _Operation) -> None:
+        method = "chat_postMessage" if operation.target is None else "chat_update"
+        with span(f"slack.{method}", **{"slack.channel": operation.channel}) as current:
+            current.set_attribute("slack.queue_seconds", time.monotonic() - operation.enqueued_at)
+            try:
+                if operation.target is None:
+                    response = self.client.chat_postMessage(
+                        channel=operation.channel, text=operation.text, thread_ts=operation.thread_ts
+                    )
+                    # chat_update needs the channel ID, the post may have been addressed by name.
+                    result = PostedMessage(channel=str(response["channel"]), ts=str(response["ts"]))
+                else:
+                    # The post was queued earlier on the same channel, so it has been sent or has failed by now.
+                    result = operation.target.result(timeout=0)
+                    self.client.chat_update(channel=result.channel, ts=result.ts, text=operation.text)
+            except SlackApiError as e:
+                if e.response.status_code != 429:
+                    self._complete(operation, error=e)
+                    return
+                retry_after = _retry_after(e)
+                current.set_attribute("slack.retry_after_seconds", retry_after)
+                with self._condition:
+                    # Slack rate limits the method for the whole workspace, so every channel waits.
+                    self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+                    self._queues[operation.channel].appendleft(operation)
+                    self.metrics.rate_limited += 1
+                    self.metrics.backoff_seconds += retry_after
+                print(f"Slack rate limited, retrying in {retry_after:.0f}s")
+            except Exception as e:
+                self._complete(operation, error=e)
+            else:
+                self._complete(operation, result=result)
+
+    def _complete(
+        self, operation: _Operation, result: PostedMessage | None = None, error: Exception | None = None
+    ) -> None:
+        with self._condition:
+            self.metrics.pending -= 1
+            if error is None:
+                self.metrics.sent += 1
+                self.metrics.total_wait_seconds += time.monotonic() - operation.enqueued_at
+            else:
+                self.metrics.failed += 1
+            self._condition.notify_all()
+        if error is None:
+            assert result is not None
+            operation.future.set_result(result)
+        else:
+            print(f"Slack message failed: {error!r}")
+            operation.future.set_exception(error)
+
+
+def _retry_after(error: SlackApiError) -> float:
+    for name, value in error.response.headers.items():
+        if name.lower() == "retry-after":
+            value = value[0] if isinstance(value, list) else value
+            try:
+                return float(value)
+            except ValueError:
+                break
+    return 1.0
@@ -0,0 +1,49 @@
+import threading
+import time
+from concurrent.futures import Future
+
+from invesetment_agent.infrastructure.slack.publisher import PostedMessage, SlackPublisher, split_message
+
+
+class StreamingSlackMessage:
+    """
+    A Slack message that grows as a report is streamed. The message is posted on the first chunk and then
+    edited with ``chat_update`` at most once per ``interval`` seconds; ``finish`` writes the final text,
+    continuing in follow-up messages when it is longer than one Slack message.
+    Chunks arriving after ``finish`` (e.g. from a run that timed out) are ignored.
+    """
+
+    def __init__(self, publisher: SlackPublisher, channel: str, thread_ts: str | None = None, interval: float = 3.0):
+        self.publisher = publisher
+        self.channel = channel
+        self.thread_ts = thread_ts
+        self.interval = interval
+        self.message: Future[PostedMessage] | None = None
+        self._text = ""
+        self._updated_at = 0.0
+        self._finished = False
+        self._lock = threading.Lock()
+
+    def append(self, chunk: str) -> None:
+        with self._lock:
+            if self._finished:
+                return
+            self._text += chunk
+            if self.message is None or time.monotonic() - self._updated_at >= self.interval:
+                self._send(self._text + " …")
+
+    def finish(self, text: str) -> None:
+        with self._lock:
+            self._finished = True
+            head, *rest = split_message(text, self.publisher.max_message_length)
+            self._send(head)
+            for chunk in rest:
+                self.publisher.post(self.channel, chunk, thread_ts=self.thread_ts)
+
+    def _send(self, text: str) -> None:
+        # Sending is queued by the publisher, the message is posted or edited once its channel has capacity.
+        if self.message is None:
+            self.message = self.publisher.post(self.channel, text, thread_ts=self.thread_ts)
+        else:
+            self.publisher.update(self.channel, self.message, text)
+        self._updated_at = time.monotonic()
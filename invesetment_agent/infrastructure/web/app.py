@@ -4,7 +4,7 @@ from invesetment_agent.application.dtos.stock_summarization_dtos import (
     MultiTickerSummarizationRequest,
     SingleTickerSummarizationRequest,
 )
-from invesetment_agent.infrastructure.config.container import create_application
+from invesetment_agent.infrastructure.config.container import get_application
 
 st.set_page_config(layout="wide")
 
@@ -13,7 +13,7 @@ st.caption("Analyze multiple stocks with comprehensive investment insights")
 
 # Initialize application
 if "app" not in st.session_state:
-    st.session_state.app = create_application()
+    st.session_state.app = get_application()
 
 # Stock input section
 st.subheader("Stock Symbols")
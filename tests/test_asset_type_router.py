@@ -0,0 +1,41 @@
+import pytest
+
+from invesetment_agent.infrastructure.adapter.asset_type_router import (
+    BOND_ETF,
+    BOND_FUND,
+    EQUITY_FUND,
+    INDEX_FUND,
+    MUTUAL_FUND,
+    STOCK,
+    classify_asset_type,
+)
+
+
+@pytest.mark.parametrize(
+    ("quote_type", "category", "name", "expected"),
+    [
+        ("EQUITY", None, "Apple Inc.", STOCK),
+        # "muni" inside "Communications" (XLC, VOX).
+        ("ETF", "Communications", "Communication Services Select Sector SPDR Fund", EQUITY_FUND),
+        ("ETF", "Communications", "Vanguard Communication Services Index Fund ETF Shares", INDEX_FUND),
+        ("ETF", "Large Blend", "SPDR S&P 500 ETF Trust", INDEX_FUND),
+        # Equity funds named after corporations or credit.
+        ("MUTUALFUND", "Large Value", "Voya Corporate Leaders Trust Fund", MUTUAL_FUND),
+        ("MUTUALFUND", None, "Voya Corporate Leaders Trust Fund", MUTUAL_FUND),
+        ("ETF", None, "Global X Credit Card Payments ETF", EQUITY_FUND),
+        # Government money market funds are not bond funds, and not supported.
+        ("MUTUALFUND", None, "Fidelity Government Money Market Fund", None),
+        ("MONEYMARKET", None, "Vanguard Federal Money Market Fund", None),
+        # The category wins over the name.
+        ("ETF", "Intermediate Core Bond", "iShares Core U.S. Aggregate Bond ETF", BOND_ETF),
+        ("ETF", "Muni National Interm", "iShares National Muni Bond ETF", BOND_ETF),
+        ("MUTUALFUND", "Long Government", "Vanguard Long-Term Treasury Fund", BOND_FUND),
+        ("MUTUALFUND", "Intermediate Core Bond", "Vanguard Total Bond Market Index Fund", BOND_FUND),
+        # Without a category, the name decides.
+        ("ETF", None, "iShares 20+ Year Treasury Bond ETF", BOND_ETF),
+        ("ETF", None, "Schwab U.S. TIPS ETF", BOND_ETF),
+        ("CRYPTOCURRENCY", None, "Bitcoin USD", None),
+    ],
+)
+def test_classify_asset_type(quote_type, category, name, expected):
+    assert classify_asset_type(quote_type, category, name) == expected
@@ -0,0 +1,72 @@
+import time
+from collections.abc import Iterator
+
+import pytest
+
+from invesetment_agent.application.port.ai_agent_service import AgentService
+from invesetment_agent.infrastructure.adapter.agno_agent import FallbackAgnoAgentService
+from invesetment_agent.infrastructure.adapter.provider_stats import CircuitState
+
+
+class StreamingService(AgentService):
+    def __init__(self, chunks: list[str], error: Exception | None = None):
+        self.chunks = chunks
+        self.error = error
+
+    def get_answer(self, query: str) -> str:
+        return "".join(self.chunks)
+
+    def stream_answer(self, query: str) -> Iterator[str]:
+        yield from self.chunks
+        if self.error is not None:
+            raise self.error
+
+
+def _health(service: FallbackAgnoAgentService):
+    return service.health[service.provider_name(0)]
+
+
+def test_closing_the_stream_is_not_a_provider_failure():
+    service = FallbackAgnoAgentService([StreamingService(["a", "b"])], failure_threshold=1)
+    stream = service.stream_answer("q")
+    assert next(stream) == "a"
+    stream.close()
+
+    assert _health(service).breaker.state == CircuitState.CLOSED
+    assert _health(service).success_rate == 1.0
+
+
+def test_consumer_errors_are_not_provider_failures():
+    service = FallbackAgnoAgentService([StreamingService(["a", "b"])], failure_threshold=1)
+    stream = service.stream_answer("q")
+    assert next(stream) == "a"
+    with pytest.raises(ValueError):
+        stream.throw(ValueError("slack update failed"))
+
+    assert _health(service).breaker.state == CircuitState.CLOSED
+
+
+def test_closing_a_probe_stream_lets_the_next_call_probe():
+    provider = StreamingService(["a"], error=RuntimeError("provider down"))
+    service = FallbackAgnoAgentService([provider], failure_threshold=1, reset_timeout=0.05)
+    with pytest.raises(RuntimeError):
+        list(service.stream_answer("q"))
+    time.sleep(0.06)
+
+    provider.error = None
+    stream = service.stream_answer("q")
+    assert next(stream) == "a"
+    stream.close()
+
+    # Re-opened by a failure, the circuit would reject calls for another reset_timeout.
+    assert _health(service).breaker.allow_request()
+
+
+def test_provider_errors_mid_stream_are_failures():
+    service = FallbackAgnoAgentService(
+        [StreamingService(["a"], error=RuntimeError("provider down"))], failure_threshold=1, reset_timeout=60.0
+    )
+    with pytest.raises(RuntimeError):
+        list(service.stream_answer("q"))
+
+    assert _health(service).breaker.state == CircuitState.OPEN
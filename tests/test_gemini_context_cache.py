@@ -0,0 +1,44 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from typing import Any
+
+from invesetment_agent.infrastructure.adapter.gemini_context_cache import GeminiContextCache
+
+
+class _Caches:
+    """Creates cached contents, blocking creates for instructions in ``slow`` until ``release`` is set."""
+
+    def __init__(self, slow: set[str]):
+        self.slow = slow
+        self.release = threading.Event()
+        self.creates: list[str] = []
+        self._lock = threading.Lock()
+
+    def create(self, model: str, config: Any) -> SimpleNamespace:
+        with self._lock:
+            self.creates.append(config.system_instruction)
+        if config.system_instruction in self.slow:
+            assert self.release.wait(5)
+        return SimpleNamespace(name=f"cachedContents/{config.system_instruction}")
+
+    def update(self, name: str, config: Any) -> None:
+        pass
+
+
+def test_slow_create_only_delays_callers_of_the_same_prefix():
+    caches = _Caches(slow={"leader"})
+    client: Any = SimpleNamespace(caches=caches)
+    cache = GeminiContextCache(min_tokens=0)
+    assert cache.cached_content_for(client, "gemini", "styler") == "cachedContents/styler"
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        leaders = [executor.submit(cache.cached_content_for, client, "gemini", "leader") for _ in range(2)]
+        # Neither a warm prefix nor a new one waits for the leader's create.
+        assert cache.cached_content_for(client, "gemini", "styler") == "cachedContents/styler"
+        assert cache.cached_content_for(client, "gemini", "finance") == "cachedContents/finance"
+        caches.release.set()
+        assert [leader.result(5) for leader in leaders] == ["cachedContents/leader"] * 2
+
+    assert sorted(caches.creates) == ["finance", "leader", "styler"]
+    assert cache.created == 3
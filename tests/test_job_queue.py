@@ -0,0 +1,38 @@
+import threading
+from typing import Any
+
+import pytest
+
+from invesetment_agent.infrastructure.jobs.job_queue import JobQueue, QueueFullError, SqliteJobStore
+
+
+def test_job_is_recorded_before_a_worker_can_run_it(tmp_path):
+    store = SqliteJobStore(tmp_path / "jobs.sqlite3")
+    recorded_while_running: list[list[str]] = []
+    done = threading.Event()
+
+    def handle(payload: dict[str, Any]) -> None:
+        recorded_while_running.append([job.job_id for job in store.pending()])
+        done.set()
+
+    jobs = JobQueue({"digest": handle}, workers=1, store=store)
+    jobs.start()
+    job = jobs.submit("digest", {})
+    assert done.wait(5)
+    jobs.stop(timeout=5)
+
+    assert recorded_while_running == [[job.job_id]]
+    assert store.pending() == []
+
+
+def test_rejected_job_is_not_left_in_the_store(tmp_path):
+    store = SqliteJobStore(tmp_path / "jobs.sqlite3")
+    # Not started, so the single slot stays taken.
+    jobs = JobQueue({"digest": lambda payload: None}, max_size=1, store=store)
+    queued = jobs.submit("digest", {})
+
+    with pytest.raises(QueueFullError):
+        jobs.submit("digest", {})
+
+    assert [job.job_id for job in store.pending()] == [queued.job_id]
+    assert jobs.metrics().rejected == 1
@@ -0,0 +1,18 @@
+import time
+
+from invesetment_agent.application.external_service import sec_tools
+from invesetment_agent.application.external_service.rate_limiter import TokenBucket
+
+SEC_MAX_REQUESTS_PER_SECOND = 10
+
+
+def test_sec_limiter_never_lets_more_than_the_sec_limit_through_in_a_second():
+    bucket = TokenBucket(rate=sec_tools.SEC_MAX_REQUESTS_PER_SECOND, capacity=sec_tools.SEC_RATE_LIMITER.capacity)
+    acquired_at = []
+    for _ in range(20):
+        bucket.acquire()
+        acquired_at.append(time.monotonic())
+
+    for start in acquired_at:
+        in_window = [at for at in acquired_at if start <= at < start + 1.0]
+        assert len(in_window) <= SEC_MAX_REQUESTS_PER_SECOND
@@ -0,0 +1,18 @@
+from types import SimpleNamespace
+
+from invesetment_agent.infrastructure.adapter.agno_financial_team.run_usage import log_run_usage
+
+
+def test_instruction_tokens_are_reported_with_the_run_usage(capsys):
+    output = SimpleNamespace(
+        metrics=SimpleNamespace(input_tokens=4310, output_tokens=92),
+        tools=[],
+        member_responses=[SimpleNamespace(metrics=SimpleNamespace(input_tokens=1980, output_tokens=64))],
+    )
+
+    usage = log_run_usage("Investment_Team_Leader", output, instruction_tokens=1405)
+
+    assert usage.instruction_tokens == 1405
+    # Instructions are part of the prompt, not counted twice.
+    assert usage.total_tokens == 4310 + 92 + 1980 + 64
+    assert "instructions ~1405" in capsys.readouterr().out
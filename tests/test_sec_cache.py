@@ -0,0 +1,32 @@
+import sqlite3
+
+from invesetment_agent.application.external_service.sec_cache import EdgarCache
+
+
+def test_size_follows_replaces_and_writes_from_another_process(tmp_path):
+    cache = EdgarCache(tmp_path / "edgar.sqlite")
+    cache.put("https://www.sec.gov/a", b"x" * 100)
+    cache.put("https://www.sec.gov/a", b"x" * 40)
+    other = EdgarCache(tmp_path / "edgar.sqlite")
+    other.put("https://www.sec.gov/b", b"x" * 10)
+
+    assert cache.size() == 50
+
+
+def test_size_counts_rows_written_before_the_total_existed(tmp_path):
+    db_path = tmp_path / "edgar.sqlite"
+    EdgarCache(db_path).put("https://www.sec.gov/a", b"x" * 30)
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("DROP TABLE cache_size")
+
+    assert EdgarCache(db_path).size() == 30
+
+
+def test_put_evicts_least_recently_used_entries_past_max_bytes(tmp_path):
+    cache = EdgarCache(tmp_path / "edgar.sqlite", max_bytes=250)
+    for name in ("a", "b", "c"):
+        cache.put(f"https://www.sec.gov/{name}", b"x" * 100)
+
+    assert cache.size() <= 250
+    assert cache.get("https://www.sec.gov/a") is None
+    assert cache.get("https://www.sec.gov/c") is not None
@@ -0,0 +1,55 @@
+from collections.abc import Iterator
+
+import pytest
+
+from invesetment_agent.application.external_service import sec_tools
+from invesetment_agent.application.external_service.sec_cache import EdgarCache
+
+FORM4_URL = "https://www.sec.gov/Archives/edgar/data/320193/000032019325000001/form4.xml"
+
+
+def _form4(transactions: int) -> bytes:
+    rows = "".join(
+        "<nonDerivativeTransaction>"
+        "<transactionDate><value>2025-10-01</value></transactionDate>"
+        "<transactionCoding><transactionCode>S</transactionCode></transactionCoding>"
+        "<transactionAmounts>"
+        f"<transactionShares><value>{100 + i}</value></transactionShares>"
+        "<transactionPricePerShare><value>227.41</value></transactionPricePerShare>"
+        "<transactionAcquiredDisposedCode><value>D</value></transactionAcquiredDisposedCode>"
+        "</transactionAmounts>"
+        "</nonDerivativeTransaction>"
+        for i in range(transactions)
+    )
+    return (
+        "<ownershipDocument><reportingOwner><reportingOwnerId><rptOwnerName>Rivera Dana</rptOwnerName>"
+        f"</reportingOwnerId></reportingOwner><nonDerivativeTable>{rows}</nonDerivativeTable></ownershipDocument>"
+    ).encode()
+
+
+class _ChunkedSecClient:
+    def __init__(self, body: bytes, chunk_size: int):
+        self.body = body
+        self.chunk_size = chunk_size
+        self.downloads = 0
+
+    def iter_content(self, url: str) -> Iterator[bytes]:
+        self.downloads += 1
+        for start in range(0, len(self.body), self.chunk_size):
+            yield self.body[start : start + self.chunk_size]
+
+
+def test_form4_with_more_transactions_than_the_limit_is_cached(tmp_path, monkeypatch: pytest.MonkeyPatch):
+    body = _form4(transactions=20)
+    client = _ChunkedSecClient(body, chunk_size=256)
+    cache = EdgarCache(db_path=tmp_path / "edgar.sqlite3")
+    monkeypatch.setattr(sec_tools, "get_sec_client", lambda: client)
+    monkeypatch.setattr(sec_tools, "get_edgar_cache", lambda: cache)
+
+    first = sec_tools._read_form4((FORM4_URL, "2025-10-02"), limit=2, include_derivative=False)
+    second = sec_tools._read_form4((FORM4_URL, "2025-10-02"), limit=2, include_derivative=False)
+
+    assert [record.shares for record in first] == [record.shares for record in second] == [100, 101]
+    assert client.downloads == 1
+    cached = cache.get(FORM4_URL)
+    assert cached is not None and cached.body == body
@@ -0,0 +1,85 @@
+from typing import Any
+
+import pytest
+
+from invesetment_agent.application.external_service.sec_tools import fetch_latest_filing_link
+from invesetment_agent.infrastructure.adapter import ticker_data_prefetcher
+from invesetment_agent.infrastructure.adapter.agno_financial_team.tool_cache import (
+    FILINGS,
+    QUOTES,
+    ToolCache,
+    tool_defaults,
+)
+from invesetment_agent.infrastructure.adapter.ticker_data_prefetcher import TickerDataPrefetcher
+
+TEN_K = "https://www.sec.gov/Archives/edgar/data/320193/000032019324000123/aapl-20240928.htm"
+
+
+class _CikIndex:
+    def __init__(self, ciks: dict[str, str]):
+        self.ciks = ciks
+
+    def cik_for(self, ticker: str) -> str | None:
+        return self.ciks.get(ticker)
+
+
+@pytest.fixture
+def sec_calls(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    calls: list[str] = []
+
+    def insider_table(ticker: str) -> str:
+        calls.append(f"insider_table:{ticker}")
+        return "```\nRecent Insider Activity\n```"
+
+    def latest_filing_link(ticker: str, form_type: str = "10-K") -> str:
+        calls.append(f"latest_filing_link:{ticker}")
+        return TEN_K
+
+    def info(symbol: str) -> dict[str, Any]:
+        return {"longName": f"{symbol} Inc.", "quoteType": "EQUITY"}
+
+    monkeypatch.setattr(ticker_data_prefetcher, "insider_table", insider_table)
+    monkeypatch.setattr(ticker_data_prefetcher, "latest_filing_link", latest_filing_link)
+    monkeypatch.setattr(ticker_data_prefetcher, "fetch_ticker_info", info)
+    monkeypatch.setattr(ticker_data_prefetcher, "fetch_price_levels", lambda symbol: {})
+    monkeypatch.setattr(ticker_data_prefetcher, "get_cik_index", lambda: _CikIndex({"AAPL": "0000320193"}))
+    return calls
+
+
+def _tool_cache() -> ToolCache:
+    return ToolCache(ttls={QUOTES: 60, FILINGS: 60}, defaults=tool_defaults([fetch_latest_filing_link]))
+
+
+def test_tool_call_without_form_type_is_served_from_the_prefetch(sec_calls):
+    tool_cache = _tool_cache()
+    TickerDataPrefetcher(tool_cache).fetch("aapl")
+
+    def tool(**arguments: Any) -> str:
+        raise AssertionError(f"prefetched link fetched again with {arguments}")
+
+    assert tool_cache.call("fetch_latest_filing_link", tool, {"ticker": "AAPL"}) == TEN_K
+    assert tool_cache.call("fetch_latest_filing_link", tool, {"ticker": "aapl", "form_type": "10-K"}) == TEN_K
+
+
+def test_other_form_types_are_not_confused_with_the_default():
+    tool_cache = _tool_cache()
+    tool_cache.call("fetch_latest_filing_link", lambda **arguments: TEN_K, {"ticker": "AAPL"})
+
+    assert (
+        tool_cache.call("fetch_latest_filing_link", lambda **arguments: "10-Q", {"ticker": "AAPL", "form_type": "10-Q"})
+        == "10-Q"
+    )
+
+
+def test_sec_data_is_not_prefetched_for_tickers_without_a_cik(sec_calls):
+    data = TickerDataPrefetcher(_tool_cache()).fetch("SPAXX")
+
+    assert sec_calls == []
+    assert set(data) == {"profile", "price_levels"}
+
+
+def test_sec_data_is_prefetched_for_listed_tickers(sec_calls):
+    data = TickerDataPrefetcher(_tool_cache()).fetch("AAPL")
+
+    assert sorted(sec_calls) == ["insider_table:AAPL", "latest_filing_link:AAPL"]
+    assert data["latest_10k"] == TEN_K
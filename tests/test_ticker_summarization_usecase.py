@@ -0,0 +1,50 @@
+import asyncio
+
+from invesetment_agent.application.dtos.stock_summarization_dtos import (
+    MultiTickerSummarizationRequest,
+    SingleTickerSummarizationRequest,
+)
+from invesetment_agent.application.exceptions import AgentExecutionError
+from invesetment_agent.application.port.ai_agent_service import AgentService
+from invesetment_agent.application.usecases.ticker_summarization_usecase import EquitySummarizationUseCase
+
+
+class ReportService(AgentService):
+    """Reports on every ticker but the ones in ``failing``."""
+
+    def __init__(self, failing: set[str]):
+        self.failing = failing
+
+    def get_answer(self, query: str) -> str:
+        ticker = query.split()[3]
+        if ticker in self.failing:
+            raise AgentExecutionError(message="model quota exceeded", name="Investment_Team_Leader")
+        return f"Report {ticker}"
+
+
+def _request(*tickers: str) -> MultiTickerSummarizationRequest:
+    return MultiTickerSummarizationRequest([SingleTickerSummarizationRequest(ticker) for ticker in tickers])
+
+
+def test_partial_failures_are_reported_next_to_the_answers():
+    use_case = EquitySummarizationUseCase(ReportService(failing={"msft"}), max_concurrency=3)
+
+    for result in (
+        use_case.execute(_request("aapl", "msft", "nvda")),
+        asyncio.run(use_case.aexecute(_request("aapl", "msft", "nvda"))),
+    ):
+        assert result.is_success
+        lines = result.value.split("\n")
+        assert lines[0] == "Report aapl"
+        assert lines[1].startswith("⚠️ *MSFT could not be analyzed:*")
+        assert "model quota exceeded" in lines[1]
+        assert lines[2] == "Report nvda"
+
+
+def test_all_failures_are_a_failure():
+    use_case = EquitySummarizationUseCase(ReportService(failing={"aapl", "msft"}))
+
+    result = use_case.execute(_request("aapl", "msft"))
+
+    assert not result.is_success
+    assert set(result.error.details or {}) == {"aapl", "msft"}
@@ -0,0 +1,93 @@
+import asyncio
+import json
+from collections.abc import AsyncIterator, Iterator
+from dataclasses import dataclass
+from typing import Any
+
+from agno.agent import Agent
+from agno.models.base import Model
+from agno.models.response import ModelResponse
+from agno.tools import Function
+
+from invesetment_agent.application.external_service.tracing import atool_span_hook
+from invesetment_agent.infrastructure.adapter.agno_financial_team.financial_agent import _in_worker_thread
+from invesetment_agent.infrastructure.adapter.agno_financial_team.tool_cache import QUOTES, ToolCache
+
+
+@dataclass
+class PriceLookupModel(Model):
+    """Asks for the AAPL price once, then answers with the tool result."""
+
+    id: str = "price-lookup"
+    name: str = "PriceLookup"
+    provider: str = "Test"
+
+    def invoke(self, *args: Any, **kwargs: Any) -> ModelResponse:
+        messages = kwargs["messages"]
+        if not any(message.role == "tool" for message in messages):
+            return ModelResponse(
+                role="assistant",
+                tool_calls=[
+                    {
+                        "id": "call_price",
+                        "type": "function",
+                        "function": {"name": "get_current_stock_price", "arguments": json.dumps({"symbol": "AAPL"})},
+                    }
+                ],
+            )
+        return ModelResponse(role="assistant", content=str(messages[-1].content))
+
+    async def ainvoke(self, *args: Any, **kwargs: Any) -> ModelResponse:
+        return self.invoke(*args, **kwargs)
+
+    def invoke_stream(self, *args: Any, **kwargs: Any) -> Iterator[ModelResponse]:
+        yield self.invoke(*args, **kwargs)
+
+    async def ainvoke_stream(self, *args: Any, **kwargs: Any) -> AsyncIterator[ModelResponse]:
+        yield self.invoke(*args, **kwargs)
+
+    def _parse_provider_response(self, response: Any, **kwargs: Any) -> ModelResponse:
+        # ``invoke`` already answers with parsed responses.
+        assert isinstance(response, ModelResponse)
+        return response
+
+    def _parse_provider_response_delta(self, response: Any) -> ModelResponse:
+        assert isinstance(response, ModelResponse)
+        return response
+
+
+def test_same_tool_call_twice_under_arun_is_answered_from_the_cache():
+    calls: list[str] = []
+
+    def get_current_stock_price(symbol: str) -> str:
+        """Current price of a stock."""
+        calls.append(symbol)
+        return "227.52"
+
+    cache = ToolCache(ttls={QUOTES: 60})
+    agent = Agent(
+        model=PriceLookupModel(),
+        tools=[_in_worker_thread(Function.from_callable(get_current_stock_price))],
+        tool_hooks=[atool_span_hook, cache.ahook],
+    )
+
+    first = asyncio.run(agent.arun("Price of AAPL?"))
+    second = asyncio.run(agent.arun("Price of AAPL?"))
+
+    assert first.content == second.content == "227.52"
+    assert calls == ["AAPL"]
+    assert cache.stats.hits == 1
+    # Sync runs share the entry, which must be the result and not the coroutine that produced it.
+    assert cache.call("get_current_stock_price", get_current_stock_price, {"symbol": "AAPL"}) == "227.52"
+    assert calls == ["AAPL"]
+
+
+def test_awaitable_results_of_sync_calls_are_not_cached():
+    async def get_current_stock_price(symbol: str) -> str:
+        return "227.52"
+
+    cache = ToolCache(ttls={QUOTES: 60})
+    for _ in range(2):
+        pending = cache.call("get_current_stock_price", get_current_stock_price, {"symbol": "AAPL"})
+        assert asyncio.run(pending) == "227.52"
+    assert cache.stats.hits == 0